@@ -0,0 +1,81 @@
+"""switch primary key defaults to uuidv7
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-15
+
+Adds:
+- uuid_generate_v7() function (time-ordered UUIDs, RFC 9562)
+- uuid_generate_v7() as the server default for every primary key
+
+Random UUIDv4 keys scatter inserts across the whole primary key B-tree.
+UUIDv7 keys are prefixed with a millisecond timestamp, so new rows land on
+the right-most leaf page and inserts stay append-mostly.
+
+Existing rows keep their UUIDv4 ids; only new rows get time-ordered keys.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+# vehicles and automation_rules were dropped in a957a214e02b
+TABLES = ('dealerships', 'users', 'leads', 'conversations', 'emails')
+
+
+def upgrade() -> None:
+    """Upgrade schema - use uuid_generate_v7() for primary keys."""
+
+    # Overwrite the 48-bit timestamp prefix of a random UUID and set the
+    # version nibble to 7 (bits 52/53 flip 0100 -> 0111)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION uuid_generate_v7()
+        RETURNS uuid
+        AS $$
+        BEGIN
+            RETURN encode(
+                set_bit(
+                    set_bit(
+                        overlay(
+                            uuid_send(gen_random_uuid())
+                            PLACING substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+                            FROM 1 FOR 6
+                        ),
+                        52, 1
+                    ),
+                    53, 1
+                ),
+                'hex'
+            )::uuid;
+        END
+        $$ LANGUAGE plpgsql VOLATILE
+    """)
+
+    for table in TABLES:
+        op.alter_column(
+            table,
+            'id',
+            existing_type=sa.UUID(),
+            server_default=sa.text('uuid_generate_v7()'),
+            existing_nullable=False,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema - restore gen_random_uuid() primary keys."""
+
+    for table in TABLES:
+        op.alter_column(
+            table,
+            'id',
+            existing_type=sa.UUID(),
+            server_default=sa.text('gen_random_uuid()'),
+            existing_nullable=False,
+        )
+
+    op.execute("DROP FUNCTION IF EXISTS uuid_generate_v7()")
@@ -0,0 +1,50 @@
+"""add composite lead timeline indexes
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-15
+
+Adds:
+- idx_conversations_lead_created_desc on conversations (lead_id, created_at DESC)
+- idx_emails_lead_received on emails (lead_id, received_at DESC)
+
+Drops the single-column lead_id indexes they replace. A lead's message
+history is always read as "WHERE lead_id = ? ORDER BY created_at DESC",
+so the composite index returns rows already sorted, with no sort node.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - replace lead_id indexes with (lead_id, time DESC)."""
+
+    op.create_index(
+        'idx_conversations_lead_created_desc',
+        'conversations',
+        ['lead_id', sa.text('created_at DESC')]
+    )
+    op.drop_index('ix_conversations_lead_id', table_name='conversations')
+
+    op.create_index(
+        'idx_emails_lead_received',
+        'emails',
+        ['lead_id', sa.text('received_at DESC')]
+    )
+    op.drop_index('idx_emails_lead', table_name='emails')
+
+
+def downgrade() -> None:
+    """Downgrade schema - restore single-column lead_id indexes."""
+
+    op.create_index('idx_emails_lead', 'emails', ['lead_id'])
+    op.drop_index('idx_emails_lead_received', table_name='emails')
+
+    op.create_index('ix_conversations_lead_id', 'conversations', ['lead_id'], unique=False)
+    op.drop_index('idx_conversations_lead_created_desc', table_name='conversations')
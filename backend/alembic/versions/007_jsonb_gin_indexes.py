@@ -0,0 +1,47 @@
+"""add gin indexes on queried jsonb columns
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-15
+
+Adds:
+- idx_leads_source_metadata_gin on leads (source_metadata jsonb_path_ops)
+- idx_emails_extracted_data_gin on emails (extracted_data jsonb_path_ops)
+
+jsonb_path_ops only supports containment (@>) but is roughly half the size
+of the default jsonb_ops GIN index. Key-value bags that are never filtered
+(facebook_page_tokens, notification_preferences, raw_headers, ...) are left
+unindexed to avoid the extra write cost.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - add jsonb_path_ops GIN indexes."""
+
+    op.create_index(
+        'idx_leads_source_metadata_gin',
+        'leads',
+        [sa.text('source_metadata jsonb_path_ops')],
+        postgresql_using='gin'
+    )
+    op.create_index(
+        'idx_emails_extracted_data_gin',
+        'emails',
+        [sa.text('extracted_data jsonb_path_ops')],
+        postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop jsonb_path_ops GIN indexes."""
+
+    op.drop_index('idx_emails_extracted_data_gin', table_name='emails')
+    op.drop_index('idx_leads_source_metadata_gin', table_name='leads')
@@ -0,0 +1,45 @@
+"""index uncovered foreign keys
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-15
+
+Adds:
+- idx_leads_assigned_to on leads (assigned_to) WHERE assigned_to IS NOT NULL
+- idx_conversations_dealership_id on conversations (dealership_id)
+
+Without an index on the referencing column, every DELETE/UPDATE of the
+referenced row scans the whole child table to enforce the FK action.
+Most leads are unassigned, so the assigned_to index is partial.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - index leads.assigned_to and conversations.dealership_id."""
+
+    op.create_index(
+        'idx_leads_assigned_to',
+        'leads',
+        ['assigned_to'],
+        postgresql_where=sa.text('assigned_to IS NOT NULL')
+    )
+    op.create_index(
+        'idx_conversations_dealership_id',
+        'conversations',
+        ['dealership_id']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop foreign key indexes."""
+
+    op.drop_index('idx_conversations_dealership_id', table_name='conversations')
+    op.drop_index('idx_leads_assigned_to', table_name='leads')
@@ -0,0 +1,44 @@
+"""drop redundant created_at DESC indexes
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-15
+
+Drops:
+- idx_leads_created_desc (duplicate of ix_leads_created_at)
+- idx_conversations_created_desc (duplicate of ix_conversations_created_at)
+
+B-tree indexes can be scanned in either direction, so the ascending
+created_at indexes already serve ORDER BY created_at DESC with a backward
+index scan. The DESC copies only added write cost on every insert.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - drop duplicate DESC indexes."""
+
+    op.drop_index('idx_leads_created_desc', table_name='leads')
+    op.drop_index('idx_conversations_created_desc', table_name='conversations')
+
+
+def downgrade() -> None:
+    """Downgrade schema - restore DESC indexes."""
+
+    op.create_index(
+        'idx_conversations_created_desc',
+        'conversations',
+        [sa.text('created_at DESC')]
+    )
+    op.create_index(
+        'idx_leads_created_desc',
+        'leads',
+        [sa.text('created_at DESC')]
+    )
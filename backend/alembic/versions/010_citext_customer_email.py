@@ -0,0 +1,64 @@
+"""store customer_email as citext with a cheaper check
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-15
+
+Adds:
+- citext extension
+- leads.customer_email as CITEXT (case-insensitive comparisons)
+- valid_email CHECK using position()/LIKE instead of a case-insensitive regex
+
+The regex CHECK ran on every lead INSERT/UPDATE. Strict address validation
+already happens at the API edge via Pydantic EmailStr, so the database only
+needs a cheap sanity check.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - citext customer_email and cheaper CHECK."""
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS citext")
+
+    op.drop_constraint('valid_email', 'leads', type_='check')
+    op.alter_column(
+        'leads',
+        'customer_email',
+        existing_type=sa.String(255),
+        type_=postgresql.CITEXT(),
+        existing_nullable=True,
+        postgresql_using='customer_email::citext'
+    )
+    op.create_check_constraint(
+        'valid_email',
+        'leads',
+        "customer_email IS NULL OR (position('@' in customer_email) > 1 AND customer_email NOT LIKE '% %')"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - restore varchar customer_email and regex CHECK."""
+
+    op.drop_constraint('valid_email', 'leads', type_='check')
+    op.alter_column(
+        'leads',
+        'customer_email',
+        existing_type=postgresql.CITEXT(),
+        type_=sa.String(255),
+        existing_nullable=True,
+        postgresql_using='customer_email::varchar(255)'
+    )
+    op.create_check_constraint(
+        'valid_email',
+        'leads',
+        "customer_email ~* '^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\\.[A-Z|a-z]{2,}$' OR customer_email IS NULL"
+    )
@@ -0,0 +1,44 @@
+"""store message bodies out-of-line without compression
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-15
+
+Adds:
+- STORAGE EXTERNAL on conversations.message_content
+- STORAGE EXTERNAL on emails.body_text and emails.body_html
+
+EXTENDED (the default) pglz-compresses large values before moving them to
+TOAST. Message bodies are written once and read whole, so skipping the
+compression step makes inserts and reads cheaper at a small cost in disk.
+Only newly written values are affected.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = (
+    ('conversations', 'message_content'),
+    ('emails', 'body_text'),
+    ('emails', 'body_html'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema - SET STORAGE EXTERNAL on message bodies."""
+
+    for table, column in COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET STORAGE EXTERNAL")
+
+
+def downgrade() -> None:
+    """Downgrade schema - restore default EXTENDED storage."""
+
+    for table, column in COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET STORAGE EXTENDED")
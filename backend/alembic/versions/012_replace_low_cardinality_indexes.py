@@ -0,0 +1,55 @@
+"""replace low-cardinality indexes with composite/partial ones
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-15
+
+Adds:
+- idx_leads_dealership_status on leads (dealership_id, status)
+- idx_leads_open on leads (dealership_id, created_at)
+  WHERE status IN ('new', 'contacted', 'qualified')
+
+Drops:
+- ix_leads_status, ix_leads_source
+- idx_emails_status (covered by idx_emails_status_received)
+
+status/source/processing_status have a handful of distinct values, so a
+single-column B-tree rarely beats a scan but is maintained on every write.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - composite/partial indexes for lead and email status."""
+
+    op.create_index(
+        'idx_leads_dealership_status',
+        'leads',
+        ['dealership_id', 'status']
+    )
+    op.create_index(
+        'idx_leads_open',
+        'leads',
+        ['dealership_id', 'created_at'],
+        postgresql_where=sa.text("status IN ('new', 'contacted', 'qualified')")
+    )
+    op.drop_index('ix_leads_status', table_name='leads')
+    op.drop_index('ix_leads_source', table_name='leads')
+    op.drop_index('idx_emails_status', table_name='emails')
+
+
+def downgrade() -> None:
+    """Downgrade schema - restore single-column status/source indexes."""
+
+    op.create_index('idx_emails_status', 'emails', ['processing_status'])
+    op.create_index('ix_leads_source', 'leads', ['source'], unique=False)
+    op.create_index('ix_leads_status', 'leads', ['status'], unique=False)
+    op.drop_index('idx_leads_open', table_name='leads')
+    op.drop_index('idx_leads_dealership_status', table_name='leads')
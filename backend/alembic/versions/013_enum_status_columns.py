@@ -0,0 +1,86 @@
+"""store closed value sets as enum types
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-15
+
+Adds:
+- conversation_channel, conversation_direction, conversation_sender_type
+- email_processing_status, email_classification
+
+conversations.channel/direction/sender_type and emails.processing_status/
+classification were VARCHARs holding a handful of values. Enum values are
+stored as a fixed 4-byte OID, which shrinks rows and the indexes that
+include these columns. Out-of-set values are normalized before conversion.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+
+# (table, column, enum type, values, fallback for unknown values, varchar length)
+ENUM_COLUMNS = (
+    ('conversations', 'channel', 'conversation_channel',
+     ('email', 'sms', 'facebook', 'website', 'manual'), 'manual', 50),
+    ('conversations', 'direction', 'conversation_direction',
+     ('inbound', 'outbound'), None, 20),
+    ('conversations', 'sender_type', 'conversation_sender_type',
+     ('customer', 'ai', 'human'), None, 20),
+    ('emails', 'processing_status', 'email_processing_status',
+     ('pending', 'processing', 'completed', 'failed'), 'failed', 50),
+    ('emails', 'classification', 'email_classification',
+     ('sales_inquiry', 'spam', 'other', 'uncertain'), 'uncertain', 50),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema - convert status/channel columns to enum types."""
+
+    for table, column, type_name, values, fallback, _ in ENUM_COLUMNS:
+        sa.Enum(*values, name=type_name).create(op.get_bind())
+
+        if fallback:
+            op.execute(
+                sa.text(
+                    f"UPDATE {table} SET {column} = :fallback "
+                    f"WHERE {column} IS NOT NULL AND {column} NOT IN :values"
+                ).bindparams(
+                    sa.bindparam('values', expanding=True),
+                    fallback=fallback,
+                    values=list(values),
+                )
+            )
+
+    op.alter_column('emails', 'processing_status', server_default=None)
+
+    for table, column, type_name, _, _, _ in ENUM_COLUMNS:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} "
+            f"TYPE {type_name} USING {column}::{type_name}"
+        )
+
+    op.alter_column(
+        'emails',
+        'processing_status',
+        server_default=sa.text("'pending'::email_processing_status")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - restore varchar status/channel columns."""
+
+    op.alter_column('emails', 'processing_status', server_default=None)
+
+    for table, column, type_name, _, _, length in ENUM_COLUMNS:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} "
+            f"TYPE varchar({length}) USING {column}::text"
+        )
+        op.execute(f"DROP TYPE {type_name}")
+
+    op.alter_column('emails', 'processing_status', server_default='pending')
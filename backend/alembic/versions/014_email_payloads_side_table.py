@@ -0,0 +1,86 @@
+"""move large email columns to an email_payloads side table
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-15
+
+Adds:
+- email_payloads table (email_id PK/FK, raw_headers, attachments, body_html)
+- RLS policy for email_payloads (visible when the parent email is visible)
+
+Drops:
+- emails.raw_headers, emails.attachments, emails.body_html
+
+The processing queue and inbox list scan emails by status/received_at and
+never read these columns. Moving them out keeps emails rows small, so more
+of them fit per page.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '014'
+down_revision = '013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - create email_payloads and move columns into it."""
+
+    op.create_table(
+        'email_payloads',
+        sa.Column('email_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('raw_headers', postgresql.JSONB(), nullable=True),
+        sa.Column('attachments', postgresql.JSONB(), nullable=True),
+        sa.Column('body_html', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['email_id'], ['emails.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('email_id')
+    )
+    op.execute("ALTER TABLE email_payloads ALTER COLUMN body_html SET STORAGE EXTERNAL")
+
+    op.execute("""
+        INSERT INTO email_payloads (email_id, raw_headers, attachments, body_html)
+        SELECT id, raw_headers, attachments, body_html
+        FROM emails
+        WHERE raw_headers IS NOT NULL
+           OR attachments IS NOT NULL
+           OR body_html IS NOT NULL
+    """)
+
+    op.drop_column('emails', 'body_html')
+    op.drop_column('emails', 'attachments')
+    op.drop_column('emails', 'raw_headers')
+
+    # The parent email's own RLS policy applies inside the EXISTS subquery
+    op.execute("""
+        ALTER TABLE email_payloads ENABLE ROW LEVEL SECURITY;
+
+        CREATE POLICY dealership_isolation ON email_payloads
+        FOR ALL
+        USING (
+            EXISTS (SELECT 1 FROM emails WHERE emails.id = email_payloads.email_id)
+        );
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema - move payload columns back onto emails."""
+
+    op.add_column('emails', sa.Column('raw_headers', postgresql.JSONB(), nullable=True))
+    op.add_column('emails', sa.Column('attachments', postgresql.JSONB(), nullable=True))
+    op.add_column('emails', sa.Column('body_html', sa.Text(), nullable=True))
+    op.execute("ALTER TABLE emails ALTER COLUMN body_html SET STORAGE EXTERNAL")
+
+    op.execute("""
+        UPDATE emails
+        SET raw_headers = p.raw_headers,
+            attachments = p.attachments,
+            body_html = p.body_html
+        FROM email_payloads p
+        WHERE p.email_id = emails.id
+    """)
+
+    op.execute("DROP POLICY IF EXISTS dealership_isolation ON email_payloads")
+    op.drop_table('email_payloads')
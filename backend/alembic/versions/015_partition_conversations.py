@@ -0,0 +1,112 @@
+"""hash-partition conversations by dealership_id
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-15
+
+Adds:
+- conversations as a table PARTITION BY HASH (dealership_id), 16 partitions
+  (conversations_p0 .. conversations_p15)
+- primary key (dealership_id, id); the partition key must be part of it
+
+Every conversation query is scoped by dealership_id (explicitly and via
+RLS), so the planner prunes to one partition and walks that partition's
+smaller local indexes. The primary key now leads with dealership_id and
+covers the dealership FK, so idx_conversations_dealership_id is dropped.
+
+emails is left unpartitioned: message_id must stay globally unique and
+email_payloads references emails.id, neither of which a hash-partitioned
+table can enforce without including dealership_id.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '015'
+down_revision = '014'
+branch_labels = None
+depends_on = None
+
+
+PARTITIONS = 16
+
+RLS_POLICY = """
+    ALTER TABLE conversations ENABLE ROW LEVEL SECURITY;
+
+    CREATE POLICY dealership_isolation_conversations ON conversations
+    FOR ALL
+    USING (
+        dealership_id = NULLIF(current_setting('app.current_dealership_id', true), '')::uuid
+    );
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema - rebuild conversations as a hash-partitioned table."""
+
+    op.execute("""
+        CREATE TABLE conversations_partitioned (
+            LIKE conversations INCLUDING DEFAULTS INCLUDING STORAGE
+        ) PARTITION BY HASH (dealership_id)
+    """)
+    for remainder in range(PARTITIONS):
+        op.execute(
+            f"CREATE TABLE conversations_p{remainder} PARTITION OF conversations_partitioned "
+            f"FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})"
+        )
+
+    op.execute("INSERT INTO conversations_partitioned SELECT * FROM conversations")
+    op.drop_table('conversations')
+    op.execute("ALTER TABLE conversations_partitioned RENAME TO conversations")
+
+    op.create_primary_key('conversations_pkey', 'conversations', ['dealership_id', 'id'])
+    op.create_foreign_key(
+        'conversations_lead_id_fkey', 'conversations', 'leads',
+        ['lead_id'], ['id'], ondelete='CASCADE'
+    )
+    op.create_foreign_key(
+        'conversations_dealership_id_fkey', 'conversations', 'dealerships',
+        ['dealership_id'], ['id'], ondelete='CASCADE'
+    )
+
+    # Partitioned indexes: created once on the parent, local to each partition
+    op.create_index(
+        'idx_conversations_lead_created_desc',
+        'conversations',
+        ['lead_id', sa.text('created_at DESC')]
+    )
+    op.create_index('ix_conversations_created_at', 'conversations', ['created_at'])
+
+    op.execute(RLS_POLICY)
+
+
+def downgrade() -> None:
+    """Downgrade schema - restore a plain conversations table."""
+
+    op.execute("""
+        CREATE TABLE conversations_plain (
+            LIKE conversations INCLUDING DEFAULTS INCLUDING STORAGE
+        )
+    """)
+    op.execute("INSERT INTO conversations_plain SELECT * FROM conversations")
+    op.drop_table('conversations')
+    op.execute("ALTER TABLE conversations_plain RENAME TO conversations")
+
+    op.create_primary_key('conversations_pkey', 'conversations', ['id'])
+    op.create_foreign_key(
+        'conversations_lead_id_fkey', 'conversations', 'leads',
+        ['lead_id'], ['id'], ondelete='CASCADE'
+    )
+    op.create_foreign_key(
+        'conversations_dealership_id_fkey', 'conversations', 'dealerships',
+        ['dealership_id'], ['id'], ondelete='CASCADE'
+    )
+    op.create_index(
+        'idx_conversations_lead_created_desc',
+        'conversations',
+        ['lead_id', sa.text('created_at DESC')]
+    )
+    op.create_index('ix_conversations_created_at', 'conversations', ['created_at'])
+    op.create_index('idx_conversations_dealership_id', 'conversations', ['dealership_id'])
+
+    op.execute(RLS_POLICY)
@@ -0,0 +1,37 @@
+"""index facebook_lead_id for webhook dedup
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-15
+
+Adds:
+- idx_leads_facebook_lead_id on leads ((source_metadata ->> 'facebook_lead_id'))
+
+Facebook leadgen dedup looks a lead up by its facebook_lead_id. A B-tree on
+the extracted text value answers that with a single equality probe instead
+of matching the jsonb_path_ops GIN index and rechecking the heap rows.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '016'
+down_revision = '015'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - add facebook_lead_id expression index."""
+
+    op.create_index(
+        'idx_leads_facebook_lead_id',
+        'leads',
+        [sa.text("(source_metadata ->> 'facebook_lead_id')")]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop facebook_lead_id expression index."""
+
+    op.drop_index('idx_leads_facebook_lead_id', table_name='leads')
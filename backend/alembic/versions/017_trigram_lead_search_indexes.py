@@ -0,0 +1,50 @@
+"""add trigram indexes for lead search
+
+Revision ID: 017
+Revises: 016
+Create Date: 2026-10-15
+
+Adds:
+- pg_trgm extension
+- idx_leads_customer_name_trgm on leads (customer_name gin_trgm_ops)
+- idx_leads_customer_email_trgm on leads ((customer_email::text) gin_trgm_ops)
+
+The lead list searches with ILIKE '%term%', which a B-tree can't serve
+because of the leading wildcard. Trigram GIN indexes can. The email column
+is citext, whose ILIKE operator doesn't use text operator classes, so it is
+indexed as customer_email::text and searched the same way.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '017'
+down_revision = '016'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - add trigram GIN indexes for lead search."""
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.create_index(
+        'idx_leads_customer_name_trgm',
+        'leads',
+        [sa.text('customer_name gin_trgm_ops')],
+        postgresql_using='gin'
+    )
+    op.create_index(
+        'idx_leads_customer_email_trgm',
+        'leads',
+        [sa.text('(customer_email::text) gin_trgm_ops')],
+        postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop trigram GIN indexes."""
+
+    op.drop_index('idx_leads_customer_email_trgm', table_name='leads')
+    op.drop_index('idx_leads_customer_name_trgm', table_name='leads')
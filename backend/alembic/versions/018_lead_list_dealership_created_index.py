@@ -0,0 +1,42 @@
+"""index the lead list by (dealership_id, created_at DESC)
+
+Revision ID: 018
+Revises: 017
+Create Date: 2026-10-15
+
+Adds:
+- idx_leads_dealership_created on leads (dealership_id, created_at DESC)
+
+Drops:
+- ix_leads_dealership_id (leading column of the new index)
+
+The lead list is always "WHERE dealership_id = ? ORDER BY created_at DESC
+LIMIT n", so the composite index returns a page already sorted, with no
+sort node. idx_leads_open still serves the open-pipeline view.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '018'
+down_revision = '017'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - replace dealership_id index with (dealership_id, created_at DESC)."""
+
+    op.create_index(
+        'idx_leads_dealership_created',
+        'leads',
+        ['dealership_id', sa.text('created_at DESC')]
+    )
+    op.drop_index('ix_leads_dealership_id', table_name='leads')
+
+
+def downgrade() -> None:
+    """Downgrade schema - restore single-column dealership_id index."""
+
+    op.create_index('ix_leads_dealership_id', 'leads', ['dealership_id'], unique=False)
+    op.drop_index('idx_leads_dealership_created', table_name='leads')
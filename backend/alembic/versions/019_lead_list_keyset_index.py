@@ -0,0 +1,46 @@
+"""add id to the lead list index for keyset pagination
+
+Revision ID: 019
+Revises: 018
+Create Date: 2026-10-15
+
+Adds:
+- idx_leads_dealership_created_id on leads (dealership_id, created_at DESC, id DESC)
+
+Drops:
+- idx_leads_dealership_created (prefix of the new index)
+
+The lead list pages with a (created_at, id) keyset cursor and orders by
+both columns. With id in the index, "WHERE (created_at, id) < (?, ?)" is an
+index seek and the page still comes back without a sort node.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '019'
+down_revision = '018'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - extend the lead list index with id DESC."""
+
+    op.create_index(
+        'idx_leads_dealership_created_id',
+        'leads',
+        ['dealership_id', sa.text('created_at DESC'), sa.text('id DESC')]
+    )
+    op.drop_index('idx_leads_dealership_created', table_name='leads')
+
+
+def downgrade() -> None:
+    """Downgrade schema - restore (dealership_id, created_at DESC) index."""
+
+    op.create_index(
+        'idx_leads_dealership_created',
+        'leads',
+        ['dealership_id', sa.text('created_at DESC')]
+    )
+    op.drop_index('idx_leads_dealership_created_id', table_name='leads')
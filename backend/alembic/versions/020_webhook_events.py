@@ -0,0 +1,39 @@
+"""add webhook_events for Clerk delivery idempotency
+
+Revision ID: 020
+Revises: 019
+Create Date: 2026-10-15
+
+Adds:
+- webhook_events table (svix_id PK, processed_at)
+
+Svix retries Clerk webhooks with the same svix-id. The handler inserts the
+id in the same transaction as the provisioning changes, so a retry of an
+applied event conflicts on the primary key and returns without touching
+dealerships or users. Not tenant data, so no RLS policy.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '020'
+down_revision = '019'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - create webhook_events."""
+
+    op.create_table(
+        'webhook_events',
+        sa.Column('svix_id', sa.String(length=255), nullable=False),
+        sa.Column('processed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('svix_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop webhook_events."""
+
+    op.drop_table('webhook_events')
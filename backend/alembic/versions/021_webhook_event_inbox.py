@@ -0,0 +1,48 @@
+"""store Clerk webhook events for background processing
+
+Revision ID: 021
+Revises: 020
+Create Date: 2026-10-16
+
+Adds:
+- webhook_events.event_type, webhook_events.payload (JSONB)
+- webhook_events.received_at
+
+Changes:
+- webhook_events.processed_at is nullable without a default
+
+The Clerk endpoint now stores the verified event and returns; a Celery
+worker applies it later and sets processed_at. Rows recorded before this
+revision were applied when received, so received_at is backfilled from
+processed_at.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '021'
+down_revision = '020'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - turn webhook_events into a processing inbox."""
+
+    op.add_column('webhook_events', sa.Column('event_type', sa.String(length=100), server_default='', nullable=False))
+    op.alter_column('webhook_events', 'event_type', server_default=None)
+    op.add_column('webhook_events', sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.add_column('webhook_events', sa.Column('received_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+    op.execute("UPDATE webhook_events SET received_at = processed_at")
+    op.alter_column('webhook_events', 'processed_at', nullable=True, server_default=None)
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop the inbox columns from webhook_events."""
+
+    op.execute("UPDATE webhook_events SET processed_at = coalesce(processed_at, received_at)")
+    op.alter_column('webhook_events', 'processed_at', nullable=False, server_default=sa.text('now()'))
+    op.drop_column('webhook_events', 'received_at')
+    op.drop_column('webhook_events', 'payload')
+    op.drop_column('webhook_events', 'event_type')
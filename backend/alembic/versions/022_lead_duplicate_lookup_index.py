@@ -0,0 +1,39 @@
+"""add index for the duplicate form submission lookup
+
+Revision ID: 022
+Revises: 021
+Create Date: 2026-10-16
+
+Adds:
+- idx_leads_dealership_email_created on leads (dealership_id, customer_email, created_at DESC)
+
+The form webhooks look for a lead from the same email to the same
+dealership within the last five minutes. ix_leads_customer_email alone
+still visits that email's leads at every dealership and filters them by
+time; with all three columns the lookup is a short range scan ending at
+the newest lead.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '022'
+down_revision = '021'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - create the duplicate lookup index."""
+
+    op.create_index(
+        'idx_leads_dealership_email_created',
+        'leads',
+        ['dealership_id', 'customer_email', sa.text('created_at DESC')]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop the duplicate lookup index."""
+
+    op.drop_index('idx_leads_dealership_email_created', table_name='leads')
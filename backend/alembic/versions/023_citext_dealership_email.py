@@ -0,0 +1,57 @@
+"""store dealerships.email as citext
+
+Revision ID: 023
+Revises: 022
+Create Date: 2026-10-16
+
+Changes:
+- dealerships.email VARCHAR(255) -> CITEXT
+
+leads.customer_email has been citext since 010; dealership emails were
+still compared case-sensitively, so dealerships_email_key allowed
+"Sales@x.no" next to "sales@x.no" and the Clerk handler's upsert (ON
+CONFLICT on email) missed an existing dealership whose email differed
+only in case. As citext the unique index is case-insensitive and is
+still the upsert's conflict target, which an index on lower(email)
+couldn't be.
+
+Fails if two dealerships already share an email up to case; merge or
+rename those first.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '023'
+down_revision = '022'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - citext dealerships.email."""
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS citext")
+
+    op.alter_column(
+        'dealerships',
+        'email',
+        existing_type=sa.String(255),
+        type_=postgresql.CITEXT(),
+        existing_nullable=False,
+        postgresql_using='email::citext'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - restore varchar dealerships.email."""
+
+    op.alter_column(
+        'dealerships',
+        'email',
+        existing_type=postgresql.CITEXT(),
+        type_=sa.String(255),
+        existing_nullable=False,
+        postgresql_using='email::varchar(255)'
+    )
@@ -2,17 +2,72 @@
 FastAPI dependencies for authentication and authorization.
 """
 from fastapi import Depends, Header
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional
 
-from ..core.database import get_db
-from ..core.auth import verify_clerk_jwt, get_user_from_clerk_id, get_dealership_from_org
+from ..core.database import get_db, get_async_db
+from ..core.auth import (
+    verify_clerk_jwt,
+    get_user_from_clerk_id,
+    get_user_from_clerk_id_async,
+    get_dealership_from_org,
+)
 from ..core.exceptions import UnauthorizedException, ForbiddenException
 from ..core.rls import set_dealership_context
 from ..models.user import User
 from ..models.dealership import Dealership
 
 
+def _get_bearer_token(authorization: Optional[str]) -> str:
+    """
+    Extract the token from a "Bearer <token>" Authorization header.
+    
+    Raises:
+        UnauthorizedException: If the header is missing or malformed
+    """
+    if not authorization:
+        raise UnauthorizedException("Missing authorization header")
+    
+    parts = authorization.split()
+    if len(parts) != 2 or parts[0].lower() != "bearer":
+        raise UnauthorizedException("Invalid authorization header format")
+    
+    return parts[1]
+
+
+def _get_user_id_from_claims(claims: dict) -> str:
+    """
+    Return the Clerk user ID from verified JWT claims.
+    
+    Raises:
+        UnauthorizedException: If the 'sub' claim is missing
+    """
+    # Clerk puts user ID in 'sub' claim
+    clerk_user_id = claims.get("sub")
+    if not clerk_user_id:
+        raise UnauthorizedException("Invalid token: missing user ID")
+    
+    return clerk_user_id
+
+
+def _get_clerk_user_id(authorization: Optional[str]) -> str:
+    """
+    Verify the Bearer token from the Authorization header.
+    
+    Returns:
+        str: Clerk user ID from the token's 'sub' claim
+        
+    Raises:
+        UnauthorizedException: If token is missing or invalid
+    """
+    token = _get_bearer_token(authorization)
+    
+    # Verify JWT with Clerk
+    return _get_user_id_from_claims(verify_clerk_jwt(token))
+
+
 def get_current_user(
     authorization: Optional[str] = Header(None),
     db: Session = Depends(get_db)
@@ -33,24 +88,7 @@ def get_current_user(
     Raises:
         UnauthorizedException: If token is missing or invalid
     """
-    if not authorization:
-        raise UnauthorizedException("Missing authorization header")
-    
-    # Extract token from "Bearer <token>"
-    parts = authorization.split()
-    if len(parts) != 2 or parts[0].lower() != "bearer":
-        raise UnauthorizedException("Invalid authorization header format")
-    
-    token = parts[1]
-    
-    # Verify JWT with Clerk
-    claims = verify_clerk_jwt(token)
-    
-    # Extract user ID from claims
-    # Clerk puts user ID in 'sub' claim
-    clerk_user_id = claims.get("sub")
-    if not clerk_user_id:
-        raise UnauthorizedException("Invalid token: missing user ID")
+    clerk_user_id = _get_clerk_user_id(authorization)
     
     # Load user from database
     user = get_user_from_clerk_id(clerk_user_id, db)
@@ -85,6 +123,60 @@ def get_current_dealership(
     return user.dealership
 
 
+async def get_current_user_async(
+    authorization: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """
+    Async variant of get_current_user for endpoints using AsyncSession.
+    
+    Sets the RLS context on the request's async session.
+    
+    Args:
+        authorization: Authorization header (Bearer token)
+        db: Async database session
+        
+    Returns:
+        User: Current authenticated user (dealership eagerly loaded)
+        
+    Raises:
+        UnauthorizedException: If token is missing or invalid
+    """
+    token = _get_bearer_token(authorization)
+    
+    # RS256 verification (and a JWKS fetch on a key cache miss) blocks
+    claims = await run_in_threadpool(verify_clerk_jwt, token)
+    clerk_user_id = _get_user_id_from_claims(claims)
+    
+    # The lookup sets the RLS context in the same statement
+    user = await get_user_from_clerk_id_async(clerk_user_id, db, set_context=True)
+    if not user:
+        raise UnauthorizedException("User not found")
+    
+    return user
+
+
+async def get_current_dealership_async(
+    user: User = Depends(get_current_user_async)
+) -> Dealership:
+    """
+    Async variant of get_current_dealership.
+    
+    Args:
+        user: Current authenticated user
+        
+    Returns:
+        Dealership: User's dealership
+        
+    Raises:
+        ForbiddenException: If user has no dealership
+    """
+    if not user.dealership:
+        raise ForbiddenException("User not associated with a dealership")
+    
+    return user.dealership
+
+
 def require_role(*allowed_roles: str):
     """
     Dependency factory for role-based access control.
@@ -2,15 +2,25 @@
 Conversation API endpoints.
 Provides endpoints for viewing and creating conversation messages.
 """
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+import orjson
+from fastapi import APIRouter, Depends, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import exists, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 from typing import List
 from uuid import UUID
-from datetime import datetime
 
-from ....core.database import get_db
+from ....core.database import get_async_db
 from ....core.exceptions import NotFoundException
-from ....api.deps import get_current_user, get_current_dealership
+from ....core.cache import cache_delete
+from ....core.response_cache import (
+    commit_and_invalidate,
+    conversations_key,
+    get_cached_response,
+    set_cached_response,
+)
+from ....api.deps import get_current_user_async, get_current_dealership_async
 from ....models.conversation import Conversation
 from ....models.lead import Lead
 from ....models.user import User
@@ -19,13 +29,16 @@ from ....schemas import ConversationCreate, ConversationResponse
 
 router = APIRouter()
 
+# Validates a whole result list in one pydantic-core call
+_CONVERSATION_LIST_ADAPTER = TypeAdapter(List[ConversationResponse])
+
 
 @router.get("/leads/{lead_id}/conversations", response_model=List[ConversationResponse])
-def get_conversations(
+async def get_conversations(
     lead_id: UUID,
-    user: User = Depends(get_current_user),
-    dealership: Dealership = Depends(get_current_dealership),
-    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user_async),
+    dealership: Dealership = Depends(get_current_dealership_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get all conversations for a specific lead.
@@ -33,30 +46,59 @@ def get_conversations(
     - Returns conversations ordered by created_at (newest first)
     - Verifies lead belongs to user's dealership
     - Returns 404 if lead not found
+    - Serialized with orjson and cached in Redis until the lead gets a new message
     """
-    # Verify lead exists and belongs to dealership
-    lead = db.query(Lead).filter(
-        Lead.id == lead_id,
-        Lead.dealership_id == dealership.id
-    ).first()
-    
-    if not lead:
-        raise NotFoundException("Lead not found")
+    cache_key = conversations_key(dealership.id, lead_id)
+    payload = await get_cached_response(cache_key)
     
-    # Get conversations for this lead
-    conversations = db.query(Conversation).filter(
-        Conversation.lead_id == lead_id
-    ).order_by(Conversation.created_at.desc()).all()
+    if payload is None:
+        conversations = (await db.scalars(
+            select(Conversation)
+            # Only the columns ConversationResponse needs (skips message_metadata)
+            .options(load_only(
+                Conversation.id,
+                Conversation.lead_id,
+                Conversation.dealership_id,
+                Conversation.channel,
+                Conversation.direction,
+                Conversation.sender,
+                Conversation.sender_type,
+                Conversation.message_content,
+                Conversation.created_at,
+            ))
+            .where(
+                Conversation.lead_id == lead_id,
+                Conversation.dealership_id == dealership.id,
+            )
+            .order_by(Conversation.created_at.desc())
+        )).all()
+        
+        # Only probe for the lead when there is nothing to return, to tell
+        # "unknown lead" (404) apart from "lead without messages" (empty list)
+        if not conversations:
+            lead_exists = await db.scalar(
+                select(exists().where(
+                    Lead.id == lead_id,
+                    Lead.dealership_id == dealership.id
+                ))
+            )
+            if not lead_exists:
+                raise NotFoundException("Lead not found")
+        
+        validated = _CONVERSATION_LIST_ADAPTER.validate_python(conversations, from_attributes=True)
+        # default=str covers asyncpg's own UUID type, which orjson doesn't know
+        payload = orjson.dumps(_CONVERSATION_LIST_ADAPTER.dump_python(validated), default=str)
+        await set_cached_response(cache_key, payload)
     
-    return [ConversationResponse.model_validate(conv) for conv in conversations]
+    return Response(content=payload, media_type="application/json")
 
 
 @router.post("/conversations", response_model=ConversationResponse, status_code=status.HTTP_201_CREATED)
-def create_conversation(
+async def create_conversation(
     conversation_data: ConversationCreate,
-    user: User = Depends(get_current_user),
-    dealership: Dealership = Depends(get_current_dealership),
-    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user_async),
+    dealership: Dealership = Depends(get_current_dealership_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Create a new conversation message.
@@ -67,33 +109,39 @@ def create_conversation(
     - Direction is 'outbound' for messages from dealership
     - Returns 404 if lead not found
     """
-    # Verify lead exists and belongs to dealership
-    lead = db.query(Lead).filter(
-        Lead.id == conversation_data.lead_id,
-        Lead.dealership_id == dealership.id
-    ).first()
+    # Touch the lead's last_contact_at; the RETURNING row doubles as the
+    # "lead exists and belongs to dealership" check
+    lead_id = (await db.execute(
+        update(Lead)
+        .where(
+            Lead.id == conversation_data.lead_id,
+            Lead.dealership_id == dealership.id
+        )
+        .values(last_contact_at=func.now())
+        .returning(Lead.id)
+        .execution_options(synchronize_session=False)
+    )).scalar_one_or_none()
     
-    if not lead:
+    if lead_id is None:
         raise NotFoundException("Lead not found")
     
-    # Create conversation instance
-    conversation = Conversation(
-        lead_id=conversation_data.lead_id,
-        dealership_id=dealership.id,
-        channel=conversation_data.channel,
-        direction="outbound",  # Message from dealership
-        sender=user.name or user.email,
-        sender_type="human",  # Manual message from user
-        message_content=conversation_data.message_content,
-    )
+    # INSERT ... RETURNING loads server defaults (created_at) without a refresh
+    conversation = (await db.scalars(
+        insert(Conversation)
+        .values(
+            lead_id=lead_id,
+            dealership_id=dealership.id,
+            channel=conversation_data.channel,
+            direction="outbound",  # Message from dealership
+            sender=user.name or user.email,
+            sender_type="human",  # Manual message from user
+            message_content=conversation_data.message_content,
+        )
+        .returning(Conversation)
+    )).one()
     
-    db.add(conversation)
-    
-    # Update lead's last_contact_at
-    lead.last_contact_at = datetime.utcnow()
-    
-    db.commit()
-    db.refresh(conversation)
+    await commit_and_invalidate(db)
+    # The bulk insert isn't seen by the session's cache listeners
+    await cache_delete(conversations_key(dealership.id, lead_id))
     
     return ConversationResponse.model_validate(conversation)
-
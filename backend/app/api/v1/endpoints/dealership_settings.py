@@ -9,17 +9,57 @@ Handles:
 import secrets
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, Dict, Any
 
-from ....core.database import get_db
-from ....api.deps import get_current_user
-from ....models.user import User
+from ....core.cache import cache_delete, forwarding_address_key
+from ....core.database import get_async_db
+from ....api.deps import get_current_dealership_async
 from ....models.dealership import Dealership
 
 
 router = APIRouter()
 
+# Forwarding address generation attempts before giving up
+FORWARDING_ADDRESS_ATTEMPTS = 3
+
+
+# Setup instructions shown to the dealership; only the address varies
+_SETUP_INSTRUCTIONS = """
+**Setup Instructions:**
+
+1. Forward all sales emails to: {address}
+
+2. How to set up email forwarding:
+   - **Gmail**: Settings → Forwarding and POP/IMAP → Add forwarding address
+   - **Outlook**: Settings → Mail → Forwarding → Enable forwarding
+   - **Other email providers**: Check your email provider's documentation
+
+3. Once forwarding is set up, all incoming sales emails will be automatically:
+   - Classified as sales inquiries, spam, or other
+   - Converted to leads if they're genuine sales inquiries
+   - Available in your dashboard for review
+
+**Note:** Make sure to keep your original email address active - we'll forward emails, not replace your inbox.
+""".strip()
+
+_ENABLED_INSTRUCTIONS = "Email integration is enabled for your dealership.\n\n" + _SETUP_INSTRUCTIONS
+
+_JUST_ENABLED_INSTRUCTIONS = (
+    "Email integration is now enabled!\n\n"
+    "**Your unique forwarding address:**\n{address}\n\n"
+    + _SETUP_INSTRUCTIONS
+)
+
+_DISABLED_INSTRUCTIONS = """
+Email integration is currently disabled.
+
+To enable email integration, click the "Enable Email Integration" button. You'll receive a unique forwarding address that you can use to monitor your sales inbox.
+""".strip()
+
+_DISABLED_CONFIRMATION = "Email integration has been disabled. You can re-enable it at any time."
+
 
 class EmailIntegrationSettings(BaseModel):
     """Schema for email integration settings."""
@@ -41,9 +81,8 @@ class EmailIntegrationResponse(BaseModel):
 
 
 @router.get("/email-integration", response_model=EmailIntegrationResponse)
-def get_email_integration_settings(
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user)
+async def get_email_integration_settings(
+    dealership: Dealership = Depends(get_current_dealership_async)
 ):
     """
     Get current email integration settings for the dealership.
@@ -53,38 +92,10 @@ def get_email_integration_settings(
     - email_forwarding_address: The unique forwarding address for this dealership
     - instructions: Setup instructions for the dealership
     """
-    dealership = db.query(Dealership).filter(Dealership.id == user.dealership_id).first()
-
-    if not dealership:
-        raise HTTPException(status_code=404, detail="Dealership not found")
-
-    instructions = ""
     if dealership.email_integration_enabled:
-        instructions = f"""
-Email integration is enabled for your dealership.
-
-**Setup Instructions:**
-
-1. Forward all sales emails to: {dealership.email_forwarding_address}
-
-2. How to set up email forwarding:
-   - **Gmail**: Settings → Forwarding and POP/IMAP → Add forwarding address
-   - **Outlook**: Settings → Mail → Forwarding → Enable forwarding
-   - **Other email providers**: Check your email provider's documentation
-
-3. Once forwarding is set up, all incoming sales emails will be automatically:
-   - Classified as sales inquiries, spam, or other
-   - Converted to leads if they're genuine sales inquiries
-   - Available in your dashboard for review
-
-**Note:** Make sure to keep your original email address active - we'll forward emails, not replace your inbox.
-""".strip()
+        instructions = _ENABLED_INSTRUCTIONS.format(address=dealership.email_forwarding_address)
     else:
-        instructions = """
-Email integration is currently disabled.
-
-To enable email integration, click the "Enable Email Integration" button. You'll receive a unique forwarding address that you can use to monitor your sales inbox.
-""".strip()
+        instructions = _DISABLED_INSTRUCTIONS
 
     return EmailIntegrationResponse(
         email_integration_enabled=dealership.email_integration_enabled,
@@ -94,9 +105,9 @@ To enable email integration, click the "Enable Email Integration" button. You'll
 
 
 @router.post("/email-integration/enable", response_model=EmailIntegrationResponse)
-def enable_email_integration(
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user)
+async def enable_email_integration(
+    db: AsyncSession = Depends(get_async_db),
+    dealership: Dealership = Depends(get_current_dealership_async)
 ):
     """
     Enable email integration for the dealership.
@@ -104,11 +115,6 @@ def enable_email_integration(
     Generates a unique forwarding address if not already created.
     Format: {dealership_slug}-{random_id}@leads.autolead.no
     """
-    dealership = db.query(Dealership).filter(Dealership.id == user.dealership_id).first()
-
-    if not dealership:
-        raise HTTPException(status_code=404, detail="Dealership not found")
-
     # Generate forwarding address if not exists
     if not dealership.email_forwarding_address:
         # Create slug from dealership name
@@ -118,47 +124,29 @@ def enable_email_integration(
         # Limit to 20 chars
         slug = slug[:20]
 
-        # Generate random ID (8 characters)
-        random_id = secrets.token_urlsafe(6)  # 6 bytes = 8 base64url chars
-
-        # Create unique forwarding address
-        forwarding_address = f"{slug}-{random_id}@leads.autolead.no"
-
-        # Check for duplicates (extremely unlikely)
-        while db.query(Dealership).filter(
-            Dealership.email_forwarding_address == forwarding_address
-        ).first():
-            random_id = secrets.token_urlsafe(6)
-            forwarding_address = f"{slug}-{random_id}@leads.autolead.no"
-
-        dealership.email_forwarding_address = forwarding_address
-
-    # Enable integration
-    dealership.email_integration_enabled = True
-    db.commit()
-
-    instructions = f"""
-Email integration is now enabled!
-
-**Your unique forwarding address:**
-{dealership.email_forwarding_address}
-
-**Setup Instructions:**
-
-1. Forward all sales emails to: {dealership.email_forwarding_address}
-
-2. How to set up email forwarding:
-   - **Gmail**: Settings → Forwarding and POP/IMAP → Add forwarding address
-   - **Outlook**: Settings → Mail → Forwarding → Enable forwarding
-   - **Other email providers**: Check your email provider's documentation
+        # idx_dealerships_email_forwarding is unique, so a collision (extremely
+        # unlikely) fails the commit; roll back and retry with a new random ID
+        for _ in range(FORWARDING_ADDRESS_ATTEMPTS):
+            # Generate random ID (11 characters)
+            random_id = secrets.token_urlsafe(8)  # 8 bytes = 11 base64url chars
+            dealership.email_forwarding_address = f"{slug}-{random_id}@leads.autolead.no"
+            dealership.email_integration_enabled = True
+            try:
+                await db.commit()
+                break
+            except IntegrityError:
+                await db.rollback()
+                await db.refresh(dealership)
+        else:
+            raise HTTPException(status_code=500, detail="Could not generate a unique forwarding address")
+    else:
+        # Enable integration
+        dealership.email_integration_enabled = True
+        await db.commit()
 
-3. Once forwarding is set up, all incoming sales emails will be automatically:
-   - Classified as sales inquiries, spam, or other
-   - Converted to leads if they're genuine sales inquiries
-   - Available in your dashboard for review
+    await cache_delete(forwarding_address_key(dealership.email_forwarding_address))
 
-**Note:** Make sure to keep your original email address active - we'll forward emails, not replace your inbox.
-""".strip()
+    instructions = _JUST_ENABLED_INSTRUCTIONS.format(address=dealership.email_forwarding_address)
 
     return EmailIntegrationResponse(
         email_integration_enabled=True,
@@ -168,25 +156,23 @@ Email integration is now enabled!
 
 
 @router.post("/email-integration/disable", response_model=EmailIntegrationResponse)
-def disable_email_integration(
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user)
+async def disable_email_integration(
+    db: AsyncSession = Depends(get_async_db),
+    dealership: Dealership = Depends(get_current_dealership_async)
 ):
     """
     Disable email integration for the dealership.
 
     Note: This does not delete the forwarding address - it can be re-enabled later.
     """
-    dealership = db.query(Dealership).filter(Dealership.id == user.dealership_id).first()
-
-    if not dealership:
-        raise HTTPException(status_code=404, detail="Dealership not found")
-
     dealership.email_integration_enabled = False
-    db.commit()
+    await db.commit()
+
+    if dealership.email_forwarding_address:
+        await cache_delete(forwarding_address_key(dealership.email_forwarding_address))
 
     return EmailIntegrationResponse(
         email_integration_enabled=False,
         email_forwarding_address=dealership.email_forwarding_address,
-        instructions="Email integration has been disabled. You can re-enable it at any time."
+        instructions=_DISABLED_CONFIRMATION
     )
@@ -6,39 +6,152 @@ Handles:
 - Email listing and management
 - Email processing triggers
 """
-import json
-from typing import Optional
+import datetime
+import hashlib
+from email.utils import parseaddr
+from typing import AsyncIterator, Literal, Optional, Tuple
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Form, BackgroundTasks
-from sqlalchemy.orm import Session
-
-from ....core.database import get_db
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request
+from multipart.multipart import MultipartParser, parse_options_header
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, selectinload
+from starlette.concurrency import run_in_threadpool
+from starlette.formparsers import MultiPartParser
+
+from ....core.cache import (
+    DEDUP_CLAIMED,
+    DEDUP_TTL_SECONDS,
+    FORWARDING_ADDRESS_TTL_SECONDS,
+    cache_get,
+    cache_set,
+    claim_dedup_key,
+    forwarding_address_key,
+    release_dedup_key,
+)
+from ....core.database import get_async_db, BackgroundSessionLocal
 from ....core.rls import set_dealership_context
-from ....api.deps import get_current_user
+from ....api.deps import get_current_user_async
 from ....models.email import Email
 from ....models.dealership import Dealership
 from ....models.user import User
 from ....schemas.email import EmailResponse, EmailListResponse
 from ....services.email_processor import email_processor
+from ....tasks import process_email_task
 
 
 router = APIRouter()
 
 
+async def _get_dealership_for_address(
+    db: AsyncSession,
+    address: str
+) -> Optional[Tuple[UUID, bool]]:
+    """
+    Look up (dealership_id, email_integration_enabled) by forwarding address.
+
+    Cached in Redis for a minute; the email integration settings endpoints
+    drop the key when they change it.
+    """
+    key = forwarding_address_key(address)
+    cached = await cache_get(key)
+    if cached is not None:
+        dealership_id, enabled = cached.split(":")
+        return UUID(dealership_id), enabled == "1"
+
+    row = (await db.execute(
+        select(Dealership.id, Dealership.email_integration_enabled)
+        .where(Dealership.email_forwarding_address == address)
+    )).first()
+    if row is None:
+        return None
+
+    await cache_set(key, f"{row.id}:{int(row.email_integration_enabled)}", FORWARDING_ADDRESS_TTL_SECONDS)
+    return row.id, row.email_integration_enabled
+
+
+async def _resolve_forwarding_address(db: AsyncSession, address: str) -> UUID:
+    """Return the dealership ID for an enabled forwarding address, else 404."""
+    dealership_id, integration_enabled = await _get_dealership_for_address(db, address) or (None, False)
+
+    if not integration_enabled:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No dealership found with forwarding address: {address}"
+        )
+
+    return dealership_id
+
+
+async def _read_form_field(
+    stream: AsyncIterator[bytes],
+    content_type: str,
+    field_name: str
+) -> Tuple[Optional[str], Optional[bytearray]]:
+    """
+    Read a multipart body only as far as the end of one form field.
+
+    Returns the field value (None if the body ended without it) and the
+    bytes consumed so far; the rest of the stream is left unread. Returns
+    (None, None) without reading anything if the body isn't multipart.
+    """
+    mime_type, params = parse_options_header(content_type)
+    boundary = params.get(b"boundary")
+    if mime_type != b"multipart/form-data" or not boundary:
+        return None, None
+
+    body = bytearray()
+    target = field_name.encode()
+    header_field = bytearray()
+    header_value = bytearray()
+    value = bytearray()
+    part_name: Optional[bytes] = None
+    found = False
+
+    def on_header_field(data: bytes, start: int, end: int) -> None:
+        header_field.extend(data[start:end])
+
+    def on_header_value(data: bytes, start: int, end: int) -> None:
+        header_value.extend(data[start:end])
+
+    def on_header_end() -> None:
+        nonlocal part_name
+        if header_field.lower() == b"content-disposition":
+            part_name = parse_options_header(bytes(header_value))[1].get(b"name")
+        header_field.clear()
+        header_value.clear()
+
+    def on_part_data(data: bytes, start: int, end: int) -> None:
+        if part_name == target:
+            value.extend(data[start:end])
+
+    def on_part_end() -> None:
+        nonlocal part_name, found
+        found = found or part_name == target
+        part_name = None
+
+    parser = MultipartParser(boundary, {
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+
+    async for chunk in stream:
+        body.extend(chunk)
+        parser.write(chunk)
+        if found:
+            return value.decode("utf-8", errors="replace"), body
+
+    return None, body
+
+
 @router.post("/webhook/inbound", status_code=200)
 async def receive_email_webhook(
-    background_tasks: BackgroundTasks,
-    to: str = Form(...),
-    from_: str = Form(..., alias="from"),
-    subject: str = Form(None),
-    text: Optional[str] = Form(None),
-    html: Optional[str] = Form(None),
-    headers: Optional[str] = Form(None),
-    envelope: Optional[str] = Form(None),
-    charsets: Optional[str] = Form(None),
-    SPF: Optional[str] = Form(None),
-    attachments: Optional[int] = Form(0),
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     SendGrid Inbound Parse webhook endpoint.
@@ -46,97 +159,153 @@ async def receive_email_webhook(
     Receives emails forwarded to dealership-specific addresses
     (e.g., bnh-abc123@leads.autolead.no) and processes them.
 
+    Form fields: to, from, subject, text, html, headers, envelope,
+    charsets, SPF, attachments.
+
     SendGrid documentation: https://docs.sendgrid.com/for-developers/parsing-email/setting-up-the-inbound-parse-webhook
     """
     # Parse the "to" address to find the dealership
     # Format: dealership-{short_id}@leads.autolead.no
     # For now, we'll look up by email_forwarding_address
-    dealership = db.query(Dealership).filter(
-        Dealership.email_forwarding_address == to,
-        Dealership.email_integration_enabled.is_(True)
-    ).first()
-
-    if not dealership:
-        raise HTTPException(
-            status_code=404,
-            detail=f"No dealership found with forwarding address: {to}"
-        )
+    #
+    # Only read the body up to the "to" field first, so misaddressed or
+    # disabled deliveries are rejected without buffering the (possibly
+    # multi-MB) text/html/attachment parts
+    stream = request.stream()
+    to, body = await _read_form_field(stream, request.headers.get("content-type", ""), "to")
+    dealership_id = await _resolve_forwarding_address(db, to) if to is not None else None
+
+    if body is not None:
+        # Already partly read: replay the consumed prefix, then stream the
+        # rest straight into the parser
+        async def replayed() -> AsyncIterator[bytes]:
+            yield body
+            async for chunk in stream:
+                yield chunk
+
+        form = await MultiPartParser(request.headers, replayed()).parse()
+    else:
+        form = await request.form()
+
+    # Attachments are spooled to temp files; a form parsed by hand isn't
+    # closed with the request, so close it here
+    try:
+        to = form.get("to")
+        from_ = form.get("from")
+        if not isinstance(to, str) or not isinstance(from_, str):
+            raise HTTPException(status_code=422, detail="Missing 'to' or 'from' field")
+
+        subject = form.get("subject")
+        text = form.get("text")
+        html = form.get("html")
+        headers = form.get("headers")
+
+        if dealership_id is None:
+            dealership_id = await _resolve_forwarding_address(db, to)
+
+        # Parse headers JSON
+        headers_dict = {}
+        if headers:
+            try:
+                headers_dict = orjson.loads(headers)
+            except orjson.JSONDecodeError:
+                headers_dict = {"raw": headers}
+
+        # Extract Message-ID from headers (required for deduplication)
+        message_id = headers_dict.get("Message-Id") or headers_dict.get("Message-ID")
+        if not message_id:
+            # Fallback: generate from from+to+subject+timestamp
+            unique_str = f"{from_}{to}{subject}{datetime.datetime.now(datetime.UTC).isoformat()}"
+            message_id = f"<{hashlib.blake2b(unique_str.encode(), digest_size=16).hexdigest()}@autolead.no>"
+
+        # Fast path for SendGrid retries; the Message-ID lookup below is the fallback
+        dedup_key = f"dedup:email:{message_id}"
+        if not await claim_dedup_key(dedup_key):
+            # The key holds the email's id once the first delivery has
+            # committed; email_id is null while that delivery is in flight
+            email_id = await cache_get(dedup_key)
+            return {
+                "status": "ok",
+                "message": "Email already processed",
+                "email_id": email_id if email_id != DEDUP_CLAIMED else None
+            }
 
-    # Parse headers JSON
-    headers_dict = {}
-    if headers:
         try:
-            headers_dict = json.loads(headers)
-        except json.JSONDecodeError:
-            headers_dict = {"raw": headers}
-
-    # Extract Message-ID from headers (required for deduplication)
-    message_id = headers_dict.get("Message-Id") or headers_dict.get("Message-ID")
-    if not message_id:
-        # Fallback: generate from from+to+subject+timestamp
-        import hashlib
-        import datetime
-        unique_str = f"{from_}{to}{subject}{datetime.datetime.now(datetime.UTC).isoformat()}"
-        message_id = f"<{hashlib.md5(unique_str.encode()).hexdigest()}@autolead.no>"
-
-    # Check if email already exists (deduplication)
-    existing_email = db.query(Email).filter(Email.message_id == message_id).first()
-    if existing_email:
-        return {"status": "ok", "message": "Email already processed", "email_id": str(existing_email.id)}
-
-    # Parse sender name and email
-    # Format: "Name <email@domain.com>" or just "email@domain.com"
-    from_name = None
-    from_email = from_
-    if "<" in from_ and ">" in from_:
-        # Extract name and email
-        parts = from_.split("<")
-        from_name = parts[0].strip().strip('"')
-        from_email = parts[1].strip(">").strip()
-
-    # Create email record
-    email = Email(
-        dealership_id=dealership.id,
-        message_id=message_id,
-        from_email=from_email,
-        from_name=from_name if from_name else None,
-        to_email=to,
-        subject=subject,
-        body_text=text,
-        body_html=html,
-        raw_headers=headers_dict,
-        attachments=None,  # TODO: Handle file uploads
-        processing_status="pending",
-    )
-
-    db.add(email)
-    db.commit()
-    db.refresh(email)
-
-    # Process email in background
-    background_tasks.add_task(process_email_background, email.id)
-
-    return {
-        "status": "ok",
-        "message": "Email received and queued for processing",
-        "email_id": str(email.id)
-    }
+            # Check if email already exists (deduplication)
+            existing = (await db.execute(
+                select(Email.id, Email.processing_status).where(Email.message_id == message_id)
+            )).first()
+            if existing:
+                existing_email_id = str(existing.id)
+                # The Redis key expired or was released; point it at the
+                # stored email so later retries take the fast path
+                await cache_set(dedup_key, existing_email_id, DEDUP_TTL_SECONDS)
+                if existing.processing_status == "pending":
+                    # The first delivery committed but its task may never
+                    # have been published; a duplicate run is a no-op
+                    process_email_task.delay(existing_email_id)
+                return {"status": "ok", "message": "Email already processed", "email_id": existing_email_id}
+
+            # Parse sender name and email
+            # Format: "Name <email@domain.com>" or just "email@domain.com"
+            from_name, from_email = parseaddr(from_)
+            # parseaddr gives ('', '') for input it can't parse; keep the raw value
+            from_email = from_email or from_
+
+            # Create email record
+            email = Email(
+                dealership_id=dealership_id,
+                message_id=message_id,
+                from_email=from_email,
+                from_name=from_name or None,
+                to_email=to,
+                subject=subject,
+                body_text=text,
+                body_html=html,
+                raw_headers=headers_dict,
+                attachments=None,  # TODO: Handle file uploads
+                processing_status="pending",
+            )
+
+            db.add(email)
+            await db.commit()
+            await cache_set(dedup_key, str(email.id), DEDUP_TTL_SECONDS)
+
+            # Process email on a Celery worker
+            process_email_task.delay(str(email.id))
+        except Exception:
+            # Let SendGrid's retry through
+            await release_dedup_key(dedup_key)
+            raise
+
+        return {
+            "status": "ok",
+            "message": "Email received and queued for processing",
+            "email_id": str(email.id)
+        }
+    finally:
+        await form.close()
 
 
 async def process_email_background(email_id: UUID):
     """
-    Background task to process an email.
+    Process an email and trigger the AI response for its lead.
 
-    This is called after the webhook returns 200 OK to SendGrid.
+    Run by process_email_task on a Celery worker.
     """
-    from ....core.database import SessionLocal
     from ....services.lead_processor import lead_processor
 
-    db = SessionLocal()
+    db = BackgroundSessionLocal()
     try:
-        email = db.query(Email).filter(Email.id == email_id).first()
-        if email:
-            email_processor.process_email(db, email)
+        # Sync session and a blocking Anthropic call: keep them off the event loop.
+        # The payload is loaded up front so classification doesn't lazy-load it
+        # (and reopen a transaction) while waiting on the API.
+        email = await run_in_threadpool(
+            db.get, Email, email_id, options=[selectinload(Email.payload)]
+        )
+        # A webhook retry may re-queue an email that's already been handled
+        if email and email.processing_status != "completed":
+            await run_in_threadpool(email_processor.process_email, db, email)
 
             # If a lead was created from this email, trigger AI response
             if email.lead_id:
@@ -150,13 +319,13 @@ async def process_email_background(email_id: UUID):
 
 
 @router.get("/", response_model=EmailListResponse)
-def list_emails(
+async def list_emails(
     skip: int = 0,
     limit: int = 50,
-    classification: Optional[str] = None,
-    processing_status: Optional[str] = None,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user)
+    classification: Optional[Literal["sales_inquiry", "spam", "other", "uncertain"]] = None,
+    processing_status: Optional[Literal["pending", "processing", "completed", "failed"]] = None,
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_user_async)
 ):
     """
     List emails for the current dealership.
@@ -165,18 +334,47 @@ def list_emails(
     - classification: Filter by classification (sales_inquiry, spam, other, uncertain)
     - processing_status: Filter by processing status (pending, processing, completed, failed)
     """
-    set_dealership_context(db, user.dealership_id)
-
-    query = db.query(Email).filter(Email.dealership_id == user.dealership_id)
+    filters = [Email.dealership_id == user.dealership_id]
 
     if classification:
-        query = query.filter(Email.classification == classification)
+        filters.append(Email.classification == classification)
 
     if processing_status:
-        query = query.filter(Email.processing_status == processing_status)
-
-    total = query.count()
-    emails = query.order_by(Email.received_at.desc()).offset(skip).limit(limit).all()
+        filters.append(Email.processing_status == processing_status)
+
+    # Page and total in one round trip (the window count sees all filtered
+    # rows before OFFSET/LIMIT). List items carry no bodies, so leave them
+    # (and email_payloads) unread
+    rows = (await db.execute(
+        select(Email, func.count().over().label("total"))
+        .options(load_only(
+            Email.id,
+            Email.dealership_id,
+            Email.lead_id,
+            Email.from_email,
+            Email.from_name,
+            Email.to_email,
+            Email.subject,
+            Email.processing_status,
+            Email.classification,
+            Email.classification_confidence,
+            Email.received_at,
+            Email.processed_at,
+        ))
+        .where(*filters)
+        .order_by(Email.received_at.desc())
+        .offset(skip)
+        .limit(limit)
+    )).all()
+
+    emails = [row.Email for row in rows]
+    if rows:
+        total = rows[0].total
+    elif skip:
+        # Paged past the end: no row to read the window count from
+        total = await db.scalar(select(func.count()).select_from(Email).where(*filters))
+    else:
+        total = 0
 
     return EmailListResponse(
         emails=emails,
@@ -187,18 +385,20 @@ def list_emails(
 
 
 @router.get("/{email_id}", response_model=EmailResponse)
-def get_email(
+async def get_email(
     email_id: UUID,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_user_async)
 ):
     """Get a specific email by ID."""
-    set_dealership_context(db, user.dealership_id)
-
-    email = db.query(Email).filter(
-        Email.id == email_id,
-        Email.dealership_id == user.dealership_id
-    ).first()
+    email = await db.scalar(
+        select(Email)
+        .options(selectinload(Email.payload))
+        .where(
+            Email.id == email_id,
+            Email.dealership_id == user.dealership_id
+        )
+    )
 
     if not email:
         raise HTTPException(status_code=404, detail="Email not found")
@@ -206,11 +406,28 @@ def get_email(
     return email
 
 
+def _process_email_sync(email_id: UUID, dealership_id: UUID) -> None:
+    """
+    Run the (blocking) email processor on its own sync session.
+
+    email_processor calls the Anthropic API synchronously, so it is run in
+    the threadpool instead of on the event loop.
+    """
+    db = BackgroundSessionLocal()
+    try:
+        set_dealership_context(db, dealership_id)
+        email = db.get(Email, email_id, options=[selectinload(Email.payload)])
+        if email:
+            email_processor.process_email(db, email)
+    finally:
+        db.close()
+
+
 @router.post("/{email_id}/reprocess", response_model=EmailResponse)
-def reprocess_email(
+async def reprocess_email(
     email_id: UUID,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_user_async)
 ):
     """
     Reprocess an email (e.g., if classification was uncertain or failed).
@@ -220,12 +437,14 @@ def reprocess_email(
     - Reclassifying uncertain emails
     - Re-extracting lead data
     """
-    set_dealership_context(db, user.dealership_id)
-
-    email = db.query(Email).filter(
-        Email.id == email_id,
-        Email.dealership_id == user.dealership_id
-    ).first()
+    email = await db.scalar(
+        select(Email)
+        .options(selectinload(Email.payload))
+        .where(
+            Email.id == email_id,
+            Email.dealership_id == user.dealership_id
+        )
+    )
 
     if not email:
         raise HTTPException(status_code=404, detail="Email not found")
@@ -234,10 +453,10 @@ def reprocess_email(
     email.processing_status = "pending"
     email.retry_count += 1
     email.error_message = None
-    db.commit()
+    await db.commit()
 
     # Process email
-    email_processor.process_email(db, email)
+    await run_in_threadpool(_process_email_sync, email.id, user.dealership_id)
 
-    db.refresh(email)
+    await db.refresh(email)
     return email
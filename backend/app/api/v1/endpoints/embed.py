@@ -128,6 +128,5 @@ def get_embed_documentation(
         api_base_url=api_base_url,
     )
 
-    docs["dealership_name"] = dealership.name
-
-    return docs
+    # docs is cached and shared between requests; don't mutate it
+    return {**docs, "dealership_name": dealership.name}
@@ -3,24 +3,38 @@ Facebook Lead Ads webhook endpoint.
 Handles webhook verification and leadgen event processing.
 """
 import hmac
-import hashlib
 import logging
-from fastapi import APIRouter, Request, HTTPException, BackgroundTasks
+import orjson
+from fastapi import APIRouter, Request, HTTPException
 from fastapi.responses import PlainTextResponse
+from sqlalchemy import exists, select
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from typing import Optional
 from uuid import UUID
 
 from app.core.config import settings
-from app.core.database import SessionLocal
+from app.core.cache import claim_dedup_key, release_dedup_key
+from app.core.database import BackgroundSessionLocal
 from app.services.facebook_client import FacebookClient, FacebookAuthError, FacebookGraphAPIError
 from app.models.lead import Lead
 from app.models.conversation import Conversation
 from app.models.dealership import Dealership
+from app.tasks import process_facebook_lead_task
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# App secret for X-Hub-Signature-256 verification, encoded once
+_FB_SECRET_BYTES = settings.FACEBOOK_APP_SECRET.encode() if settings.FACEBOOK_APP_SECRET else None
+
+# Bodies above this are HMAC'd in the threadpool instead of on the event loop
+_INLINE_SIGNATURE_MAX_BYTES = 64 * 1024
+
+# Fallback dealership for Facebook leads, see _get_dealership_for_page
+_default_dealership_id: Optional[UUID] = None
+
 
 @router.get("/webhooks/facebook", response_class=PlainTextResponse)
 async def verify_facebook_webhook(request: Request):
@@ -56,15 +70,12 @@ async def verify_facebook_webhook(request: Request):
 
 
 @router.post("/webhooks/facebook")
-async def receive_facebook_webhook(
-    request: Request,
-    background_tasks: BackgroundTasks
-):
+async def receive_facebook_webhook(request: Request):
     """
     Facebook leadgen webhook receiver (POST request).
 
     Receives leadgen events from Facebook when a customer submits a Lead Ad form.
-    Validates signature, extracts lead_id, and processes lead in background.
+    Validates signature, extracts lead_id, and queues the lead for processing.
 
     Security:
         - Verifies X-Hub-Signature-256 header using App Secret
@@ -77,15 +88,20 @@ async def receive_facebook_webhook(
     body_bytes = await request.body()
     signature_header = request.headers.get("X-Hub-Signature-256", "")
 
-    # Verify signature
-    if not verify_signature(body_bytes, signature_header):
+    # Verify signature (large batched deliveries would block the event loop)
+    if len(body_bytes) > _INLINE_SIGNATURE_MAX_BYTES:
+        signature_ok = await run_in_threadpool(verify_signature, body_bytes, signature_header)
+    else:
+        signature_ok = verify_signature(body_bytes, signature_header)
+
+    if not signature_ok:
         logger.warning("❌ Facebook webhook signature verification failed")
         raise HTTPException(status_code=401, detail="Invalid signature")
 
-    # Parse JSON body
+    # Parse JSON body (reuses the bytes read for the signature check)
     try:
-        data = await request.json()
-    except Exception as e:
+        data = orjson.loads(body_bytes)
+    except orjson.JSONDecodeError as e:
         logger.error(f"Error parsing webhook JSON: {str(e)}")
         raise HTTPException(status_code=400, detail="Invalid JSON")
 
@@ -111,9 +127,8 @@ async def receive_facebook_webhook(
 
                     logger.info(f"📋 Leadgen event: lead_id={leadgen_id}, page_id={page_id}, form_id={form_id}")
 
-                    # Queue background task to process lead
-                    background_tasks.add_task(
-                        process_facebook_lead,
+                    # Queue lead processing on a Celery worker
+                    process_facebook_lead_task.delay(
                         leadgen_id=leadgen_id,
                         page_id=page_id,
                         form_id=form_id
@@ -134,7 +149,7 @@ def verify_signature(payload: bytes, signature_header: str) -> bool:
     Returns:
         True if signature is valid, False otherwise
     """
-    if not settings.FACEBOOK_APP_SECRET:
+    if not _FB_SECRET_BYTES:
         logger.error("FACEBOOK_APP_SECRET not configured, rejecting webhook")
         return False
 
@@ -142,31 +157,104 @@ def verify_signature(payload: bytes, signature_header: str) -> bool:
         logger.warning("Missing X-Hub-Signature-256 header")
         return False
 
-    # Remove 'sha256=' prefix
+    # Remove 'sha256=' prefix and decode the hex digest
     try:
-        received_signature = signature_header.split("=")[1]
-    except IndexError:
+        received_signature = bytes.fromhex(signature_header.removeprefix("sha256="))
+    except ValueError:
         logger.warning("Malformed X-Hub-Signature-256 header")
         return False
 
-    # Calculate expected signature
-    expected_signature = hmac.new(
-        key=settings.FACEBOOK_APP_SECRET.encode(),
-        msg=payload,
-        digestmod=hashlib.sha256
-    ).hexdigest()
+    # Calculate expected signature (one-shot OpenSSL HMAC)
+    expected_signature = hmac.digest(_FB_SECRET_BYTES, payload, "sha256")
 
     # Constant-time comparison
     return hmac.compare_digest(expected_signature, received_signature)
 
 
+def _is_duplicate_facebook_lead(db: Session, leadgen_id: str) -> bool:
+    """Check whether a lead with this Facebook lead ID already exists."""
+    is_duplicate = db.scalar(
+        select(exists().where(
+            Lead.source_metadata["facebook_lead_id"].astext == leadgen_id
+        ))
+    )
+    # End the read transaction so the connection isn't held during the
+    # Graph API call that follows
+    db.commit()
+    return is_duplicate
+
+
+def _get_dealership_for_page(db: Session, page_id: str) -> Optional[UUID]:
+    """
+    Resolve the dealership that owns a Facebook page.
+
+    TODO: Determine dealership_id from page_id
+    This requires storing page_id -> dealership_id mapping in database.
+    For MVP/testing every page maps to a default dealership (first one in
+    database), resolved once per process.
+    """
+    global _default_dealership_id
+    if _default_dealership_id is None:
+        _default_dealership_id = db.scalar(
+            select(Dealership.id).order_by(Dealership.id).limit(1)
+        )
+    return _default_dealership_id
+
+
+def _persist_facebook_lead(db: Session, lead_data, page_id: str) -> Optional[UUID]:
+    """
+    Store a Facebook lead and its initial conversation record.
+
+    Synchronous; called through run_in_threadpool so the queries don't
+    block the event loop.
+
+    Returns:
+        The new lead's ID, or None if no dealership is configured
+    """
+    dealership_id = _get_dealership_for_page(db, page_id)
+    if not dealership_id:
+        logger.error("No dealerships configured in database. Please create at least one dealership before processing Facebook leads.")
+        return None
+
+    dealership_id = str(dealership_id)
+
+    # Convert to Lead model dictionary
+    lead_dict = lead_data.to_lead_dict(dealership_id)
+
+    # Create lead in database
+    new_lead = Lead(**lead_dict)
+    db.add(new_lead)
+    # Flush assigns the (client-side uuid7) id; no refresh SELECT after commit
+    db.flush()
+    lead_id = new_lead.id
+
+    # Create initial conversation record (same transaction as the lead)
+    if lead_data.initial_message:
+        conversation = Conversation(
+            lead_id=lead_id,
+            dealership_id=UUID(dealership_id),
+            channel="facebook",
+            direction="inbound",
+            sender=lead_data.customer_name or "Customer",
+            sender_type="customer",
+            message_content=lead_data.initial_message
+        )
+        db.add(conversation)
+
+    db.commit()
+
+    logger.info(f"✅ Created lead from Facebook: {lead_id} (customer: {lead_data.customer_name})")
+
+    return lead_id
+
+
 async def process_facebook_lead(
     leadgen_id: str,
     page_id: str,
     form_id: str
 ):
     """
-    Background task to process Facebook lead.
+    Process a Facebook lead (run by process_facebook_lead_task on a Celery worker).
 
     Steps:
     1. Check for duplicate lead (by facebook_lead_id)
@@ -183,16 +271,20 @@ async def process_facebook_lead(
     """
     logger.info(f"🔄 Processing Facebook lead: {leadgen_id}")
 
-    # Create new database session for background task
-    db = SessionLocal()
+    # Fast path for Meta retries; the database check below is the fallback
+    dedup_key = f"dedup:fb:{leadgen_id}"
+    if not await claim_dedup_key(dedup_key):
+        logger.info(f"⚠️ Duplicate lead detected: {leadgen_id}, skipping")
+        return
+
+    # Create new database session for the task
+    db = BackgroundSessionLocal()
     
     try:
         # Check for duplicate lead
-        existing_lead = db.query(Lead).filter(
-            Lead.source_metadata["facebook_lead_id"].astext == leadgen_id
-        ).first()
+        is_duplicate = await run_in_threadpool(_is_duplicate_facebook_lead, db, leadgen_id)
 
-        if existing_lead:
+        if is_duplicate:
             logger.info(f"⚠️ Duplicate lead detected: {leadgen_id}, skipping")
             return
 
@@ -206,10 +298,12 @@ async def process_facebook_lead(
         except FacebookAuthError as e:
             logger.error(f"❌ Facebook auth error: {str(e)}")
             # TODO: Alert dealership that token needs renewal
+            await release_dedup_key(dedup_key)
             return
         except FacebookGraphAPIError as e:
             logger.error(f"❌ Facebook API error: {str(e)}")
             # TODO: Implement retry logic
+            await release_dedup_key(dedup_key)
             return
 
         # Skip test leads
@@ -217,54 +311,20 @@ async def process_facebook_lead(
             logger.info(f"🧪 Test lead detected: {leadgen_id}, skipping AI response")
             # Still create lead for testing purposes, but mark it
 
-        # TODO: Determine dealership_id from page_id
-        # For now, we'll need to add logic to map page_id to dealership_id
-        # This requires storing page_id -> dealership_id mapping in database
-
-        # For MVP/testing: Use a default dealership (first one in database)
-        dealership = db.query(Dealership).first()
-        if not dealership:
-            logger.error("No dealerships configured in database. Please create at least one dealership before processing Facebook leads.")
+        lead_id = await run_in_threadpool(_persist_facebook_lead, db, lead_data, page_id)
+        if lead_id is None:
+            await release_dedup_key(dedup_key)
             return
 
-        dealership_id = str(dealership.id)
-
-        # Convert to Lead model dictionary
-        lead_dict = lead_data.to_lead_dict(dealership_id)
-
-        # Create lead in database
-        new_lead = Lead(**lead_dict)
-        db.add(new_lead)
-        db.commit()
-        db.refresh(new_lead)
-
-        logger.info(f"✅ Created lead from Facebook: {new_lead.id} (customer: {new_lead.customer_name})")
-
-        # Create initial conversation record
-        if lead_data.initial_message:
-            conversation = Conversation(
-                lead_id=new_lead.id,
-                dealership_id=UUID(dealership_id),
-                channel="facebook",
-                direction="inbound",
-                sender=lead_data.customer_name or "Customer",
-                sender_type="customer",
-                message_content=lead_data.initial_message
-            )
-            db.add(conversation)
-            db.commit()
-
-            logger.info(f"✅ Created conversation record for lead {new_lead.id}")
-
         # Trigger AI response workflow
         # - Generate AI response using Claude API
         # - Send email to customer
         # - Update lead status to 'contacted'
         if not lead_data.is_test:
-            logger.info(f"📧 Triggering AI response for lead {new_lead.id}")
+            logger.info(f"📧 Triggering AI response for lead {lead_id}")
             from ....services.lead_processor import lead_processor
             await lead_processor.process_new_lead(
-                lead_id=new_lead.id,
+                lead_id=lead_id,
                 db=db,
                 skip_ai_response=False
             )
@@ -272,6 +332,7 @@ async def process_facebook_lead(
     except Exception as e:
         logger.error(f"❌ Error processing Facebook lead {leadgen_id}: {str(e)}")
         db.rollback()
+        await release_dedup_key(dedup_key)
         raise
     finally:
         db.close()
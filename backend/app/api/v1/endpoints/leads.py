@@ -2,21 +2,32 @@
 Lead API endpoints.
 Provides CRUD operations for leads with authentication and multi-tenant isolation.
 """
-from fastapi import APIRouter, Depends, Query, status
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, or_
-from typing import Optional
+from fastapi import APIRouter, Depends, Query, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, load_only, selectinload
+from sqlalchemy import Text, cast, delete, func, insert, lambda_stmt, or_, select, tuple_, update
+from datetime import datetime
+from typing import List, Optional
 from uuid import UUID
-import math
 
-from ....core.database import get_db
-from ....core.exceptions import NotFoundException
-from ....api.deps import get_current_user, get_current_dealership
+from ....core.database import get_async_db
+from ....core.exceptions import NotFoundException, ValidationException
+from ....core.cache import cache_delete
+from ....core.response_cache import (
+    commit_and_invalidate,
+    conversations_key,
+    get_cached_response,
+    response_cache_key,
+    set_cached_response,
+)
+from ....api.deps import get_current_user_async, get_current_dealership_async
 from ....models.lead import Lead
 from ....models.user import User
 from ....models.dealership import Dealership
 from ....models.conversation import Conversation
 from ....schemas import (
+    Cursor,
     LeadCreate,
     LeadUpdate,
     LeadResponse,
@@ -26,17 +37,91 @@ from ....schemas import (
 
 router = APIRouter()
 
+# Columns behind LeadListResponse and its nested UserResponse
+_LEAD_LIST_COLUMNS = (
+    Lead.id,
+    Lead.dealership_id,
+    Lead.assigned_to,
+    Lead.customer_name,
+    Lead.customer_email,
+    Lead.customer_phone,
+    Lead.vehicle_interest,
+    Lead.initial_message,
+    Lead.source,
+    Lead.source_url,
+    Lead.status,
+    Lead.lead_score,
+    Lead.created_at,
+    Lead.last_contact_at,
+    Lead.converted_at,
+)
+_ASSIGNED_USER_COLUMNS = (User.id, User.name, User.email, User.role)
+
+_LEAD_LIST_ADAPTER = TypeAdapter(List[LeadListResponse])
+_LEAD_PAGE = PaginatedResponse[LeadListResponse]
+
+# Conversation count per lead, computed in the same statement (Postgres
+# only evaluates it for the rows that survive ORDER BY/LIMIT)
+_CONVERSATION_COUNT = (
+    select(func.count(Conversation.id))
+    .where(Conversation.lead_id == Lead.id)
+    .correlate(Lead)
+    .scalar_subquery()
+    .label("conversation_count")
+)
+
+# id breaks created_at ties so the keyset order is total
+_LEAD_LIST_ORDER = (Lead.created_at.desc(), Lead.id.desc())
+
+
+def _filter_leads(statement, dealership_id, status_filter, source, search):
+    """
+    Add the lead list filters to a lambda statement.
+
+    Each step is a lambda, so SQLAlchemy builds and compiles the SQL once
+    per combination of active filters and afterwards only binds the values.
+    """
+    statement += lambda s: s.where(Lead.dealership_id == dealership_id)
+    
+    if status_filter:
+        statement += lambda s: s.where(Lead.status == status_filter)
+    
+    if source:
+        statement += lambda s: s.where(Lead.source == source)
+    
+    if search:
+        search_term = f"%{search}%"
+        statement += lambda s: s.where(
+            or_(
+                Lead.customer_name.ilike(search_term),
+                # As text, so the trigram index applies (citext has its own ILIKE)
+                cast(Lead.customer_email, Text).ilike(search_term)
+            )
+        )
+    
+    return statement
+
+
+def _count_leads(dealership_id, status_filter, source, search):
+    """Count statement for the filtered lead list."""
+    return _filter_leads(
+        lambda_stmt(lambda: select(func.count()).select_from(Lead)),
+        dealership_id, status_filter, source, search
+    )
+
 
 @router.get("/leads", response_model=PaginatedResponse[LeadListResponse])
-def list_leads(
+async def list_leads(
     status_filter: Optional[str] = Query(None, alias="status", description="Filter by status"),
     source: Optional[str] = Query(None, description="Filter by source"),
     search: Optional[str] = Query(None, description="Search by customer name or email"),
     limit: int = Query(25, ge=1, le=100, description="Items per page"),
-    offset: int = Query(0, ge=0, description="Offset for pagination"),
-    user: User = Depends(get_current_user),
-    dealership: Dealership = Depends(get_current_dealership),
-    db: Session = Depends(get_db),
+    offset: int = Query(0, ge=0, description="Offset for pagination (deprecated, use the cursor)", deprecated=True),
+    cursor_ts: Optional[datetime] = Query(None, description="created_at of next_cursor from the previous page"),
+    cursor_id: Optional[UUID] = Query(None, description="id of next_cursor from the previous page"),
+    user: User = Depends(get_current_user_async),
+    dealership: Dealership = Depends(get_current_dealership_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     List leads with filtering and pagination.
@@ -45,69 +130,109 @@ def list_leads(
     - **source**: Filter by lead source (website, email, facebook, manual)
     - **search**: Search by customer name or email
     - **limit**: Number of items per page (1-100)
-    - **offset**: Pagination offset
+    - **offset**: Pagination offset (deprecated)
+    - **cursor_ts** / **cursor_id**: Keyset cursor; pass next_cursor from the
+      previous page to get the page after it (offset is then ignored)
     
     Returns paginated list of leads with conversation counts.
     """
-    # Base query with relationship loading
-    query = db.query(Lead).options(
-        joinedload(Lead.assigned_user)
-    ).filter(
-        Lead.dealership_id == dealership.id
+    if (cursor_ts is None) != (cursor_id is None):
+        raise ValidationException("cursor_ts and cursor_id must be given together")
+    
+    # Served from Redis until a lead (or user) of this dealership changes
+    cache_key = await response_cache_key(
+        dealership.id, "leads", status_filter, source, search, limit, offset, cursor_ts, cursor_id
     )
+    cached = await get_cached_response(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
     
-    # Apply filters
-    if status_filter:
-        query = query.filter(Lead.status == status_filter)
+    page_size = limit + 1  # one row past the page tells whether there is a next one
     
-    if source:
-        query = query.filter(Lead.source == source)
+    # Assigned users are fetched in one IN (...) query after the page,
+    # keeping the page query on leads alone. Both load only the columns
+    # LeadListResponse needs (skips source_metadata, the raw webhook payload)
+    query = _filter_leads(
+        lambda_stmt(lambda: select(Lead, _CONVERSATION_COUNT).options(
+            load_only(*_LEAD_LIST_COLUMNS),
+            selectinload(Lead.assigned_user).load_only(*_ASSIGNED_USER_COLUMNS)
+        )),
+        dealership.id, status_filter, source, search
+    )
     
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            or_(
-                Lead.customer_name.ilike(search_term),
-                Lead.customer_email.ilike(search_term)
-            )
+    if cursor_ts is not None:
+        # Keyset page: seek past the cursor instead of reading and
+        # discarding `offset` rows
+        query += lambda s: (
+            s.where(tuple_(Lead.created_at, Lead.id) < tuple_(cursor_ts, cursor_id))
+            .order_by(*_LEAD_LIST_ORDER)
+            .limit(page_size)
         )
+        rows = (await db.execute(query)).all()
+        # No total or page number: the count would scan every matching row
+        # on every page, and a cursor page has no page number
+        total = page = pages = None
+    else:
+        # Page and total in one statement (the window count sees all
+        # filtered rows before OFFSET/LIMIT)
+        query += lambda s: (
+            s.add_columns(func.count().over().label("total"))
+            .order_by(*_LEAD_LIST_ORDER)
+            .limit(page_size)
+            .offset(offset)
+        )
+        rows = (await db.execute(query)).all()
+        
+        if rows:
+            total = rows[0].total
+        elif offset:
+            # Paged past the end: no row to read the window count from
+            total = await db.scalar(_count_leads(dealership.id, status_filter, source, search))
+        else:
+            total = 0
+        
+        # Calculate pages (integer ceiling division, 0 when there are no rows)
+        pages = -(-total // limit)
+        page = (offset // limit) + 1
     
-    # Get total count before pagination
-    total = query.count()
-    
-    # Apply pagination and order
-    leads = query.order_by(Lead.created_at.desc()).limit(limit).offset(offset).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
     
-    # Add conversation counts
-    lead_responses = []
-    for lead in leads:
-        conversation_count = db.query(func.count(Conversation.id)).filter(
-            Conversation.lead_id == lead.id
-        ).scalar()
-        
-        lead_dict = LeadListResponse.model_validate(lead).model_dump()
-        lead_dict['conversation_count'] = conversation_count
-        lead_responses.append(LeadListResponse(**lead_dict))
+    # Validate the whole page in one pydantic-core call
+    lead_responses = _LEAD_LIST_ADAPTER.validate_python(
+        [row.Lead for row in rows], from_attributes=True
+    )
+    for lead_response, row in zip(lead_responses, rows):
+        lead_response.conversation_count = row.conversation_count
     
-    # Calculate pages
-    pages = math.ceil(total / limit) if total > 0 else 0
-    page = (offset // limit) + 1
+    next_cursor = None
+    if has_more:
+        last = rows[-1].Lead
+        next_cursor = Cursor(created_at=last.created_at, id=last.id)
     
-    return PaginatedResponse(
+    # The page is already built from validated models: construct the
+    # wrapper without validating it again and serialize it here rather than
+    # have FastAPI dump, re-validate and dump it (response_model still
+    # documents the shape)
+    payload = _LEAD_PAGE.model_construct(
         items=lead_responses,
         total=total,
         page=page,
         pages=pages,
-        limit=limit
-    )
+        limit=limit,
+        next_cursor=next_cursor
+    ).model_dump_json()
+    await set_cached_response(cache_key, payload)
+    
+    return Response(content=payload, media_type="application/json")
 
 
 @router.get("/leads/{lead_id}", response_model=LeadResponse)
-def get_lead(
+async def get_lead(
     lead_id: UUID,
-    user: User = Depends(get_current_user),
-    dealership: Dealership = Depends(get_current_dealership),
-    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user_async),
+    dealership: Dealership = Depends(get_current_dealership_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get a single lead by ID with full details.
@@ -115,25 +240,35 @@ def get_lead(
     Returns lead information including assigned user details.
     Returns 404 if lead not found or belongs to different dealership.
     """
-    lead = db.query(Lead).options(
-        joinedload(Lead.assigned_user)
-    ).filter(
-        Lead.id == lead_id,
-        Lead.dealership_id == dealership.id
-    ).first()
+    cache_key = await response_cache_key(dealership.id, "lead", lead_id)
+    cached = await get_cached_response(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
+    lead = await db.scalar(
+        select(Lead).options(
+            joinedload(Lead.assigned_user)
+        ).where(
+            Lead.id == lead_id,
+            Lead.dealership_id == dealership.id
+        )
+    )
     
     if not lead:
         raise NotFoundException("Lead not found")
     
-    return LeadResponse.model_validate(lead)
+    payload = LeadResponse.model_validate(lead).model_dump_json()
+    await set_cached_response(cache_key, payload)
+    
+    return Response(content=payload, media_type="application/json")
 
 
 @router.post("/leads", response_model=LeadResponse, status_code=status.HTTP_201_CREATED)
-def create_lead(
+async def create_lead(
     lead_data: LeadCreate,
-    user: User = Depends(get_current_user),
-    dealership: Dealership = Depends(get_current_dealership),
-    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user_async),
+    dealership: Dealership = Depends(get_current_dealership_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Create a new lead manually.
@@ -144,28 +279,31 @@ def create_lead(
     
     Returns the created lead with 201 status.
     """
-    # Create lead instance
-    lead = Lead(
-        dealership_id=dealership.id,
-        status="new",
-        lead_score=50,  # Default score
-        **lead_data.model_dump()
-    )
+    # INSERT ... RETURNING hands back server defaults (created_at) with the
+    # insert itself, so there is no refresh SELECT
+    lead = (await db.execute(
+        insert(Lead).values(
+            dealership_id=dealership.id,
+            status="new",
+            lead_score=50,  # Default score
+            **lead_data.model_dump()
+        ).returning(Lead)
+    )).scalar_one()
     
-    db.add(lead)
-    db.commit()
-    db.refresh(lead)
+    # Build the response before commit expires the instance
+    response = LeadResponse.model_validate(lead)
+    await commit_and_invalidate(db)
     
-    return LeadResponse.model_validate(lead)
+    return response
 
 
 @router.patch("/leads/{lead_id}", response_model=LeadResponse)
-def update_lead(
+async def update_lead(
     lead_id: UUID,
     lead_update: LeadUpdate,
-    user: User = Depends(get_current_user),
-    dealership: Dealership = Depends(get_current_dealership),
-    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user_async),
+    dealership: Dealership = Depends(get_current_dealership_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Update a lead (partial update).
@@ -174,31 +312,34 @@ def update_lead(
     - Only fields provided in request are updated
     - Returns 404 if lead not found
     """
-    lead = db.query(Lead).filter(
-        Lead.id == lead_id,
-        Lead.dealership_id == dealership.id
-    ).first()
+    # Update only provided fields
+    update_data = lead_update.model_dump(exclude_unset=True)
+    scope = (Lead.id == lead_id, Lead.dealership_id == dealership.id)
+    
+    # UPDATE ... RETURNING checks tenancy, writes and reads the row back in
+    # one statement; the assigned user is then selectin-loaded
+    if update_data:
+        statement = update(Lead).where(*scope).values(**update_data).returning(Lead)
+    else:
+        statement = select(Lead).where(*scope)
+    lead = (await db.execute(
+        statement.options(selectinload(Lead.assigned_user))
+    )).scalar_one_or_none()
     
     if not lead:
         raise NotFoundException("Lead not found")
     
-    # Update only provided fields
-    update_data = lead_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(lead, field, value)
-    
-    db.commit()
-    db.refresh(lead)
+    await commit_and_invalidate(db)
     
     return LeadResponse.model_validate(lead)
 
 
 @router.delete("/leads/{lead_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_lead(
+async def delete_lead(
     lead_id: UUID,
-    user: User = Depends(get_current_user),
-    dealership: Dealership = Depends(get_current_dealership),
-    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user_async),
+    dealership: Dealership = Depends(get_current_dealership_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Delete a lead permanently.
@@ -208,16 +349,21 @@ def delete_lead(
     - Returns 204 No Content on success
     - Returns 404 if lead not found
     """
-    lead = db.query(Lead).filter(
-        Lead.id == lead_id,
-        Lead.dealership_id == dealership.id
-    ).first()
+    # One DELETE ... RETURNING instead of loading the lead first; the
+    # database cascades to conversations and unlinks source emails
+    deleted_id = await db.scalar(
+        delete(Lead).where(
+            Lead.id == lead_id,
+            Lead.dealership_id == dealership.id
+        ).returning(Lead.id)
+    )
     
-    if not lead:
+    if not deleted_id:
         raise NotFoundException("Lead not found")
     
-    db.delete(lead)
-    db.commit()
+    await commit_and_invalidate(db)
+    # The database cascade is invisible to the session's cache listeners
+    await cache_delete(conversations_key(dealership.id, lead_id))
     
     return None
 
@@ -169,8 +169,8 @@ async def _process_lead_in_background_webhooks(lead_id: UUID):
     Background task wrapper that creates its own database session.
     This prevents "Session is closed" errors from sharing the request's session.
     """
-    from ....core.database import SessionLocal
-    db = SessionLocal()
+    from ....core.database import BackgroundSessionLocal
+    db = BackgroundSessionLocal()
     try:
         await lead_processor.process_new_lead(
             lead_id=lead_id,
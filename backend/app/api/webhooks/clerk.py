@@ -2,22 +2,29 @@
 
 from __future__ import annotations
 
-import json
 import logging
 import re
-import uuid
-from typing import Any, Dict, Tuple
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, Mapping, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import exists, func, literal, literal_column, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, load_only
 from svix.webhooks import Webhook, WebhookVerificationError
+from uuid_utils.compat import uuid7
 
 from ...core.config import settings
-from ...core.database import get_db
-from ...core.auth import get_dealership_from_org, get_user_from_clerk_id
+from ...core.database import AsyncSessionLocal, get_async_db
+from ...core.auth import get_user_from_clerk_id_async
 from ...models.dealership import Dealership
 from ...models.user import User
+from ...models.webhook_event import WebhookEvent
+from ...tasks import process_clerk_event_task
 
 logger = logging.getLogger(__name__)
 
@@ -25,9 +32,33 @@ logger = logging.getLogger(__name__)
 EMAIL_REGEX = re.compile(r'^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}$')
 
 
+# Clerk events are a few KB; anything far bigger isn't worth verifying
+_MAX_BODY_BYTES = 64 * 1024
+
+# The only columns the handlers read or update; loading whole rows would
+# also pull the integration settings and tokens
+_DEALERSHIP_COLUMNS = (Dealership.id, Dealership.clerk_org_id, Dealership.name, Dealership.email)
+_USER_COLUMNS = (User.id, User.dealership_id, User.clerk_user_id, User.email, User.name, User.role)
+
+# Clerk membership roles, bare or with the "org:" prefix of Clerk's default roles
+_ADMIN_ROLES = frozenset({"admin", "owner", "org:admin", "org:owner"})
+_MANAGER_ROLES = frozenset({"manager", "org:manager"})
+
+# SQLSTATEs of the constraint violations a handler can run into
+_UNIQUE_VIOLATION = "23505"
+_CHECK_VIOLATION = "23514"
+
+# Headers Svix needs to verify a delivery
+_SVIX_HEADERS = ("svix-id", "svix-timestamp", "svix-signature")
+
 router = APIRouter(prefix="/webhooks", tags=["webhooks"])
 
 
+def _is_valid_email(email: str | None) -> bool:
+    """Check an email against EMAIL_REGEX (anything without an @ fails fast)."""
+    return bool(email) and "@" in email and EMAIL_REGEX.match(email) is not None
+
+
 def _validate_and_normalize_email(email: str | None, clerk_org_id: str | None = None) -> str:
     """Validate email format and generate valid placeholder if needed.
     
@@ -38,7 +69,7 @@ def _validate_and_normalize_email(email: str | None, clerk_org_id: str | None =
     Returns:
         Valid email address (either original or generated placeholder)
     """
-    if email and EMAIL_REGEX.match(email):
+    if _is_valid_email(email):
         return email
     
     # Generate valid placeholder email if invalid or missing
@@ -50,22 +81,31 @@ def _validate_and_normalize_email(email: str | None, clerk_org_id: str | None =
     return "unknown@placeholder.norvalt.no"
 
 
-@router.post("/clerk", status_code=status.HTTP_200_OK)
+@router.post("/clerk", status_code=status.HTTP_200_OK, response_class=ORJSONResponse)
 async def clerk_webhook(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Dict[str, Any]:
     """Handle incoming Clerk webhook events.
 
-    Validates the Svix signature and dispatches to event-specific handlers.
+    Validates the Svix signature, stores the event and queues it for the
+    event-specific handler on a Celery worker.
     """
 
-    payload = await request.body()
+    payload = await _read_body(request)
     
-    # Normalize headers for Svix - it expects lowercase header names
-    headers = {key.lower(): value for key, value in request.headers.items()}
+    # Svix looks these up by lowercase name; Starlette's headers are
+    # case-insensitive, so pick them out instead of copying every header
+    headers = {
+        name: value
+        for name in _SVIX_HEADERS
+        if (value := request.headers.get(name)) is not None
+    }
 
-    logger.info("Webhook request received from %s", request.client.host if request.client else "unknown")
+    # Every Clerk delivery passes here; the stored event and the worker's log
+    # line are the useful record, so this is only for debugging
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Webhook request received from %s", request.client.host if request.client else "unknown")
     
     try:
         event = _verify_svix_signature(payload, headers)
@@ -79,86 +119,162 @@ async def clerk_webhook(
     event_type: str | None = event.get("type")
     data: Dict[str, Any] = event.get("data", {})
 
-    handlers = {
-        "organization.created": _handle_organization_created,
-        "organizationMembership.created": _handle_membership_created,
-        "user.deleted": _handle_user_deleted,
-        "organizationMembership.deleted": _handle_membership_deleted,
-    }
-
-    handler = handlers.get(event_type)
-    if not handler:
+    if event_type not in _HANDLERS:
         logger.debug("Unhandled Clerk webhook event: %s", event_type)
         return {"status": "ignored", "event_type": event_type}
 
+    svix_id = headers["svix-id"]
     try:
-        result = handler(data, db)
-        db.commit()
-        return {"status": "processed", "event_type": event_type, **result}
-    except HTTPException:
-        # Re-raise FastAPI exceptions so status codes propagate
-        db.rollback()
-        raise
-    except IntegrityError as exc:
-        # Handle database constraint violations
-        db.rollback()
-        error_detail = str(exc.orig) if hasattr(exc, 'orig') else str(exc)
-        
-        # Extract constraint violation details
-        if "CheckViolation" in error_detail or "valid_dealership_email" in error_detail:
-            logger.error(
-                "Email validation failed for webhook event %s: %s",
-                event_type,
-                error_detail
-            )
-            detail_msg = "Invalid email format provided. Email must match standard format (e.g., user@example.com)."
-            if settings.DEBUG:
-                detail_msg += f" Details: {error_detail}"
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=detail_msg
-            ) from exc
-        elif "UniqueViolation" in error_detail or "dealerships_email_key" in error_detail:
-            logger.error(
-                "Duplicate email violation for webhook event %s: %s",
-                event_type,
-                error_detail
-            )
-            detail_msg = "A dealership with this email already exists. The webhook may be retrying or the email is already in use."
-            if settings.DEBUG:
-                detail_msg += f" Details: {error_detail}"
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=detail_msg
-            ) from exc
-        else:
-            # Other integrity violations
-            logger.exception("Database integrity error handling webhook event %s", event_type)
-            detail_msg = f"Database constraint violation: {error_detail}"
-            if not settings.DEBUG:
-                detail_msg = "Database constraint violation occurred"
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=detail_msg
-            ) from exc
+        queued = await _record_delivery(db, svix_id, event_type, data)
+        await db.commit()
     except Exception as exc:  # noqa: BLE001 - we want to log unexpected errors
-        db.rollback()
-        logger.exception("Error handling Clerk webhook event %s", event_type)
+        await db.rollback()
+        logger.exception("Error storing Clerk webhook event %s", event_type)
         detail_msg = "Webhook handling failed"
         if settings.DEBUG:
             detail_msg += f": {str(exc)}"
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=detail_msg) from exc
 
+    if not queued:
+        logger.info("Skipping already processed Clerk webhook %s (%s)", svix_id, event_type)
+        return {"status": "duplicate", "event_type": event_type}
+
+    # Provisioning runs on a Celery worker; Svix only waits for the insert
+    process_clerk_event_task.delay(svix_id)
+
+    return {"status": "queued", "event_type": event_type}
+
+
+async def process_clerk_event(svix_id: str) -> None:
+    """
+    Apply a stored Clerk webhook event.
+
+    Run by process_clerk_event_task on a Celery worker.
+    """
+    async with AsyncSessionLocal() as db:
+        await handle_clerk_event(db, svix_id)
+
+
+async def handle_clerk_event(db: AsyncSession, svix_id: str) -> Dict[str, Any] | None:
+    """Run the handler for a stored event and mark it processed.
+
+    The row stays locked until commit, so a redelivery queued meanwhile
+    finds it processed and does nothing. A unique violation usually means
+    a concurrent event (organization.created and the membership arrive
+    together) inserted the same org or user first; it is re-raised so the
+    task retries and the lookup finds that row. Malformed events and other
+    constraint violations won't succeed on a retry: they are logged and
+    left unprocessed.
+
+    Returns:
+        The handler's result, or None if there was nothing (left) to apply
+    """
+    event = await db.scalar(
+        select(WebhookEvent)
+        .where(WebhookEvent.svix_id == svix_id)
+        .with_for_update()
+    )
+    if event is None or event.processed_at is not None:
+        return None
+
+    event_type = event.event_type
+    try:
+        result = {
+            "status": "processed",
+            "event_type": event_type,
+            **await _HANDLERS[event_type](event.payload, db),
+        }
+    except (HTTPException, IntegrityError) as exc:
+        await db.rollback()
+        if isinstance(exc, IntegrityError) and getattr(exc.orig, "pgcode", None) == _UNIQUE_VIOLATION:
+            logger.warning(
+                "Clerk webhook %s (%s) raced another event, retrying: %s",
+                svix_id,
+                event_type,
+                exc.orig
+            )
+            raise
+        error_detail = exc.detail if isinstance(exc, HTTPException) else _integrity_error_detail(exc)
+        logger.error("Could not apply Clerk webhook %s (%s): %s", svix_id, event_type, error_detail)
+        return None
+
+    event.processed_at = func.now()
+    await db.commit()
+    logger.info("Applied Clerk webhook %s (%s): %s", svix_id, event_type, result)
+    return result
+
+
+def _integrity_error_detail(exc: IntegrityError) -> str:
+    """Describe a constraint violation raised by an event handler."""
+    # psycopg2 and SQLAlchemy's asyncpg adapter both expose the SQLSTATE
+    pgcode = getattr(exc.orig, "pgcode", None)
+    if pgcode == _CHECK_VIOLATION:
+        return f"Invalid email format: {exc.orig}"
+    if pgcode == _UNIQUE_VIOLATION:
+        return f"Email or Clerk ID already in use: {exc.orig}"
+    return f"Database constraint violation: {exc.orig}"
+
+
+async def _record_delivery(
+    db: AsyncSession,
+    svix_id: str,
+    event_type: str,
+    data: Dict[str, Any],
+) -> bool:
+    """Store a Svix delivery for processing; False if it was already processed.
+
+    A redelivery of an event that is still unprocessed (e.g. its task was
+    lost) returns True so it is queued again. One being processed right
+    now waits on the worker's row lock and then sees it processed.
+    """
+    stmt = pg_insert(WebhookEvent).values(svix_id=svix_id, event_type=event_type, payload=data)
+    recorded = await db.scalar(
+        stmt.on_conflict_do_update(
+            index_elements=[WebhookEvent.svix_id],
+            set_={"svix_id": stmt.excluded.svix_id},
+            where=WebhookEvent.processed_at.is_(None),
+        )
+        .returning(WebhookEvent.svix_id)
+    )
+    return recorded is not None
+
+
+async def _read_body(request: Request) -> bytes:
+    """Read the request body, rejecting it with 413 past _MAX_BODY_BYTES.
+    
+    Checks Content-Length first and then counts while streaming, so an
+    oversized (or chunked) body is never buffered in full.
+    """
+    too_large = HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail="Payload too large"
+    )
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > _MAX_BODY_BYTES:
+        raise too_large
+    
+    chunks = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > _MAX_BODY_BYTES:
+            raise too_large
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+@lru_cache(maxsize=1)
+def _get_webhook(secret: str) -> Webhook:
+    """Build the Svix verifier once per secret (it base64-decodes the key)."""
+    return Webhook(secret)
+
 
 def _verify_svix_signature(payload: bytes, headers: Dict[str, str]) -> Dict[str, Any]:
     """Verify Svix signature and return parsed event payload.
     
-    Svix's webhook.verify() returns a dict directly, not a JSON string.
-    This function handles the verification and ensures we return a dict.
-    
     Args:
         payload: Raw request body bytes
-        headers: Request headers (should be lowercase normalized)
+        headers: Svix headers (lowercase names)
         
     Returns:
         Parsed event payload as a dict
@@ -166,29 +282,10 @@ def _verify_svix_signature(payload: bytes, headers: Dict[str, str]) -> Dict[str,
     Raises:
         WebhookVerificationError: If signature verification fails
     """
-    secret = settings.CLERK_WEBHOOK_SECRET
-    webhook = Webhook(secret)
-    
-    # Svix.verify() returns a dict directly when successful
-    parsed_event = webhook.verify(payload, headers)
-    
-    # Handle different return types from Svix (defensive programming)
-    if isinstance(parsed_event, dict):
-        return parsed_event
-    elif isinstance(parsed_event, (bytes, bytearray)):
-        # Edge case: if it returns bytes, decode and parse
-        decoded = parsed_event.decode("utf-8")
-        return json.loads(decoded)
-    elif isinstance(parsed_event, str):
-        # Edge case: if it returns a string, parse it
-        return json.loads(parsed_event)
-    else:
-        # Unexpected type - log and raise
-        logger.error(f"Unexpected return type from Svix.verify(): {type(parsed_event)}")
-        raise ValueError(f"Unexpected return type from webhook verification: {type(parsed_event)}")
+    return _get_webhook(settings.CLERK_WEBHOOK_SECRET).verify(payload, headers)
 
 
-def _handle_organization_created(data: Dict[str, Any], db: Session) -> Dict[str, Any]:
+async def _handle_organization_created(data: Dict[str, Any], db: AsyncSession) -> Dict[str, Any]:
     """Ensure a dealership exists for the Clerk organization."""
 
     clerk_org_id = data.get("id")
@@ -199,7 +296,12 @@ def _handle_organization_created(data: Dict[str, Any], db: Session) -> Dict[str,
     raw_email = data.get("primary_contact_email_address") or data.get("slug")
     email = _validate_and_normalize_email(raw_email, clerk_org_id)
 
-    dealership, created = _ensure_dealership(db, clerk_org_id, name=name, email=email)
+    dealership = await db.scalar(
+        select(Dealership)
+        .options(load_only(*_DEALERSHIP_COLUMNS))
+        .where(Dealership.clerk_org_id == clerk_org_id)
+    )
+    dealership, created = await _ensure_dealership(db, clerk_org_id, dealership, name=name, email=email)
 
     return {
         "dealership_id": str(dealership.id),
@@ -207,7 +309,7 @@ def _handle_organization_created(data: Dict[str, Any], db: Session) -> Dict[str,
     }
 
 
-def _handle_membership_created(data: Dict[str, Any], db: Session) -> Dict[str, Any]:
+async def _handle_membership_created(data: Dict[str, Any], db: AsyncSession) -> Dict[str, Any]:
     """Ensure dealership and user exist for a membership event."""
 
     organization = data.get("organization") or {}
@@ -224,31 +326,46 @@ def _handle_membership_created(data: Dict[str, Any], db: Session) -> Dict[str, A
     
     # Try to get user email from multiple sources
     raw_email = public_user.get("identifier")
+    user_email_valid = _is_valid_email(raw_email)
     # Also check email_addresses array if identifier is not available
-    if not raw_email or not EMAIL_REGEX.match(raw_email):
-        email_addresses = public_user.get("email_addresses", [])
-        if email_addresses and len(email_addresses) > 0:
-            # Get the first verified email, or first email if none verified
-            verified_email = next((e.get("email_address") for e in email_addresses if e.get("verification", {}).get("status") == "verified"), None)
-            if verified_email:
-                raw_email = verified_email
-            elif email_addresses[0].get("email_address"):
-                raw_email = email_addresses[0].get("email_address")
+    if not user_email_valid:
+        # Get the first verified email, or first email if none verified
+        verified_email = fallback_email = None
+        for entry in public_user.get("email_addresses") or ():
+            address = entry.get("email_address")
+            if not address:
+                continue
+            verification = entry.get("verification")
+            if verification and verification.get("status") == "verified":
+                verified_email = address
+                break
+            if fallback_email is None:
+                fallback_email = address
+        if verified_email or fallback_email:
+            raw_email = verified_email or fallback_email
+            user_email_valid = _is_valid_email(raw_email)
     
     first_name = public_user.get("first_name")
     last_name = public_user.get("last_name")
-    full_name = " ".join(filter(None, [first_name, last_name])).strip() or None
+    if first_name and last_name:
+        full_name = f"{first_name} {last_name}".strip() or None
+    else:
+        full_name = (first_name or last_name or "").strip() or None
 
     # Determine dealership email:
     # 1. Use valid user email if available
     # 2. Otherwise generate placeholder
     # 3. If dealership exists with placeholder, we'll update it below if we have valid email
-    user_email_valid = raw_email and EMAIL_REGEX.match(raw_email)
-    dealership_email = raw_email if user_email_valid else _validate_and_normalize_email(raw_email, clerk_org_id)
+    dealership_email = raw_email if user_email_valid else _validate_and_normalize_email(None, clerk_org_id)
     
-    dealership, created_dealership = _ensure_dealership(
+    dealership, user, has_users = await _get_dealership_and_user(db, clerk_org_id, clerk_user_id)
+    if dealership is None:
+        # A dealership relinked by email below may already have members
+        has_users = None
+    dealership, created_dealership = await _ensure_dealership(
         db,
         clerk_org_id,
+        dealership,
         name=organization.get("name"),
         email=dealership_email,
     )
@@ -263,15 +380,14 @@ def _handle_membership_created(data: Dict[str, Any], db: Session) -> Dict[str, A
         )
         dealership.email = raw_email
 
-    user = get_user_from_clerk_id(clerk_user_id, db)
     created_user = False
 
     if not user:
-        assigned_role = _determine_role(role, created_dealership, dealership, db)
+        assigned_role = await _determine_role(role, created_dealership, dealership, has_users, db)
         # Use validated email for user, or fallback to placeholder
-        user_email = raw_email if raw_email and EMAIL_REGEX.match(raw_email) else f"user-{clerk_user_id[:20]}@placeholder.norvalt.no"
+        user_email = raw_email if user_email_valid else f"user-{clerk_user_id[:20]}@placeholder.norvalt.no"
         user = User(
-            id=uuid.uuid4(),
+            id=uuid7(),
             dealership_id=dealership.id,
             clerk_user_id=clerk_user_id,
             email=user_email,
@@ -285,11 +401,11 @@ def _handle_membership_created(data: Dict[str, Any], db: Session) -> Dict[str, A
         if user.dealership_id != dealership.id:
             user.dealership_id = dealership.id
         # Update role if Clerk promotes/demotes
-        desired_role = _determine_role(role, created_dealership, dealership, db)
+        desired_role = await _determine_role(role, created_dealership, dealership, has_users, db)
         if user.role != desired_role:
             user.role = desired_role
         # Update email/name if provided and valid
-        if raw_email and EMAIL_REGEX.match(raw_email) and user.email != raw_email:
+        if user_email_valid and user.email != raw_email:
             user.email = raw_email
         if full_name and user.name != full_name:
             user.name = full_name
@@ -302,7 +418,7 @@ def _handle_membership_created(data: Dict[str, Any], db: Session) -> Dict[str, A
     }
 
 
-def _handle_user_deleted(data: Dict[str, Any], db: Session) -> Dict[str, Any]:
+async def _handle_user_deleted(data: Dict[str, Any], db: AsyncSession) -> Dict[str, Any]:
     """Delete user from database when user account is deleted in Clerk.
     
     This handler is called when a user account is completely deleted from Clerk.
@@ -316,7 +432,7 @@ def _handle_user_deleted(data: Dict[str, Any], db: Session) -> Dict[str, Any]:
             detail="Missing user ID in user.deleted event"
         )
     
-    user = get_user_from_clerk_id(clerk_user_id, db)
+    user = await get_user_from_clerk_id_async(clerk_user_id, db)
     if not user:
         logger.debug("User with Clerk ID %s not found in database, skipping deletion", clerk_user_id)
         return {
@@ -327,7 +443,7 @@ def _handle_user_deleted(data: Dict[str, Any], db: Session) -> Dict[str, Any]:
     
     user_id = str(user.id)
     user_email = user.email
-    db.delete(user)
+    await db.delete(user)
     logger.info(
         "Deleted user %s (email: %s, Clerk ID: %s) from database",
         user_id,
@@ -342,7 +458,7 @@ def _handle_user_deleted(data: Dict[str, Any], db: Session) -> Dict[str, Any]:
     }
 
 
-def _handle_membership_deleted(data: Dict[str, Any], db: Session) -> Dict[str, Any]:
+async def _handle_membership_deleted(data: Dict[str, Any], db: AsyncSession) -> Dict[str, Any]:
     """Delete user from database when removed from organization.
     
     In this application, users belong to a single dealership (organization).
@@ -368,7 +484,7 @@ def _handle_membership_deleted(data: Dict[str, Any], db: Session) -> Dict[str, A
         )
     
     # Verify the user belongs to this organization's dealership
-    dealership = get_dealership_from_org(clerk_org_id, db)
+    dealership, user, _ = await _get_dealership_and_user(db, clerk_org_id, clerk_user_id)
     if not dealership:
         logger.warning(
             "Dealership not found for Clerk org %s, cannot verify membership deletion",
@@ -381,7 +497,6 @@ def _handle_membership_deleted(data: Dict[str, Any], db: Session) -> Dict[str, A
             "message": "Dealership not found"
         }
     
-    user = get_user_from_clerk_id(clerk_user_id, db)
     if not user:
         logger.debug(
             "User with Clerk ID %s not found in database, skipping deletion",
@@ -410,7 +525,7 @@ def _handle_membership_deleted(data: Dict[str, Any], db: Session) -> Dict[str, A
     
     user_id = str(user.id)
     user_email = user.email
-    db.delete(user)
+    await db.delete(user)
     logger.info(
         "Deleted user %s (email: %s, Clerk ID: %s) from dealership %s",
         user_id,
@@ -427,106 +542,134 @@ def _handle_membership_deleted(data: Dict[str, Any], db: Session) -> Dict[str, A
     }
 
 
-def _ensure_dealership(
-    db: Session,
+# Event type -> handler
+_HANDLERS: Mapping[str, Callable[[Dict[str, Any], AsyncSession], Awaitable[Dict[str, Any]]]] = MappingProxyType({
+    "organization.created": _handle_organization_created,
+    "organizationMembership.created": _handle_membership_created,
+    "user.deleted": _handle_user_deleted,
+    "organizationMembership.deleted": _handle_membership_deleted,
+})
+
+
+async def _get_dealership_and_user(
+    db: AsyncSession,
     clerk_org_id: str,
+    clerk_user_id: str,
+) -> Tuple[Dealership | None, User | None, bool]:
+    """Look up the organization's dealership and the Clerk user in one query.
+
+    Both are left-joined onto a single-row FROM, so the result is always one
+    row with None for whichever doesn't exist. The user is matched by Clerk
+    ID alone: a member moving between organizations is found either way.
+    The query also reports whether the dealership has any users yet, for
+    _determine_role.
+    """
+    member = aliased(User)
+    row = (await db.execute(
+        select(
+            Dealership,
+            User,
+            exists().where(member.dealership_id == Dealership.id).label("has_users"),
+        )
+        .select_from(select(literal(1)).subquery())
+        .outerjoin(Dealership, Dealership.clerk_org_id == clerk_org_id)
+        .outerjoin(User, User.clerk_user_id == clerk_user_id)
+        .options(load_only(*_DEALERSHIP_COLUMNS), load_only(*_USER_COLUMNS))
+    )).one()
+    return row.Dealership, row.User, row.has_users
+
+
+async def _ensure_dealership(
+    db: AsyncSession,
+    clerk_org_id: str,
+    dealership: Dealership | None,
     *,
     name: str | None,
     email: str | None,
 ) -> Tuple[Dealership, bool]:
     """Fetch or create a dealership for the Clerk organization.
     
-    Checks for existing dealership by clerk_org_id first, then by email.
-    If found by email but different org_id, updates the org_id to prevent duplicates.
+    Takes the dealership already looked up by clerk_org_id (or None). If
+    there is none, a dealership with the same email is linked to the org
+    instead of creating a duplicate.
+    The email must already be valid (callers pass it through
+    _validate_and_normalize_email or check it with _is_valid_email).
     """
-    
-    # First, try to find by clerk_org_id (primary lookup)
-    dealership = get_dealership_from_org(clerk_org_id, db)
-    created = False
-
-    if dealership is None and email:
-        # If not found by org_id, check if dealership exists with this email
-        existing_by_email = db.query(Dealership).filter(Dealership.email == email).first()
-        if existing_by_email:
-            # Dealership exists with this email but different org_id
-            # Update the org_id to link them (handles org_id changes in Clerk)
+    if dealership is None:
+        # Insert the dealership, or relink the one that already has this
+        # email to the org (handles org_id changes in Clerk), in a single
+        # statement that can't race another delivery. xmax is 0 only on a
+        # freshly inserted row.
+        relink = {"clerk_org_id": clerk_org_id}
+        if name:
+            relink["name"] = name
+        row = (await db.execute(
+            pg_insert(Dealership)
+            .values(
+                id=uuid7(),
+                clerk_org_id=clerk_org_id,
+                name=name or "Unnamed Dealership",
+                email=email or "unknown@placeholder.norvalt.no",
+                subscription_status="active",
+                subscription_tier="starter",
+            )
+            .on_conflict_do_update(index_elements=[Dealership.email], set_=relink)
+            .returning(Dealership, literal_column("xmax = 0").label("created"))
+        )).one()
+        if not row.created:
             logger.info(
-                "Found dealership %s by email %s, updating clerk_org_id from %s to %s",
-                existing_by_email.id,
+                "Found dealership %s by email %s, linked it to Clerk org %s",
+                row.Dealership.id,
                 email,
-                existing_by_email.clerk_org_id,
                 clerk_org_id
             )
-            existing_by_email.clerk_org_id = clerk_org_id
-            dealership = existing_by_email
-            # Update name if provided and different
-            if name and dealership.name != name:
-                dealership.name = name
-            return dealership, False
+        return row.Dealership, row.created
 
-    if dealership is None:
-        # Create new dealership
-        dealership = Dealership(
-            id=uuid.uuid4(),
-            clerk_org_id=clerk_org_id,
-            name=name or "Unnamed Dealership",
-            email=email or "unknown@placeholder.norvalt.no",
-            subscription_status="active",
-            subscription_tier="starter",
-        )
-        db.add(dealership)
-        db.flush()  # Ensure dealership.id available
-        created = True
-    else:
-        # Update metadata if changed
-        updated = False
-        if name and dealership.name != name:
-            dealership.name = name
-            updated = True
-        if email and dealership.email != email:
-            # Only update email if it's valid and different
-            if EMAIL_REGEX.match(email):
-                dealership.email = email
-                updated = True
-            else:
-                logger.warning(
-                    "Skipping email update for dealership %s: invalid format %s",
-                    dealership.id,
-                    email
-                )
-        if updated:
-            logger.debug("Updated dealership metadata for Clerk org %s", clerk_org_id)
-
-    return dealership, created
-
-
-def _determine_role(
+    # Update metadata if changed
+    updated = False
+    if name and dealership.name != name:
+        dealership.name = name
+        updated = True
+    if email and dealership.email != email:
+        dealership.email = email
+        updated = True
+    if updated:
+        logger.debug("Updated dealership metadata for Clerk org %s", clerk_org_id)
+
+    return dealership, False
+
+
+async def _determine_role(
     clerk_role: str,
     created_dealership: bool,
     dealership: Dealership,
-    db: Session,
+    has_users: bool | None,
+    db: AsyncSession,
 ) -> str:
-    """Determine the application role for a Clerk membership."""
+    """Determine the application role for a Clerk membership.
+
+    has_users comes from _get_dealership_and_user; None means it isn't
+    known for this dealership and is looked up if needed.
+    """
 
     if created_dealership:
         # First user becomes admin
         return "admin"
 
     normalized = (clerk_role or "").lower()
-    if normalized in {"admin", "owner"}:
+    if normalized in _ADMIN_ROLES:
         return "admin"
 
     # Fall back to existing role if dealership already has this user set as admin
-    if normalized == "manager":
+    if normalized in _MANAGER_ROLES:
         return "manager"
 
     # For first member (dealership already existed but no users) promote to admin
-    user_count = (
-        db.query(User)
-        .filter(User.dealership_id == dealership.id)
-        .count()
-    )
-    if user_count == 0:
+    if has_users is None:
+        has_users = await db.scalar(
+            select(exists().where(User.dealership_id == dealership.id))
+        )
+    if not has_users:
         return "admin"
 
     return "sales_rep"
@@ -4,29 +4,110 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status, Path, BackgroundTasks
-from sqlalchemy.orm import Session
+from cachetools import TTLCache
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Path
+from sqlalchemy import func, null, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid_utils.compat import uuid7
 
-from ...core.database import get_db
+from ...core.cache import (
+    DEALERSHIP_TTL_SECONDS,
+    FORM_DEDUP_TTL_SECONDS,
+    cache_get,
+    cache_set,
+    claim_key,
+    dealership_key,
+    release_dedup_key,
+)
+from ...core.database import get_async_db
 from ...models.dealership import Dealership
 from ...models.lead import Lead
 from ...schemas import FormWebhookRequest, FormWebhookResponse
 from ...services.lead_processor import lead_processor
+from ...tasks import process_new_lead_task
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/webhooks", tags=["webhooks"])
 
+# Dealership id -> name, in front of the Redis copy: a dealership's site
+# tends to post several forms in a row to the same worker. Only touched
+# from the event loop thread, so no lock.
+_dealership_names: TTLCache = TTLCache(maxsize=1024, ttl=60)
+
+
+async def _lock_submitter(db: AsyncSession, dedup_key: str) -> None:
+    """
+    Serialize submissions from one email to one dealership until commit.
+
+    The Redis claim only says whether an earlier submission exists, not
+    whether its lead is committed yet, and it is skipped entirely when Redis
+    is down. Holding a transaction-level advisory lock across the duplicate
+    lookup and the insert makes a concurrent second submission wait for the
+    first one's lead instead of creating another.
+    """
+    await db.execute(select(func.pg_advisory_xact_lock(func.hashtext(dedup_key))))
+
+
+async def _get_dealership_and_duplicate(
+    db: AsyncSession,
+    dealership_id: UUID,
+    email: Optional[str]
+) -> Tuple[Optional[str], Optional[UUID]]:
+    """
+    Look up the dealership's name and, if an email is given, a lead from that
+    email within the duplicate window, in one round trip.
+
+    The name is cached in Redis for five minutes and in this process for
+    one (the webhook only needs to know the dealership exists, and
+    dealerships aren't deleted through the API), so with no email to check
+    this usually skips the database and often Redis too.
+
+    Returns:
+        (name, duplicate lead id or None); (None, None) if the dealership
+        doesn't exist.
+    """
+    key = dealership_key(dealership_id)
+    name = _dealership_names.get(key)
+    if name is None:
+        name = await cache_get(key)
+        if name is not None:
+            _dealership_names[key] = name
+    if name is not None and email is None:
+        return name, None
+
+    duplicate_id = null()
+    if email is not None:
+        # Check for duplicate within last 5 minutes (likely form resubmission)
+        five_minutes_ago = datetime.utcnow() - timedelta(minutes=5)
+        duplicate_id = select(Lead.id).where(
+            Lead.dealership_id == dealership_id,
+            Lead.customer_email == email,
+            Lead.created_at >= five_minutes_ago
+        ).limit(1).scalar_subquery()
+
+    row = (await db.execute(
+        select(Dealership.name, duplicate_id.label("duplicate_id"))
+        .where(Dealership.id == dealership_id)
+    )).first()
+    if row is None:
+        return None, None
+
+    if name is None:
+        _dealership_names[key] = row.name
+        await cache_set(key, row.name, DEALERSHIP_TTL_SECONDS)
+    return row.name, row.duplicate_id
+
 
 @router.post("/form/{dealership_id}", status_code=status.HTTP_200_OK, response_model=FormWebhookResponse)
 async def form_webhook(
+    background_tasks: BackgroundTasks,
     dealership_id: UUID = Path(..., description="Dealership UUID"),
     form_data: FormWebhookRequest = ...,
-    background_tasks: BackgroundTasks = ...,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Dict[str, Any]:
     """
     Handle website form submissions and create leads.
@@ -46,6 +127,7 @@ async def form_webhook(
     - Malformed JSON: Rejected by FastAPI (422)
 
     Args:
+        background_tasks: Runs the Celery dispatch after the response
         dealership_id: UUID of the dealership
         form_data: Validated form submission data
         db: Database session
@@ -65,9 +147,17 @@ async def form_webhook(
         form_data.email
     )
 
-    # Verify dealership exists
-    dealership = db.query(Dealership).filter(Dealership.id == dealership_id).first()
-    if not dealership:
+    # First submission from this email in the window: no duplicate to look
+    # for. customer_email is citext, so the key is case-folded to match
+    dedup_key = f"dedup:form:{dealership_id}:{form_data.email.lower()}"
+    claimed = await claim_key(dedup_key, FORM_DEDUP_TTL_SECONDS)
+    await _lock_submitter(db, dedup_key)
+
+    # Verify dealership exists (and find any recent duplicate with it)
+    dealership_name, duplicate_id = await _get_dealership_and_duplicate(
+        db, dealership_id, None if claimed else form_data.email
+    )
+    if dealership_name is None:
         logger.warning("Form webhook received for non-existent dealership: %s", dealership_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -75,37 +165,35 @@ async def form_webhook(
         )
 
     try:
-        # Check for duplicate within last 5 minutes (likely form resubmission)
-        five_minutes_ago = datetime.utcnow() - timedelta(minutes=5)
-        recent_duplicate = db.query(Lead).filter(
-            Lead.dealership_id == dealership_id,
-            Lead.customer_email == form_data.email,
-            Lead.created_at >= five_minutes_ago
-        ).first()
-
-        if recent_duplicate:
+        if duplicate_id:
             # Update existing lead with latest data
             logger.info(
                 "Duplicate form submission within 5 minutes for email %s, updating lead %s",
                 form_data.email,
-                recent_duplicate.id
+                duplicate_id
             )
-            recent_duplicate.customer_name = form_data.name
-            recent_duplicate.customer_phone = form_data.phone
-            recent_duplicate.vehicle_interest = form_data.vehicle_interest
-            recent_duplicate.initial_message = form_data.message
-            recent_duplicate.source_url = form_data.source_url
-
-            db.commit()
-            db.refresh(recent_duplicate)
+            await db.execute(
+                update(Lead)
+                .where(Lead.id == duplicate_id)
+                .values(
+                    customer_name=form_data.name,
+                    customer_phone=form_data.phone,
+                    vehicle_interest=form_data.vehicle_interest,
+                    initial_message=form_data.message,
+                    source_url=form_data.source_url,
+                )
+            )
+            await db.commit()
 
             return FormWebhookResponse(
-                lead_id=recent_duplicate.id,
+                lead_id=duplicate_id,
                 status="updated"
             )
 
-        # Create new lead
+        # Create new lead; the id is generated here, so nothing is read back
+        lead_id = uuid7()
         lead = Lead(
+            id=lead_id,
             dealership_id=dealership_id,
             customer_name=form_data.name,
             customer_email=form_data.email,
@@ -119,30 +207,30 @@ async def form_webhook(
         )
 
         db.add(lead)
-        db.commit()
-        db.refresh(lead)
+        await db.commit()
 
         logger.info(
             "Created lead %s for dealership %s from website form (customer: %s)",
-            lead.id,
+            lead_id,
             dealership_id,
             form_data.email
         )
 
-        # Queue AI auto-response workflow in background
-        # Note: Background task creates its own DB session to avoid "Session is closed" errors
-        background_tasks.add_task(
-            _process_lead_in_background,
-            lead_id=lead.id
-        )
+        # Queue AI auto-response workflow on a Celery worker. delay() is a
+        # blocking broker publish, so it runs in the threadpool once the
+        # response has been sent
+        background_tasks.add_task(process_new_lead_task.delay, str(lead_id))
 
         return FormWebhookResponse(
-            lead_id=lead.id,
+            lead_id=lead_id,
             status="created"
         )
 
     except Exception as exc:
-        db.rollback()
+        await db.rollback()
+        if claimed:
+            # The lead wasn't created; don't route a retry to the update path
+            await release_dedup_key(dedup_key)
         logger.exception(
             "Error processing form webhook for dealership %s",
             dealership_id
@@ -153,13 +241,14 @@ async def form_webhook(
         ) from exc
 
 
-async def _process_lead_in_background(lead_id: UUID):
+async def process_lead_background(lead_id: UUID):
     """
-    Background task wrapper that creates its own database session.
-    This prevents "Session is closed" errors from sharing the request's session.
+    Generate and send the AI response for a new website form lead.
+
+    Run by process_new_lead_task on a Celery worker.
     """
-    from ...core.database import SessionLocal
-    db = SessionLocal()
+    from ...core.database import BackgroundSessionLocal
+    db = BackgroundSessionLocal()
     try:
         await lead_processor.process_new_lead(
             lead_id=lead_id,
@@ -2,20 +2,58 @@
 Clerk JWT authentication module.
 Handles JWT verification using Clerk's JWKS endpoint.
 """
+import hashlib
+import re
 import httpx
-from jose import jwt, JWTError
-from sqlalchemy.orm import Session
-from typing import Dict, Optional
-from functools import lru_cache
+import threading
+import time
+from cachetools import TTLCache
+from jose import jwk, jwt, JWTError
+from jose.backends.base import Key
+from jose.exceptions import JWKError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from typing import Dict, Optional, Tuple
 import logging
 
 from .config import settings
 from .exceptions import UnauthorizedException, ForbiddenException
+from .rls import dealership_context_expression, remember_dealership_context
 from ..models.dealership import Dealership
 from ..models.user import User
 
 logger = logging.getLogger(__name__)
 
+# Verified claims keyed by a digest of the raw token. Clients poll with the
+# same token, so repeat requests skip the RS256 signature check. Entries
+# never outlive the token's own exp claim (checked on read).
+_claims_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+_claims_cache_lock = threading.Lock()
+
+# JWKS URL -> (monotonic expiry, monotonic fetch time, keys by kid)
+_jwks_cache: Dict[str, Tuple[float, float, Dict[str, Key]]] = {}
+_jwks_cache_lock = threading.Lock()
+
+JWKS_DEFAULT_TTL_SECONDS = 24 * 60 * 60
+# Floor for a short or zero max-age, so it can't mean a fetch per request
+JWKS_MIN_TTL_SECONDS = 60
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+_jwks_http: Optional[httpx.Client] = None
+
+
+def _jwks_client() -> httpx.Client:
+    """Shared client for JWKS fetches, so refreshes reuse the TLS connection."""
+    global _jwks_http
+    if _jwks_http is None:
+        _jwks_http = httpx.Client(
+            timeout=10.0,
+            limits=httpx.Limits(max_connections=2, max_keepalive_connections=2),
+        )
+    return _jwks_http
+
 
 def get_jwks_url() -> str:
     """
@@ -41,27 +79,54 @@ def get_jwks_url() -> str:
     )
 
 
-@lru_cache(maxsize=1)
-def fetch_jwks() -> Dict:
+def fetch_jwks(jwks_url: str, refresh: bool = False) -> Dict[str, Key]:
     """
-    Fetch JWKS (JSON Web Key Set) from Clerk.
-    Cached to avoid repeated requests.
+    Fetch JWKS (JSON Web Key Set) from Clerk and parse its signing keys.
+    
+    Cached per URL for the response's Cache-Control max-age (24 hours
+    if it has none), so rotated keys are picked up without a restart.
+    The keys are parsed once per fetch rather than on every verification.
     
+    Args:
+        jwks_url: JWKS endpoint URL
+        refresh: Refetch now (e.g. for an unknown key ID), unless the
+            cached set is younger than JWKS_MIN_TTL_SECONDS
+        
     Returns:
-        Dict: JWKS data containing public keys
+        Dict: Public keys by key ID (kid)
         
     Raises:
         UnauthorizedException: If JWKS cannot be fetched
     """
+    now = time.monotonic()
+    with _jwks_cache_lock:
+        cached = _jwks_cache.get(jwks_url)
+    if cached is not None:
+        expires_at, fetched_at, keys = cached
+        if now < expires_at and not (refresh and now - fetched_at >= JWKS_MIN_TTL_SECONDS):
+            return keys
+
     try:
-        jwks_url = get_jwks_url()
-        response = httpx.get(jwks_url, timeout=10.0)
+        response = _jwks_client().get(jwks_url)
         response.raise_for_status()
-        return response.json()
+        jwks = response.json()
     except httpx.HTTPError as e:
         logger.error(f"Failed to fetch JWKS from Clerk: {e}")
         raise UnauthorizedException("Unable to verify authentication")
 
+    keys = {}
+    for jwk_data in jwks.get("keys", []):
+        try:
+            keys[jwk_data["kid"]] = jwk.construct(jwk_data, jwk_data.get("alg", "RS256"))
+        except (KeyError, JWKError) as e:
+            logger.warning(f"Skipping unusable JWKS key {jwk_data.get('kid')}: {e}")
+
+    max_age = _MAX_AGE_RE.search(response.headers.get("cache-control", ""))
+    ttl = max(int(max_age.group(1)), JWKS_MIN_TTL_SECONDS) if max_age else JWKS_DEFAULT_TTL_SECONDS
+    with _jwks_cache_lock:
+        _jwks_cache[jwks_url] = (now + ttl, now, keys)
+    return keys
+
 
 def verify_clerk_jwt(token: str) -> Dict:
     """
@@ -76,10 +141,13 @@ def verify_clerk_jwt(token: str) -> Dict:
     Raises:
         UnauthorizedException: If token is invalid or verification fails
     """
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    with _claims_cache_lock:
+        claims = _claims_cache.get(cache_key)
+    if claims is not None and claims.get("exp", 0) > time.time():
+        return claims
+    
     try:
-        # Fetch JWKS
-        jwks = fetch_jwks()
-        
         # Decode the token header to get the key ID (kid)
         unverified_header = jwt.get_unverified_header(token)
         kid = unverified_header.get("kid")
@@ -88,13 +156,13 @@ def verify_clerk_jwt(token: str) -> Dict:
             raise UnauthorizedException("Invalid token: missing key ID")
         
         # Find the matching key in JWKS
-        key = None
-        for jwk_key in jwks.get("keys", []):
-            if jwk_key.get("kid") == kid:
-                key = jwk_key
-                break
+        jwks_url = get_jwks_url()
+        key = fetch_jwks(jwks_url).get(kid)
+        if key is None:
+            # Clerk may have rotated its keys since the last fetch
+            key = fetch_jwks(jwks_url, refresh=True).get(kid)
         
-        if not key:
+        if key is None:
             raise UnauthorizedException("Invalid token: key not found")
         
         # Verify and decode the JWT
@@ -110,6 +178,9 @@ def verify_clerk_jwt(token: str) -> Dict:
             }
         )
         
+        with _claims_cache_lock:
+            _claims_cache[cache_key] = claims
+        
         return claims
         
     except JWTError as e:
@@ -140,6 +211,9 @@ def get_user_from_clerk_id(clerk_user_id: str, db: Session) -> Optional[User]:
     """
     Get user from Clerk user ID.
     
+    The user's dealership is joined in the same query, so
+    get_current_dealership doesn't trigger a lazy load.
+    
     Args:
         clerk_user_id: Clerk user ID
         db: Database session
@@ -147,7 +221,48 @@ def get_user_from_clerk_id(clerk_user_id: str, db: Session) -> Optional[User]:
     Returns:
         User object or None if not found
     """
-    return db.query(User).filter(
+    return db.query(User).options(
+        joinedload(User.dealership)
+    ).filter(
         User.clerk_user_id == clerk_user_id
     ).first()
 
+
+async def get_user_from_clerk_id_async(
+    clerk_user_id: str,
+    db: AsyncSession,
+    set_context: bool = False
+) -> Optional[User]:
+    """
+    Get user from Clerk user ID using an async session.
+    
+    The dealership is joined in, since lazy loads aren't available on
+    AsyncSession.
+    
+    Args:
+        clerk_user_id: Clerk user ID
+        db: Async database session
+        set_context: Also set the RLS context to the user's dealership, in
+            the same statement (saves a separate set_config round trip)
+        
+    Returns:
+        User object or None if not found
+    """
+    stmt = (
+        select(User)
+        .options(joinedload(User.dealership))
+        .where(User.clerk_user_id == clerk_user_id)
+    )
+    if not set_context:
+        return await db.scalar(stmt)
+
+    row = (await db.execute(
+        stmt.add_columns(dealership_context_expression(User.dealership_id))
+    )).first()
+    if row is None:
+        return None
+
+    user = row.User
+    if user.dealership_id:
+        remember_dealership_context(db, user.dealership_id)
+    return user
@@ -0,0 +1,119 @@
+"""
+Shared Redis client for cross-worker caches.
+
+Redis is only an optimisation: the helpers here log and swallow Redis
+errors so callers fall back to the database when it is unreachable.
+"""
+import asyncio
+import logging
+import weakref
+from typing import Optional
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Webhook dedup keys outlive SendGrid's and Meta's retry windows
+DEDUP_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# Value of a claimed key (callers may overwrite it with something useful)
+DEDUP_CLAIMED = "1"
+
+# Forwarding address -> dealership lookups on the inbound email webhook
+FORWARDING_ADDRESS_TTL_SECONDS = 60
+
+# Repeat website form submissions from one email update the recent lead
+FORM_DEDUP_TTL_SECONDS = 5 * 60
+
+# Dealership id -> name lookups on the website form webhook
+DEALERSHIP_TTL_SECONDS = 300
+
+# Connections belong to the event loop that opened them. The API has one
+# loop, each Celery worker process another (tasks._run reuses it), and
+# tests may start their own with asyncio.run(), so keep one client per loop
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Redis]" = weakref.WeakKeyDictionary()
+
+
+def get_redis() -> Redis:
+    """Get the Redis client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = Redis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=0.5,
+            socket_timeout=0.5,
+        )
+        _clients[loop] = client
+    return client
+
+
+def forwarding_address_key(address: str) -> str:
+    """Cache key for the dealership behind an email forwarding address."""
+    return f"dealership:addr:{address}"
+
+
+def dealership_key(dealership_id) -> str:
+    """Cache key for a dealership's slim (name-only) projection."""
+    return f"dealership:{dealership_id}"
+
+
+async def cache_get(key: str) -> Optional[str]:
+    """Read a cached string value, or None on a miss or Redis error."""
+    try:
+        value = await get_redis().get(key)
+    except RedisError as e:
+        logger.warning(f"Redis unavailable, cache miss for {key}: {e}")
+        return None
+    return value.decode() if value is not None else None
+
+
+async def cache_set(key: str, value: str, ttl: int) -> None:
+    """Cache a string value for ttl seconds."""
+    try:
+        await get_redis().set(key, value, ex=ttl)
+    except RedisError as e:
+        logger.warning(f"Redis unavailable, could not cache {key}: {e}")
+
+
+async def cache_delete(key: str) -> None:
+    """Drop a cached value."""
+    try:
+        await get_redis().delete(key)
+    except RedisError as e:
+        logger.warning(f"Redis unavailable, could not delete {key}: {e}")
+
+
+async def claim_key(key: str, ttl: int) -> Optional[bool]:
+    """
+    Atomically claim a key for ttl seconds (SET NX).
+
+    Returns:
+        True if this call claimed it, False if it was already held, None if
+        Redis is unavailable.
+    """
+    try:
+        return bool(await get_redis().set(key, DEDUP_CLAIMED, nx=True, ex=ttl))
+    except RedisError as e:
+        logger.warning(f"Redis unavailable, could not claim {key}: {e}")
+        return None
+
+
+async def claim_dedup_key(key: str) -> bool:
+    """
+    Atomically mark a webhook delivery as seen (SET NX).
+
+    Returns:
+        False if the key already existed (duplicate delivery). True if this
+        call claimed it, or if Redis is unavailable so the caller should
+        fall through to its database check.
+    """
+    return await claim_key(key, DEDUP_TTL_SECONDS) is not False
+
+
+async def release_dedup_key(key: str) -> None:
+    """Forget a dedup key so a delivery that failed can be retried."""
+    await cache_delete(key)
@@ -0,0 +1,38 @@
+"""
+Celery application for background processing.
+
+Email, Facebook and website form lead processing (classification, AI
+responses, outbound email) runs on Celery workers instead of in the API
+process, so slow external API calls don't hold Uvicorn workers.
+
+Run a worker with:
+    celery -A app.core.celery_app worker -Q emails,facebook_leads,leads,clerk_events
+"""
+from celery import Celery
+
+from .config import settings
+
+
+celery_app = Celery(
+    "autolead",
+    broker=settings.CELERY_BROKER_URL,
+    backend=settings.CELERY_RESULT_BACKEND,
+    include=["app.tasks"],
+)
+
+celery_app.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    result_serializer="json",
+    # Separate queues so AI-heavy work scales independently of webhook ingress
+    task_routes={
+        "app.tasks.process_email_task": {"queue": "emails"},
+        "app.tasks.process_facebook_lead_task": {"queue": "facebook_leads"},
+        "app.tasks.process_new_lead_task": {"queue": "leads"},
+        "app.tasks.process_clerk_event_task": {"queue": "clerk_events"},
+    },
+    # Only hand a worker one task at a time; tasks are long and ack late
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+)
@@ -11,6 +11,13 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    # Sync engine pool (API handlers on get_db plus background tasks)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_RECYCLE: int = 1800
+    # asyncpg prepared statement cache per connection; set to 0 behind a
+    # transaction-pooling PgBouncer (e.g. Supabase pooler on port 6543)
+    DB_STATEMENT_CACHE_SIZE: int = 512
     
     # Supabase (optional, for future use)
     SUPABASE_URL: Optional[str] = None
@@ -35,6 +42,13 @@ class Settings(BaseSettings):
     FACEBOOK_PAGE_ACCESS_TOKEN: Optional[str] = None  # For testing with single page
     FACEBOOK_GRAPH_API_VERSION: str = "v21.0"
 
+    # Redis (webhook dedup keys and other cross-worker caches)
+    REDIS_URL: str = "redis://localhost:6379/0"
+
+    # Task queue (Celery) for email/Facebook lead processing
+    CELERY_BROKER_URL: str = "redis://localhost:6379/0"
+    CELERY_RESULT_BACKEND: str = "redis://localhost:6379/0"
+
     # Application
     APP_NAME: str = "Norvalt API"
     APP_VERSION: str = "1.0.0"
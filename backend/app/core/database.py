@@ -2,9 +2,11 @@
 Database connection and session management using SQLAlchemy.
 """
 from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session, declarative_base
 from sqlalchemy.pool import QueuePool
-from typing import Generator
+from typing import AsyncGenerator, Generator
 import logging
 
 from .config import settings
@@ -15,10 +17,10 @@ logger = logging.getLogger(__name__)
 engine = create_engine(
     settings.DATABASE_URL,
     poolclass=QueuePool,
-    pool_size=5,
-    max_overflow=10,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
     pool_pre_ping=True,  # Verify connections before using them
-    pool_recycle=3600,   # Recycle connections after 1 hour
+    pool_recycle=settings.DB_POOL_RECYCLE,
     echo=settings.DEBUG,  # Log SQL queries in debug mode
 )
 
@@ -29,9 +31,62 @@ SessionLocal = sessionmaker(
     bind=engine,
 )
 
+# Session factory for background tasks. Loaded objects stay readable after
+# commit, so a task can commit (returning its connection to the pool) before
+# slow AI/SendGrid/Graph API calls instead of sitting idle in a transaction.
+BackgroundSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=engine,
+    expire_on_commit=False,
+)
+
+
+
+def get_async_database_url(database_url: str) -> URL:
+    """
+    Build the asyncpg URL for the async engine from DATABASE_URL.
+    
+    asyncpg doesn't understand libpq's sslmode parameter; it is passed on
+    as asyncpg's ssl argument by the async engine instead.
+    """
+    url = make_url(database_url).set(drivername="postgresql+asyncpg")
+    return url.difference_update_query(["sslmode"])
+
+
+_database_url = make_url(settings.DATABASE_URL)
+_async_connect_args = {}
+if "sslmode" in _database_url.query:
+    _async_connect_args["ssl"] = _database_url.query["sslmode"]
+
+# Async engine (asyncpg) for async endpoints. asyncpg keeps a per-connection
+# cache of prepared statements, so hot queries skip parse/plan.
+async_engine = create_async_engine(
+    get_async_database_url(settings.DATABASE_URL).update_query_dict(
+        {"prepared_statement_cache_size": str(settings.DB_STATEMENT_CACHE_SIZE)}
+    ),
+    pool_size=5,
+    max_overflow=10,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+    echo=settings.DEBUG,
+    connect_args=_async_connect_args,
+)
+
+# Async session factory. Objects stay loaded after commit so responses can
+# be built without awaiting a refresh.
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
 # Create declarative base for models
 Base = declarative_base()
 
+# Session listeners that invalidate cached lead responses on write
+from . import response_cache  # noqa: E402,F401
+
 
 def get_db() -> Generator[Session, None, None]:
     """
@@ -56,6 +111,27 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI dependency for async database sessions.
+    
+    Yields:
+        AsyncSession: SQLAlchemy async database session
+        
+    Example:
+        @app.get("/items")
+        async def get_items(db: AsyncSession = Depends(get_async_db)):
+            return (await db.scalars(select(Item))).all()
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error(f"Database session error: {e}")
+            await db.rollback()
+            raise
+
+
 def check_database_connection() -> bool:
     """
     Check if database connection is working.
@@ -0,0 +1,216 @@
+"""
+Redis cache for lead read endpoints, invalidated on write.
+
+Cached responses are keyed by generation counters: one per dealership and
+one global. Committing any ORM write to a lead (or to a user, whose name
+and email are embedded in lead responses) bumps the generation of the
+dealership it belongs to, so older entries are never read again and just
+expire. Bulk ORM statements (insert/update/delete(Lead)) don't say which
+dealership they touch; they bump the session's RLS dealership, or the
+global generation if none is set.
+
+A lead's conversation list is cached under its own key instead, since
+messages are added far more often than leads change. Committing a
+conversation added through the ORM deletes that key; bulk inserts
+(create_conversation) delete it themselves.
+
+The endpoints read and fill the cache through the event loop's async
+client (core.cache). The session listeners fire inside synchronous flush
+and commit code: on an event loop thread (AsyncSession commits, async
+webhooks, Celery coroutines) the generation bump is scheduled on the loop
+with the async client, so a slow or unreachable Redis never blocks it;
+sync sessions in threadpool workers bump with a sync client. Request
+handlers that write commit through commit_and_invalidate(), which waits
+for the bump so the client's next read can't be served the stale entry,
+and Celery tasks wait for outstanding bumps before they return. Like
+core.cache, Redis errors are logged and swallowed: reads fall through to
+the database.
+"""
+import asyncio
+import hashlib
+import logging
+from itertools import chain
+from typing import Iterable, Optional, Set, Union
+
+from redis import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from .cache import get_redis
+from .config import settings
+from .rls import DEALERSHIP_CONTEXT_KEY
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_TTL_SECONDS = 300
+
+# Tables whose rows end up in cached lead responses
+_TRACKED_TABLES = frozenset({"leads", "users"})
+
+# Session.info key collecting generations to bump when the transaction commits
+_PENDING_KEY = "response_cache_pending"
+
+# Session.info key collecting conversation list keys to delete on commit
+_STALE_KEY = "response_cache_stale"
+
+# Session.info key holding the async bump scheduled by the last commit
+_BUMP_KEY = "response_cache_bump"
+
+_GLOBAL_SCOPE = "*"
+
+_client: Optional[Redis] = None
+
+# Scheduled async invalidations, referenced until done so they aren't GC'd
+_pending_bumps: Set[asyncio.Task] = set()
+
+
+def _redis() -> Redis:
+    global _client
+    if _client is None:
+        _client = Redis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=0.5,
+            socket_timeout=0.5,
+        )
+    return _client
+
+
+def _generation_key(scope: str) -> str:
+    return f"cache:gen:{scope}"
+
+
+def conversations_key(dealership_id, lead_id) -> str:
+    """Cache key for a lead's serialized conversation list."""
+    return f"cache:conv:{dealership_id}:{lead_id}"
+
+
+async def response_cache_key(dealership_id, *parts) -> Optional[str]:
+    """
+    Build the cache key for a response of one dealership.
+
+    Returns None if Redis is unavailable (don't cache).
+    """
+    try:
+        global_gen, dealership_gen = await get_redis().mget(
+            _generation_key(_GLOBAL_SCOPE), _generation_key(str(dealership_id))
+        )
+    except RedisError as e:
+        logger.warning(f"Redis unavailable, not caching response: {e}")
+        return None
+
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f"cache:resp:{dealership_id}:{int(global_gen or 0)}:{int(dealership_gen or 0)}:{digest}"
+
+
+async def get_cached_response(key: Optional[str]) -> Optional[bytes]:
+    """Read a cached response body, or None on a miss or Redis error."""
+    if key is None:
+        return None
+    try:
+        return await get_redis().get(key)
+    except RedisError as e:
+        logger.warning(f"Redis unavailable, cache miss for {key}: {e}")
+        return None
+
+
+async def set_cached_response(key: Optional[str], payload: Union[str, bytes]) -> None:
+    """Cache a response body."""
+    if key is None:
+        return
+    try:
+        await get_redis().set(key, payload, ex=RESPONSE_CACHE_TTL_SECONDS)
+    except RedisError as e:
+        logger.warning(f"Redis unavailable, could not cache {key}: {e}")
+
+
+def invalidate(scopes: Iterable[str], keys: Iterable[str] = ()) -> None:
+    """Bump the generation of each dealership id (or the global scope) and delete keys."""
+    try:
+        pipe = _redis().pipeline(transaction=False)
+        for scope in scopes:
+            pipe.incr(_generation_key(scope))
+        for key in keys:
+            pipe.delete(key)
+        pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Redis unavailable, could not invalidate cached responses: {e}")
+
+
+async def ainvalidate(scopes: Iterable[str], keys: Iterable[str] = ()) -> None:
+    """invalidate() through the event loop's async client."""
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        for scope in scopes:
+            pipe.incr(_generation_key(scope))
+        for key in keys:
+            pipe.delete(key)
+        await pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Redis unavailable, could not invalidate cached responses: {e}")
+
+
+async def commit_and_invalidate(db: AsyncSession) -> None:
+    """Commit, then wait for the generation bump the commit scheduled."""
+    await db.commit()
+    bump = db.info.pop(_BUMP_KEY, None)
+    if bump is not None:
+        await bump
+
+
+async def wait_for_invalidations() -> None:
+    """Wait for every generation bump scheduled on this loop so far."""
+    loop = asyncio.get_running_loop()
+    bumps = [task for task in _pending_bumps if task.get_loop() is loop]
+    if bumps:
+        await asyncio.gather(*bumps)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_writes(session: Session, flush_context) -> None:
+    """Remember the dealerships (and leads, for messages) of flushed writes."""
+    for obj in chain(session.new, session.dirty, session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table in _TRACKED_TABLES:
+            session.info.setdefault(_PENDING_KEY, set()).add(str(obj.dealership_id))
+        elif table == "conversations":
+            session.info.setdefault(_STALE_KEY, set()).add(
+                conversations_key(obj.dealership_id, obj.lead_id)
+            )
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_writes(state: ORMExecuteState) -> None:
+    """Remember bulk insert/update/delete statements against leads or users."""
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return
+    mapper = state.bind_mapper
+    if mapper is None or mapper.local_table.name not in _TRACKED_TABLES:
+        return
+    scope = state.session.info.get(DEALERSHIP_CONTEXT_KEY) or _GLOBAL_SCOPE
+    state.session.info.setdefault(_PENDING_KEY, set()).add(scope)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session) -> None:
+    scopes = session.info.pop(_PENDING_KEY, set())
+    keys = session.info.pop(_STALE_KEY, set())
+    if not scopes and not keys:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # Sync session in a threadpool worker: no loop to block
+        invalidate(scopes, keys)
+        return
+    task = loop.create_task(ainvalidate(scopes, keys))
+    _pending_bumps.add(task)
+    task.add_done_callback(_pending_bumps.discard)
+    session.info[_BUMP_KEY] = task
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_STALE_KEY, None)
@@ -3,14 +3,116 @@ Row-Level Security (RLS) helper functions for multi-tenant data isolation.
 
 These functions set the PostgreSQL session variable that RLS policies use
 to filter data by dealership_id.
+
+The dealership id is remembered in ``Session.info`` and re-applied at the
+start of every transaction by an ``after_begin`` listener, so the context
+survives ``db.commit()`` (a plain ``SET LOCAL`` is dropped at commit).
+
+On psycopg2 the ``set_config`` call is not sent on its own: it is prepended
+to the next statement on the connection, so setting the context costs no
+extra round trip. asyncpg can't run multi-statement prepared queries, so on
+async sessions the context is instead set by a ``set_config()`` column on
+the query that loads the user (see ``dealership_context_expression``).
 """
-from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import Text, cast, event, func, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+from sqlalchemy.pool import Pool
 from uuid import UUID
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Session.info key holding the dealership id for the session's lifetime
+DEALERSHIP_CONTEXT_KEY = "dealership_id"
+
+# Connection.info key for a context that still has to be sent to the server
+_PENDING_CONTEXT_KEY = "pending_dealership_id"
+
+_SET_CONTEXT_SQL = text("SELECT set_config('app.current_dealership_id', :dealership_id, true)")
+
+# Raw pyformat variant used when prefixing psycopg2 statements
+_SET_CONTEXT_PREFIX = "SELECT set_config('app.current_dealership_id', %(_rls_dealership_id)s, true); "
+
+
+def _apply_dealership_context(connection: Connection, dealership_id: str) -> None:
+    """Set the transaction-local RLS variable on a connection."""
+    if connection.dialect.driver == "psycopg2":
+        # Sent together with the next statement, see _prefix_pending_context
+        connection.info[_PENDING_CONTEXT_KEY] = dealership_id
+    else:
+        connection.execute(_SET_CONTEXT_SQL, {"dealership_id": dealership_id})
+
+
+@event.listens_for(Engine, "before_cursor_execute", retval=True)
+def _prefix_pending_context(conn, cursor, statement, parameters, context, executemany):
+    """Prepend a pending set_config() to the statement so both share one round trip."""
+    dealership_id = conn.info.pop(_PENDING_CONTEXT_KEY, None)
+    if dealership_id is None:
+        return statement, parameters
+
+    if executemany or not isinstance(parameters, dict) or (context and context.no_parameters):
+        # Can't merge parameters; send the context on its own first
+        cursor.execute(
+            _SET_CONTEXT_PREFIX.rstrip("; "),
+            {"_rls_dealership_id": dealership_id},
+        )
+        return statement, parameters
+
+    return _SET_CONTEXT_PREFIX + statement, {**parameters, "_rls_dealership_id": dealership_id}
+
+
+@event.listens_for(Engine, "commit")
+@event.listens_for(Engine, "rollback")
+def _discard_pending_context_on_end(conn) -> None:
+    """Drop a context that was never sent; it belonged to the ended transaction."""
+    conn.info.pop(_PENDING_CONTEXT_KEY, None)
+
+
+@event.listens_for(Pool, "checkin")
+def _discard_pending_context_on_checkin(dbapi_connection, connection_record) -> None:
+    """Never hand a pending context to the next checkout of a pooled connection."""
+    if connection_record is not None:
+        connection_record.info.pop(_PENDING_CONTEXT_KEY, None)
+
+
+@event.listens_for(Session, "after_begin")
+def _set_context_on_begin(
+    session: Session,
+    transaction: SessionTransaction,
+    connection: Connection,
+) -> None:
+    """Re-apply the dealership context whenever a session transaction begins."""
+    dealership_id = session.info.get(DEALERSHIP_CONTEXT_KEY)
+    if dealership_id:
+        _apply_dealership_context(connection, dealership_id)
+
+
+def dealership_context_expression(dealership_id_column):
+    """
+    set_config() expression setting the RLS context from a column.
+
+    Selected alongside the row that determines the dealership, it sets the
+    context for the current transaction in the same statement. Pair it with
+    remember_dealership_context so later transactions get it too.
+    """
+    return func.set_config(
+        "app.current_dealership_id",
+        func.coalesce(cast(dealership_id_column, Text), ""),
+        True,
+    )
+
+
+def remember_dealership_context(db: Session | AsyncSession, dealership_id: UUID) -> None:
+    """
+    Record the dealership context without sending it.
+
+    For when the current transaction already has it (dealership_context_expression);
+    the after_begin listener applies it to later transactions.
+    """
+    db.info[DEALERSHIP_CONTEXT_KEY] = str(dealership_id)
+
 
 def set_dealership_context(db: Session, dealership_id: UUID) -> None:
     """
@@ -32,10 +134,32 @@ def set_dealership_context(db: Session, dealership_id: UUID) -> None:
             return leads
     """
     try:
-        db.execute(
-            text("SET LOCAL app.current_dealership_id = :dealership_id"),
-            {"dealership_id": str(dealership_id)}
-        )
+        db.info[DEALERSHIP_CONTEXT_KEY] = str(dealership_id)
+        # Later transactions pick the context up in after_begin; only the
+        # one already in progress needs it applied now
+        if db.in_transaction():
+            _apply_dealership_context(db.connection(), str(dealership_id))
+        logger.debug(f"Set dealership context to {dealership_id}")
+    except Exception as e:
+        logger.error(f"Failed to set dealership context: {e}")
+        raise
+
+
+async def set_async_dealership_context(db: AsyncSession, dealership_id: UUID) -> None:
+    """
+    Set the current dealership context for Row-Level Security on an AsyncSession.
+    
+    Async counterpart of set_dealership_context; the after_begin listener
+    re-applies it for later transactions of the same session.
+    
+    Args:
+        db: SQLAlchemy async database session
+        dealership_id: UUID of the dealership to set as context
+    """
+    try:
+        db.info[DEALERSHIP_CONTEXT_KEY] = str(dealership_id)
+        if db.in_transaction():
+            await db.execute(_SET_CONTEXT_SQL, {"dealership_id": str(dealership_id)})
         logger.debug(f"Set dealership context to {dealership_id}")
     except Exception as e:
         logger.error(f"Failed to set dealership context: {e}")
@@ -53,6 +177,7 @@ def clear_dealership_context(db: Session) -> None:
         db: SQLAlchemy database session
     """
     try:
+        db.info.pop(DEALERSHIP_CONTEXT_KEY, None)
         db.execute(text("RESET app.current_dealership_id"))
         logger.debug("Cleared dealership context")
     except Exception as e:
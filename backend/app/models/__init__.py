@@ -10,6 +10,8 @@ from .user import User
 from .lead import Lead
 from .conversation import Conversation
 from .email import Email
+from .email_payload import EmailPayload
+from .webhook_event import WebhookEvent
 
 __all__ = [
     "Base",
@@ -18,5 +20,7 @@ __all__ = [
     "Lead",
     "Conversation",
     "Email",
+    "EmailPayload",
+    "WebhookEvent",
 ]
 
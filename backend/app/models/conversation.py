@@ -1,13 +1,21 @@
 """
 Conversation model representing message history between dealership and customers.
 """
-from sqlalchemy import Column, String, DateTime, ForeignKey, func, Index
+from sqlalchemy import Column, String, DateTime, ForeignKey, func, Index, Enum, DDL, PrimaryKeyConstraint, event
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
-import uuid
+from uuid_utils.compat import uuid7
 
 from ..core.database import Base
 
+# Closed value sets, stored as Postgres ENUM types (4 bytes, fixed width)
+CONVERSATION_CHANNELS = ("email", "sms", "facebook", "website", "manual")
+CONVERSATION_DIRECTIONS = ("inbound", "outbound")
+CONVERSATION_SENDER_TYPES = ("customer", "ai", "human")
+
+# Hash partitions on dealership_id (see migration 015)
+CONVERSATION_PARTITIONS = 16
+
 
 class Conversation(Base):
     """
@@ -15,21 +23,24 @@ class Conversation(Base):
     
     Tracks all communications: AI responses, human replies, customer messages.
     Each conversation belongs to a lead and dealership.
+    
+    The table is hash-partitioned by dealership_id, so the primary key is
+    (dealership_id, id).
     """
     __tablename__ = "conversations"
     
-    # Primary key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # Primary key (with dealership_id, the partition key)
+    id = Column(UUID(as_uuid=True), nullable=False, default=uuid7)
     
     # Foreign keys
-    lead_id = Column(UUID(as_uuid=True), ForeignKey("leads.id", ondelete="CASCADE"), nullable=False, index=True)
+    lead_id = Column(UUID(as_uuid=True), ForeignKey("leads.id", ondelete="CASCADE"), nullable=False)
     dealership_id = Column(UUID(as_uuid=True), ForeignKey("dealerships.id", ondelete="CASCADE"), nullable=False)
     
     # Message details
-    channel = Column(String(50), nullable=False)      # email, sms, facebook, manual
-    direction = Column(String(20), nullable=False)    # inbound, outbound
+    channel = Column(Enum(*CONVERSATION_CHANNELS, name="conversation_channel"), nullable=False)
+    direction = Column(Enum(*CONVERSATION_DIRECTIONS, name="conversation_direction"), nullable=False)
     sender = Column(String(255), nullable=True)       # Customer name, "AI", or user name
-    sender_type = Column(String(20), nullable=True)   # customer, ai, human
+    sender_type = Column(Enum(*CONVERSATION_SENDER_TYPES, name="conversation_sender_type"), nullable=True)
     message_content = Column(String, nullable=False)
     
     # Metadata (flexible storage for channel-specific data)
@@ -44,10 +55,25 @@ class Conversation(Base):
     
     # Indexes
     __table_args__ = (
-        # Index on created_at DESC for conversation history queries
-        Index("idx_conversations_created_desc", created_at.desc()),
+        # Leads with dealership_id, so it also covers the dealership FK
+        PrimaryKeyConstraint(dealership_id, id, name="conversations_pkey"),
+        # Lead timeline: WHERE lead_id = ? ORDER BY created_at DESC
+        Index("idx_conversations_lead_created_desc", lead_id, created_at.desc()),
+        {"postgresql_partition_by": "HASH (dealership_id)"},
     )
     
     def __repr__(self):
         return f"<Conversation(id={self.id}, lead_id={self.lead_id}, sender_type='{self.sender_type}')>"
 
+
+
+# A partitioned table can't take rows until its partitions exist
+for _remainder in range(CONVERSATION_PARTITIONS):
+    event.listen(
+        Conversation.__table__,
+        "after_create",
+        DDL(
+            f"CREATE TABLE conversations_p{_remainder} PARTITION OF conversations "
+            f"FOR VALUES WITH (MODULUS {CONVERSATION_PARTITIONS}, REMAINDER {_remainder})"
+        ).execute_if(dialect="postgresql"),
+    )
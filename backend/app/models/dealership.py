@@ -3,9 +3,9 @@ Dealership model representing car dealership organizations.
 Each dealership is a separate tenant in the multi-tenant system.
 """
 from sqlalchemy import Column, String, DateTime, func, CheckConstraint, Boolean
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.dialects.postgresql import UUID, JSONB, CITEXT
 from sqlalchemy.orm import relationship
-import uuid
+from uuid_utils.compat import uuid7
 
 from ..core.database import Base
 
@@ -20,11 +20,11 @@ class Dealership(Base):
     __tablename__ = "dealerships"
     
     # Primary key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     
     # Basic information
     name = Column(String(255), nullable=False)
-    email = Column(String(255), nullable=False, unique=True)
+    email = Column(CITEXT, nullable=False, unique=True)  # Case-insensitive
     phone = Column(String(50), nullable=True)
     address = Column(String, nullable=True)
     
@@ -4,12 +4,18 @@ Email model for storing and processing incoming emails.
 Emails are received via webhook (SendGrid Inbound Parse), classified by AI,
 and potentially converted to leads.
 """
-from sqlalchemy import Column, String, DateTime, ForeignKey, func, Index, Integer, Float, Text, desc
+from sqlalchemy import Column, String, DateTime, ForeignKey, func, Index, Integer, Float, Text, desc, Enum
 from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.orm import relationship
-import uuid
+from uuid_utils.compat import uuid7
 
 from ..core.database import Base
+from .email_payload import EmailPayload
+
+# Closed value sets, stored as Postgres ENUM types (4 bytes, fixed width)
+EMAIL_PROCESSING_STATUSES = ("pending", "processing", "completed", "failed")
+EMAIL_CLASSIFICATIONS = ("sales_inquiry", "spam", "other", "uncertain")
 
 
 class Email(Base):
@@ -26,7 +32,7 @@ class Email(Base):
     __tablename__ = "emails"
 
     # Primary key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
 
     # Foreign keys
     dealership_id = Column(
@@ -38,8 +44,7 @@ class Email(Base):
     lead_id = Column(
         UUID(as_uuid=True),
         ForeignKey("leads.id", ondelete="SET NULL"),
-        nullable=True,
-        index=True
+        nullable=True
     )  # Set when email is converted to a lead
 
     # Email metadata
@@ -51,20 +56,20 @@ class Email(Base):
 
     # Email content
     body_text = Column(Text, nullable=True)  # Plain text version
-    body_html = Column(Text, nullable=True)  # HTML version
-    raw_headers = Column(JSONB, nullable=True)  # Store all email headers
-    attachments = Column(JSONB, nullable=True)  # List of attachment metadata [{filename, size, content_type}]
 
     # Processing status
     processing_status = Column(
-        String(50),
+        Enum(*EMAIL_PROCESSING_STATUSES, name="email_processing_status"),
         default="pending",
-        nullable=False,
-        index=True
-    )  # pending, processing, completed, failed
+        nullable=False
+    )
 
     # AI classification results
-    classification = Column(String(50), nullable=True, index=True)  # sales_inquiry, spam, other, uncertain
+    classification = Column(
+        Enum(*EMAIL_CLASSIFICATIONS, name="email_classification"),
+        nullable=True,
+        index=True
+    )
     classification_confidence = Column(Float, nullable=True)  # 0.0-1.0
     classification_reasoning = Column(Text, nullable=True)  # AI's explanation
 
@@ -87,12 +92,32 @@ class Email(Base):
     # Relationships
     dealership = relationship("Dealership", back_populates="emails")
     lead = relationship("Lead", back_populates="source_email", foreign_keys=[lead_id])
+    payload = relationship(
+        "EmailPayload",
+        back_populates="email",
+        uselist=False,
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    # Payload columns live in email_payloads; these proxies keep the
+    # attribute API (and EmailResponse serialization) unchanged
+    body_html = association_proxy("payload", "body_html", creator=lambda v: EmailPayload(body_html=v))
+    raw_headers = association_proxy("payload", "raw_headers", creator=lambda v: EmailPayload(raw_headers=v))
+    attachments = association_proxy("payload", "attachments", creator=lambda v: EmailPayload(attachments=v))
 
     # Indexes for common queries
     __table_args__ = (
         Index("idx_emails_status_received", processing_status, desc(received_at)),
         Index("idx_emails_dealership_received", dealership_id, desc(received_at)),
+        Index("idx_emails_lead_received", lead_id, desc(received_at)),
         Index("idx_emails_classification", classification, classification_confidence),
+        Index(
+            "idx_emails_extracted_data_gin",
+            extracted_data,
+            postgresql_using="gin",
+            postgresql_ops={"extracted_data": "jsonb_path_ops"},
+        ),
     )
 
     def __repr__(self):
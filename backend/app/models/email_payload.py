@@ -0,0 +1,38 @@
+"""
+Email payload model holding the large, rarely-read parts of an email.
+"""
+from sqlalchemy import Column, ForeignKey, Text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import relationship
+
+from ..core.database import Base
+
+
+class EmailPayload(Base):
+    """
+    EmailPayload model - 1:1 side table of emails.
+
+    Headers, attachment metadata and the HTML body are only needed when a
+    single email is shown or processed. Keeping them out of ``emails``
+    keeps its rows small for the status/received_at list scans.
+
+    Access goes through the proxies on Email (``email.body_html`` etc.).
+    """
+    __tablename__ = "email_payloads"
+
+    # Primary key (same as the email's id)
+    email_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("emails.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+
+    raw_headers = Column(JSONB, nullable=True)  # Store all email headers
+    attachments = Column(JSONB, nullable=True)  # List of attachment metadata [{filename, size, content_type}]
+    body_html = Column(Text, nullable=True)  # HTML version
+
+    # Relationships
+    email = relationship("Email", back_populates="payload")
+
+    def __repr__(self):
+        return f"<EmailPayload(email_id={self.email_id})>"
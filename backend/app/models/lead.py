@@ -1,10 +1,10 @@
 """
 Lead model representing customer inquiries from all sources.
 """
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, func, Index, CheckConstraint, Interval
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, func, Index, CheckConstraint, Interval, Text, cast
+from sqlalchemy.dialects.postgresql import UUID, JSONB, CITEXT
 from sqlalchemy.orm import relationship
-import uuid
+from uuid_utils.compat import uuid7
 
 from ..core.database import Base
 
@@ -19,23 +19,23 @@ class Lead(Base):
     __tablename__ = "leads"
     
     # Primary key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     
     # Foreign keys
-    dealership_id = Column(UUID(as_uuid=True), ForeignKey("dealerships.id", ondelete="CASCADE"), nullable=False, index=True)
+    dealership_id = Column(UUID(as_uuid=True), ForeignKey("dealerships.id", ondelete="CASCADE"), nullable=False)
     assigned_to = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     
     # Source tracking
-    source = Column(String(50), nullable=False, index=True)  # website, email, facebook, manual
+    source = Column(String(50), nullable=False)  # website, email, facebook, manual
     source_url = Column(String, nullable=True)
     source_metadata = Column(JSONB, nullable=True)  # Store raw data for debugging
     
     # Status
-    status = Column(String(50), default="new", nullable=False, index=True)  # new, contacted, qualified, won, lost
+    status = Column(String(50), default="new", nullable=False)  # new, contacted, qualified, won, lost
     
     # Customer information
     customer_name = Column(String(255), nullable=True)
-    customer_email = Column(String(255), nullable=True, index=True)
+    customer_email = Column(CITEXT, nullable=True, index=True)  # Case-insensitive
     customer_phone = Column(String(50), nullable=True)
     
     # Lead details
@@ -59,13 +59,55 @@ class Lead(Base):
     
     # Constraints
     __table_args__ = (
-        # Email validation using PostgreSQL regex
+        # Cheap sanity check; full validation happens in the API schemas (EmailStr)
+        # and, for leads written without them, utils.email_address.normalize_email
         CheckConstraint(
-            "customer_email ~* '^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\\.[A-Z|a-z]{2,}$' OR customer_email IS NULL",
+            "customer_email IS NULL OR (position('@' in customer_email) > 1 AND customer_email NOT LIKE '% %')",
             name="valid_email"
         ),
-        # Index on created_at DESC for recent leads queries
-        Index("idx_leads_created_desc", created_at.desc()),
+        # Dealership lead list, newest first with id as the keyset tiebreaker
+        # (also covers the dealership_id FK)
+        Index("idx_leads_dealership_created_id", dealership_id, created_at.desc(), id.desc()),
+        # Duplicate submission lookup: one email's recent leads per dealership
+        Index("idx_leads_dealership_email_created", dealership_id, customer_email, created_at.desc()),
+        # Dealership lead list filtered by status
+        Index("idx_leads_dealership_status", dealership_id, status),
+        # Open pipeline (new/contacted/qualified), newest first per dealership
+        Index(
+            "idx_leads_open",
+            dealership_id,
+            created_at,
+            postgresql_where=status.in_(["new", "contacted", "qualified"]),
+        ),
+        # Covers the assigned_to FK so user deletes don't scan leads
+        Index(
+            "idx_leads_assigned_to",
+            assigned_to,
+            postgresql_where=assigned_to.isnot(None),
+        ),
+        # Facebook leadgen dedup (equality on the extracted id)
+        Index("idx_leads_facebook_lead_id", source_metadata["facebook_lead_id"].astext),
+        # Containment (@>) lookups on source_metadata
+        Index(
+            "idx_leads_source_metadata_gin",
+            source_metadata,
+            postgresql_using="gin",
+            postgresql_ops={"source_metadata": "jsonb_path_ops"},
+        ),
+        # Lead list search (ILIKE '%term%'); trigram ops need pg_trgm and
+        # text, so the citext email is indexed (and searched) as text
+        Index(
+            "idx_leads_customer_name_trgm",
+            customer_name,
+            postgresql_using="gin",
+            postgresql_ops={"customer_name": "gin_trgm_ops"},
+        ),
+        Index(
+            "idx_leads_customer_email_trgm",
+            cast(customer_email, Text).label("customer_email_text"),
+            postgresql_using="gin",
+            postgresql_ops={"customer_email_text": "gin_trgm_ops"},
+        ),
     )
     
     def __repr__(self):
@@ -4,7 +4,7 @@ User model representing sales reps, managers, and admins at dealerships.
 from sqlalchemy import Column, String, DateTime, ForeignKey, func, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
-import uuid
+from uuid_utils.compat import uuid7
 
 from ..core.database import Base
 
@@ -19,7 +19,7 @@ class User(Base):
     __tablename__ = "users"
     
     # Primary key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     
     # Foreign keys
     dealership_id = Column(UUID(as_uuid=True), ForeignKey("dealerships.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -0,0 +1,35 @@
+"""
+Webhook event model storing Clerk webhook deliveries for processing.
+"""
+from sqlalchemy import Column, DateTime, String, func
+from sqlalchemy.dialects.postgresql import JSONB
+
+from ..core.database import Base
+
+
+class WebhookEvent(Base):
+    """
+    WebhookEvent model - one row per Clerk (Svix) delivery.
+
+    The endpoint stores the verified event and queues it; a Celery worker
+    applies it and sets ``processed_at`` in the same transaction. Svix
+    retries a delivery with the same ``svix-id`` until it gets a 2xx, so a
+    retry of an event that was already applied finds it and is skipped.
+    """
+    __tablename__ = "webhook_events"
+
+    # Svix message id (svix-id header)
+    svix_id = Column(String(255), primary_key=True)
+
+    event_type = Column(String(100), nullable=False)
+
+    # The event's "data" object, as passed to its handler
+    payload = Column(JSONB, nullable=True)
+
+    received_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    # NULL until a worker has applied the event
+    processed_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<WebhookEvent(svix_id={self.svix_id}, event_type={self.event_type})>"
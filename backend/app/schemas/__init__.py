@@ -1,7 +1,7 @@
 """
 Pydantic schemas for API request/response validation.
 """
-from .common import ErrorResponse, SuccessResponse, PaginatedResponse
+from .common import ErrorResponse, SuccessResponse, Cursor, PaginatedResponse
 from .lead import LeadCreate, LeadUpdate, LeadResponse, LeadListResponse, UserResponse
 from .conversation import ConversationCreate, ConversationResponse
 from .webhook import FormWebhookRequest, FormWebhookResponse
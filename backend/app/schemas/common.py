@@ -1,8 +1,10 @@
 """
 Common Pydantic schemas used across the API.
 """
+from datetime import datetime
 from pydantic import BaseModel
-from typing import Generic, TypeVar, List
+from typing import Generic, TypeVar, List, Optional
+from uuid import UUID
 
 T = TypeVar('T')
 
@@ -33,14 +35,24 @@ class SuccessResponse(BaseModel):
         }
 
 
+class Cursor(BaseModel):
+    """Keyset pagination cursor: the (created_at, id) of the last item on a page."""
+    
+    created_at: datetime
+    id: UUID
+
+
 class PaginatedResponse(BaseModel, Generic[T]):
     """Generic paginated response wrapper."""
     
     items: List[T]
-    total: int
-    page: int
-    pages: int
+    # Only on offset pages; None on cursor pages, where counting every
+    # matching row would cost as much as offset paging did
+    total: Optional[int] = None
+    page: Optional[int] = None
+    pages: Optional[int] = None
     limit: int
+    next_cursor: Optional[Cursor] = None
     
     class Config:
         json_schema_extra = {
@@ -49,7 +61,11 @@ class PaginatedResponse(BaseModel, Generic[T]):
                 "total": 100,
                 "page": 1,
                 "pages": 10,
-                "limit": 10
+                "limit": 10,
+                "next_cursor": {
+                    "created_at": "2025-11-05T10:30:00Z",
+                    "id": "0194f3a2-7c1e-7d2a-9b1f-3e5a8c9d0e1f"
+                }
             }
         }
 
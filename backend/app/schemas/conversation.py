@@ -2,7 +2,7 @@
 Pydantic schemas for Conversation API endpoints.
 """
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Literal, Optional
 from datetime import datetime
 from uuid import UUID
 
@@ -12,7 +12,9 @@ class ConversationCreate(BaseModel):
     
     lead_id: UUID
     message_content: str = Field(..., min_length=1)
-    channel: str = Field(..., description="Channel: email, sms, facebook, manual")
+    channel: Literal["email", "sms", "facebook", "website", "manual"] = Field(
+        ..., description="Channel: email, sms, facebook, website, manual"
+    )
     
     class Config:
         json_schema_extra = {
@@ -2,7 +2,7 @@
 Pydantic schemas for Email API endpoints.
 """
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Literal
 from uuid import UUID
 
 from pydantic import BaseModel, Field, ConfigDict
@@ -49,9 +49,23 @@ class EmailResponse(EmailBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class EmailListItem(EmailBase):
+    """Schema for email list items (no bodies, headers or extracted data)."""
+    id: UUID
+    dealership_id: UUID
+    lead_id: Optional[UUID] = None
+    processing_status: str
+    classification: Optional[str] = None
+    classification_confidence: Optional[float] = None
+    received_at: datetime
+    processed_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class EmailListResponse(BaseModel):
     """Schema for paginated email list response."""
-    emails: List[EmailResponse]
+    emails: List[EmailListItem]
     total: int
     page: int = 1
     page_size: int = 50
@@ -59,7 +73,9 @@ class EmailListResponse(BaseModel):
 
 class EmailClassificationResult(BaseModel):
     """Schema for AI classification result."""
-    classification: str = Field(..., description="sales_inquiry, spam, other, or uncertain")
+    classification: Literal["sales_inquiry", "spam", "other", "uncertain"] = Field(
+        ..., description="sales_inquiry, spam, other, or uncertain"
+    )
     confidence: float = Field(..., ge=0.0, le=1.0, description="Confidence score 0.0-1.0")
     reasoning: str = Field(..., description="Explanation for the classification")
 
@@ -16,6 +16,7 @@ from ..models.email import Email
 from ..models.lead import Lead
 from ..schemas.email import EmailClassificationResult, EmailLeadExtraction
 from ..core.config import settings
+from ..utils.email_address import normalize_email
 
 
 # Known spam domains (basic list - expand as needed)
@@ -303,7 +304,7 @@ If a field cannot be determined, use null. For email, use the sender's email add
                         },
                         status="new",
                         customer_name=lead_data.customer_name,
-                        customer_email=lead_data.email,
+                        customer_email=normalize_email(lead_data.email),
                         customer_phone=lead_data.phone,
                         vehicle_interest=lead_data.car_interest,
                         initial_message=lead_data.inquiry_summary,
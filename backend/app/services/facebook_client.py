@@ -2,15 +2,34 @@
 Facebook Graph API client for Lead Ads integration.
 Handles lead retrieval, field mapping, and error handling.
 """
+import asyncio
 import httpx
 import logging
+import weakref
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from app.core.config import settings
+from app.utils.email_address import normalize_email
 
 logger = logging.getLogger(__name__)
 
 
+# One AsyncClient per event loop, shared by all FacebookClient instances so
+# Graph API calls reuse pooled connections (Celery workers keep one loop per
+# process, see app/tasks.py)
+_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Get the shared Graph API HTTP client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient()
+        _http_clients[loop] = client
+    return client
+
+
 class FacebookLeadData:
     """Parsed Facebook lead data."""
 
@@ -51,7 +70,8 @@ class FacebookLeadData:
             if field_name in ["full_name", "name", "first_name"]:
                 self.customer_name = value
             elif field_name == "email":
-                self.customer_email = value
+                # The raw answer stays in field_data
+                self.customer_email = normalize_email(value)
             elif field_name in ["phone_number", "phone", "mobile"]:
                 self.customer_phone = value
             elif field_name in ["vehicle_interest", "which_car", "car_interest", "vehicle"]:
@@ -163,35 +183,34 @@ class FacebookClient:
         logger.info(f"Fetching lead data from Facebook Graph API: {leadgen_id}")
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, params=params, timeout=10.0)
+            response = await _get_http_client().get(url, params=params, timeout=10.0)
 
-                # Handle different HTTP status codes
-                if response.status_code == 200:
-                    data = response.json()
-                    return self._parse_lead_response(data)
+            # Handle different HTTP status codes
+            if response.status_code == 200:
+                data = response.json()
+                return self._parse_lead_response(data)
 
-                elif response.status_code == 400:
-                    error_data = response.json()
-                    error_message = error_data.get("error", {}).get("message", "Unknown error")
-                    logger.error(f"Facebook API error (400): {error_message}")
-                    raise FacebookGraphAPIError(f"Bad request: {error_message}")
+            elif response.status_code == 400:
+                error_data = response.json()
+                error_message = error_data.get("error", {}).get("message", "Unknown error")
+                logger.error(f"Facebook API error (400): {error_message}")
+                raise FacebookGraphAPIError(f"Bad request: {error_message}")
 
-                elif response.status_code == 401:
-                    logger.error("Facebook API authentication failed (401)")
-                    raise FacebookAuthError("Invalid or expired Page Access Token")
+            elif response.status_code == 401:
+                logger.error("Facebook API authentication failed (401)")
+                raise FacebookAuthError("Invalid or expired Page Access Token")
 
-                elif response.status_code == 403:
-                    logger.error("Facebook API authorization failed (403)")
-                    raise FacebookAuthError("Insufficient permissions to access lead data")
+            elif response.status_code == 403:
+                logger.error("Facebook API authorization failed (403)")
+                raise FacebookAuthError("Insufficient permissions to access lead data")
 
-                elif response.status_code == 429:
-                    logger.warning("Facebook API rate limit exceeded (429)")
-                    raise FacebookRateLimitError("Rate limit exceeded. Please retry later.")
+            elif response.status_code == 429:
+                logger.warning("Facebook API rate limit exceeded (429)")
+                raise FacebookRateLimitError("Rate limit exceeded. Please retry later.")
 
-                else:
-                    logger.error(f"Facebook API returned unexpected status: {response.status_code}")
-                    raise FacebookGraphAPIError(f"Unexpected status code: {response.status_code}")
+            else:
+                logger.error(f"Facebook API returned unexpected status: {response.status_code}")
+                raise FacebookGraphAPIError(f"Unexpected status code: {response.status_code}")
 
         except httpx.TimeoutException:
             logger.error(f"Timeout fetching lead {leadgen_id} from Facebook")
@@ -245,9 +264,8 @@ class FacebookClient:
         params = {"access_token": self.access_token}
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, params=params, timeout=5.0)
-                return response.status_code == 200
+            response = await _get_http_client().get(url, params=params, timeout=5.0)
+            return response.status_code == 200
         except Exception as e:
             logger.error(f"Error verifying Facebook token: {str(e)}")
             return False
@@ -14,6 +14,7 @@ Target: Complete within 90 seconds
 import logging
 from datetime import datetime, timezone
 from uuid import UUID
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import Optional
 
@@ -60,6 +61,10 @@ class LeadProcessor:
             if not dealership:
                 raise ValueError(f"Dealership {lead.dealership_id} not found")
 
+            # End the read transaction so the connection isn't held while
+            # waiting on the AI and SendGrid calls below
+            db.commit()
+
             logger.info(
                 f"Processing lead {lead_id}",
                 extra={
@@ -275,13 +280,10 @@ class LeadProcessor:
     ):
         """Update lead status after processing."""
         try:
-            # Calculate first response time
-            response_time = datetime.now(timezone.utc) - lead.created_at
-
-            # Update lead
+            # Update lead; timestamps are computed by Postgres in the UPDATE
             lead.status = "contacted"
-            lead.last_contact_at = datetime.now(timezone.utc)
-            lead.first_response_time = response_time
+            lead.last_contact_at = func.now()
+            lead.first_response_time = func.now() - Lead.created_at
 
             db.commit()
 
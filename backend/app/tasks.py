@@ -0,0 +1,100 @@
+"""
+Celery tasks for email, Facebook and website form lead processing, and
+for applying Clerk webhook events.
+
+The processing coroutines live next to their webhook endpoints; each task
+runs one of them to completion on the worker's event loop.
+"""
+import asyncio
+from typing import Any, Coroutine, Optional
+from uuid import UUID
+
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from .core.celery_app import celery_app
+from .core.response_cache import wait_for_invalidations
+
+
+# One event loop per worker process, reused across tasks so per-loop
+# clients (Redis, the Graph API connection pool) keep their connections
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _run(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Run a coroutine on this worker process's event loop."""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop.run_until_complete(_complete(coro))
+
+
+async def _complete(coro: Coroutine[Any, Any, Any]) -> Any:
+    # Commits schedule lead cache invalidations on the loop; finish them
+    # before the task is acked rather than whenever the next task runs
+    try:
+        return await coro
+    finally:
+        await wait_for_invalidations()
+
+
+@celery_app.task(
+    bind=True,
+    max_retries=5,
+    autoretry_for=(OperationalError,),
+    retry_backoff=True,
+    acks_late=True,
+)
+def process_email_task(self, email_id: str):
+    """Classify an inbound email and create/respond to its lead."""
+    from .api.v1.endpoints.emails import process_email_background
+
+    _run(process_email_background(UUID(email_id)))
+
+
+@celery_app.task(
+    bind=True,
+    max_retries=5,
+    autoretry_for=(OperationalError,),
+    retry_backoff=True,
+    acks_late=True,
+)
+def process_facebook_lead_task(self, leadgen_id: str, page_id: str, form_id: str):
+    """Fetch a Facebook lead from the Graph API and create the lead."""
+    from .api.v1.endpoints.facebook import process_facebook_lead
+
+    _run(process_facebook_lead(
+        leadgen_id=leadgen_id,
+        page_id=page_id,
+        form_id=form_id
+    ))
+
+
+@celery_app.task(
+    bind=True,
+    max_retries=5,
+    autoretry_for=(OperationalError,),
+    retry_backoff=True,
+    acks_late=True,
+)
+def process_new_lead_task(self, lead_id: str):
+    """Generate and send the AI response for a new website form lead."""
+    from .api.webhooks.form import process_lead_background
+
+    _run(process_lead_background(UUID(lead_id)))
+
+
+@celery_app.task(
+    bind=True,
+    max_retries=5,
+    # handle_clerk_event only lets unique violations through: a concurrent
+    # event created the row first, and the retry's lookup will find it
+    autoretry_for=(OperationalError, IntegrityError),
+    retry_backoff=True,
+    acks_late=True,
+)
+def process_clerk_event_task(self, svix_id: str):
+    """Apply a stored Clerk webhook event (dealership and user provisioning)."""
+    from .api.webhooks.clerk import process_clerk_event
+
+    _run(process_clerk_event(svix_id))
@@ -0,0 +1,33 @@
+"""
+Email address normalization for lead ingest paths that bypass the API schemas.
+
+Leads from email extraction and Facebook Lead Ads are written straight to the
+database; the valid_email check constraint there is only a sanity check, while
+the lead response schemas validate with EmailStr. Addresses are checked here
+with the same validator so stored leads can always be returned.
+"""
+import logging
+from typing import Optional
+
+from email_validator import EmailNotValidError, validate_email
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_email(value: Optional[str]) -> Optional[str]:
+    """
+    Return the normalized form of an email address, or None if it isn't valid.
+
+    Args:
+        value: Address as extracted or submitted (may be None or blank)
+
+    Returns:
+        Normalized address (domain lowercased), or None
+    """
+    if not value or not value.strip():
+        return None
+    try:
+        return validate_email(value.strip(), check_deliverability=False).normalized
+    except EmailNotValidError as e:
+        logger.warning(f"Dropping invalid customer email {value!r}: {e}")
+        return None
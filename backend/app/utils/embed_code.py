@@ -5,9 +5,13 @@ This module provides functions to generate HTML/JavaScript code that dealerships
 can embed on their websites to capture leads via the form webhook.
 """
 
+from functools import lru_cache
 from typing import Dict, Any, Optional
 
 
+# The generators below are pure functions of their arguments (api_base_url
+# included), so their output is memoized. Treat returned values as read-only.
+@lru_cache(maxsize=512)
 def generate_html_form(
     dealership_id: str,
     api_base_url: str,
@@ -218,6 +222,7 @@ def generate_html_form(
     return html
 
 
+@lru_cache(maxsize=512)
 def generate_javascript_snippet(
     dealership_id: str,
     api_base_url: str,
@@ -303,6 +308,7 @@ def generate_javascript_snippet(
     return js
 
 
+@lru_cache(maxsize=512)
 def generate_embed_code_docs(dealership_id: str, api_base_url: str) -> Dict[str, Any]:
     """
     Generate complete embed code documentation for a dealership.
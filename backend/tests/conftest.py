@@ -1,29 +1,44 @@
 """
 Pytest configuration and fixtures for API tests.
 """
+import os
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from unittest.mock import patch, MagicMock
 from uuid import uuid4
 
-from app.core.database import Base, get_db
+from app.core.database import Base, get_db, get_async_db
 from app.models.dealership import Dealership
 from app.models.user import User
 from app.models.lead import Lead
 from main import app
 
 
-# Test database setup (using SQLite in-memory for tests)
-SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///./test.db"
-
-engine = create_engine(
-    SQLALCHEMY_TEST_DATABASE_URL,
-    connect_args={"check_same_thread": False}
+# Test database setup. The models use Postgres features (JSONB, CITEXT,
+# trigram indexes, RLS), so the tests run against a throwaway Postgres
+# database with the citext and pg_trgm extensions; see the README.
+SQLALCHEMY_TEST_DATABASE_URL = os.environ.get(
+    "TEST_DATABASE_URL",
+    "postgresql://postgres@localhost:5432/autolead_test"
 )
+
+engine = create_engine(SQLALCHEMY_TEST_DATABASE_URL)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async endpoints use their own connection to the same database. NullPool
+# because each TestClient runs its own event loop.
+SQLALCHEMY_TEST_ASYNC_DATABASE_URL = SQLALCHEMY_TEST_DATABASE_URL.replace(
+    "postgresql://", "postgresql+asyncpg://", 1
+)
+
+async_engine = create_async_engine(SQLALCHEMY_TEST_ASYNC_DATABASE_URL, poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
 
 @pytest.fixture(scope="function")
 def db_session():
@@ -53,7 +68,12 @@ def client(db_session):
         finally:
             pass
     
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
+    
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     
     with TestClient(app) as test_client:
         yield test_client
@@ -140,7 +160,7 @@ def auth_headers(test_user, mock_clerk_jwt):
     Create authentication headers for testing.
     Patches the JWT verification to use mock.
     """
-    with patch('app.core.auth.verify_clerk_jwt', side_effect=mock_clerk_jwt):
+    with patch('app.api.deps.verify_clerk_jwt', side_effect=mock_clerk_jwt):
         headers = {"Authorization": "Bearer test_token_123"}
         yield headers
 
@@ -28,7 +28,7 @@ def test_list_leads_without_auth(client):
 
 def test_list_leads_with_invalid_token(client):
     """Test that invalid JWT token is rejected."""
-    with patch('app.core.auth.verify_clerk_jwt', side_effect=UnauthorizedException("Invalid token")):
+    with patch('app.api.deps.verify_clerk_jwt', side_effect=UnauthorizedException("Invalid token")):
         response = client.get(
             "/api/v1/leads",
             headers={"Authorization": "Bearer invalid_token"}
@@ -38,7 +38,7 @@ def test_list_leads_with_invalid_token(client):
 
 def test_list_leads_with_valid_auth(client, auth_headers, test_user, test_dealership):
     """Test that valid authentication allows access to leads."""
-    with patch('app.core.auth.verify_clerk_jwt') as mock_verify:
+    with patch('app.api.deps.verify_clerk_jwt') as mock_verify:
         mock_verify.return_value = {
             "sub": test_user.clerk_user_id,
             "org_id": test_dealership.clerk_org_id
@@ -0,0 +1,98 @@
+"""
+Tests for Conversation API endpoints.
+"""
+import pytest
+from unittest.mock import patch
+from uuid import uuid4
+
+
+@pytest.fixture
+def mock_verify(test_user, test_dealership):
+    """Patch JWT verification to authenticate as the test user."""
+    with patch('app.api.deps.verify_clerk_jwt') as mock_verify:
+        mock_verify.return_value = {
+            "sub": test_user.clerk_user_id,
+            "org_id": test_dealership.clerk_org_id
+        }
+        yield mock_verify
+
+
+def test_get_conversations_empty(client, auth_headers, mock_verify, test_lead):
+    """Test that a lead without messages returns an empty list."""
+    response = client.get(
+        f"/api/v1/leads/{test_lead.id}/conversations",
+        headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_get_conversations_unknown_lead(client, auth_headers, mock_verify):
+    """Test that an unknown lead returns 404."""
+    response = client.get(
+        f"/api/v1/leads/{uuid4()}/conversations",
+        headers=auth_headers
+    )
+
+    assert response.status_code == 404
+
+
+def test_create_and_list_conversations(client, auth_headers, mock_verify, test_lead, db_session):
+    """Test creating a message and reading it back, newest first."""
+    for content in ("First message", "Second message"):
+        response = client.post(
+            "/api/v1/conversations",
+            json={
+                "lead_id": str(test_lead.id),
+                "message_content": content,
+                "channel": "email"
+            },
+            headers=auth_headers
+        )
+        assert response.status_code == 201
+        data = response.json()
+        assert data["message_content"] == content
+        assert data["direction"] == "outbound"
+        assert data["sender_type"] == "human"
+
+    db_session.refresh(test_lead)
+    assert test_lead.last_contact_at is not None
+
+    response = client.get(
+        f"/api/v1/leads/{test_lead.id}/conversations",
+        headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [c["message_content"] for c in data] == ["Second message", "First message"]
+
+
+def test_create_conversation_unknown_lead(client, auth_headers, mock_verify):
+    """Test that posting to an unknown lead returns 404."""
+    response = client.post(
+        "/api/v1/conversations",
+        json={
+            "lead_id": str(uuid4()),
+            "message_content": "Hello",
+            "channel": "email"
+        },
+        headers=auth_headers
+    )
+
+    assert response.status_code == 404
+
+
+def test_list_conversations_reflects_new_messages(client, auth_headers, mock_verify, test_lead):
+    """Test that a cached conversation list is not served after a new message."""
+    url = f"/api/v1/leads/{test_lead.id}/conversations"
+    payload = {"lead_id": str(test_lead.id), "message_content": "First", "channel": "email"}
+
+    client.post("/api/v1/conversations", json=payload, headers=auth_headers)
+    assert len(client.get(url, headers=auth_headers).json()) == 1
+    assert len(client.get(url, headers=auth_headers).json()) == 1
+
+    client.post("/api/v1/conversations", json={**payload, "message_content": "Second"}, headers=auth_headers)
+    data = client.get(url, headers=auth_headers).json()
+    assert [c["message_content"] for c in data] == ["Second", "First"]
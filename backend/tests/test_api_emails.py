@@ -0,0 +1,155 @@
+"""
+Tests for Email and email integration API endpoints.
+"""
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.models.dealership import Dealership
+
+
+@pytest.fixture
+def mock_verify(test_user, test_dealership):
+    """Patch JWT verification to authenticate as the test user."""
+    with patch('app.api.deps.verify_clerk_jwt') as mock_verify:
+        mock_verify.return_value = {
+            "sub": test_user.clerk_user_id,
+            "org_id": test_dealership.clerk_org_id
+        }
+        yield mock_verify
+
+
+def test_enable_email_integration(client, auth_headers, mock_verify):
+    """Test enabling email integration assigns a forwarding address."""
+    response = client.post(
+        "/api/v1/settings/email-integration/enable",
+        headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["email_integration_enabled"] is True
+    assert data["email_forwarding_address"].endswith("@leads.autolead.no")
+
+    response = client.get(
+        "/api/v1/settings/email-integration",
+        headers=auth_headers
+    )
+    assert response.json()["email_forwarding_address"] == data["email_forwarding_address"]
+
+
+def test_enable_email_integration_retries_address_collision(client, auth_headers, mock_verify, db_session):
+    """Test that a forwarding address collision is retried with a new ID."""
+    db_session.add(Dealership(
+        name="Other Dealership",
+        email="other@dealership.com",
+        clerk_org_id="org_other123",
+        email_forwarding_address="test-dealership-taken@leads.autolead.no"
+    ))
+    db_session.commit()
+
+    with patch(
+        'app.api.v1.endpoints.dealership_settings.secrets.token_urlsafe',
+        side_effect=["taken", "fresh"]
+    ):
+        response = client.post(
+            "/api/v1/settings/email-integration/enable",
+            headers=auth_headers
+        )
+
+    assert response.status_code == 200
+    assert response.json()["email_forwarding_address"] == "test-dealership-fresh@leads.autolead.no"
+
+
+def test_inbound_email_is_stored_and_listed(client, auth_headers, mock_verify):
+    """Test that an inbound email is stored once and shows up in the list."""
+    address = client.post(
+        "/api/v1/settings/email-integration/enable",
+        headers=auth_headers
+    ).json()["email_forwarding_address"]
+
+    form = {
+        "to": address,
+        "from": '"Nordmann, Ola" <ola@example.com>',
+        "subject": "Interested in a car",
+        "text": "Hello",
+        "headers": json.dumps({"Message-ID": "<abc123@example.com>"}),
+    }
+
+    # Exercise the database dedup path regardless of any local Redis
+    with patch('app.api.v1.endpoints.emails.claim_dedup_key', AsyncMock(return_value=True)), \
+            patch('app.api.v1.endpoints.emails.process_email_task') as mock_task:
+        first = client.post("/api/v1/emails/webhook/inbound", data=form)
+        # SendGrid posts multipart/form-data
+        second = client.post(
+            "/api/v1/emails/webhook/inbound",
+            data=form,
+            files={"attachment1": ("brochure.pdf", b"%PDF-1.4")}
+        )
+
+    assert first.status_code == 200
+    # The email is still pending (the task never ran), so the retry re-queues it
+    assert mock_task.delay.call_count == 2
+    mock_task.delay.assert_called_with(first.json()["email_id"])
+    assert second.json()["message"] == "Email already processed"
+    assert second.json()["email_id"] == first.json()["email_id"]
+
+    response = client.get("/api/v1/emails/", headers=auth_headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 1
+    assert data["emails"][0]["from_email"] == "ola@example.com"
+    assert data["emails"][0]["from_name"] == "Nordmann, Ola"
+    assert "body_text" not in data["emails"][0]
+
+    response = client.get("/api/v1/emails/?skip=50", headers=auth_headers)
+    assert response.json()["emails"] == []
+    assert response.json()["total"] == 1
+
+
+def test_inbound_email_rejected_after_disable(client, auth_headers, mock_verify):
+    """Test that disabling email integration stops accepting forwarded emails."""
+    address = client.post(
+        "/api/v1/settings/email-integration/enable",
+        headers=auth_headers
+    ).json()["email_forwarding_address"]
+    client.post("/api/v1/settings/email-integration/disable", headers=auth_headers)
+
+    with patch('app.api.v1.endpoints.emails.process_email_task') as mock_task:
+        response = client.post(
+            "/api/v1/emails/webhook/inbound",
+            data={"to": address, "from": "ola@example.com", "subject": "Hi"},
+            files={"attachment1": ("brochure.pdf", b"%PDF-1.4")}
+        )
+
+    assert response.status_code == 404
+    mock_task.delay.assert_not_called()
+
+
+def test_inbound_email_redis_duplicate_returns_email_id(client, auth_headers, mock_verify):
+    """Test that a retry caught by the Redis fast path still reports the email id."""
+    address = client.post(
+        "/api/v1/settings/email-integration/enable",
+        headers=auth_headers
+    ).json()["email_forwarding_address"]
+
+    async def cache_get(key):
+        # The first delivery stored its email id under the dedup key
+        return "email-id-1" if key.startswith("dedup:email:") else None
+
+    with patch('app.api.v1.endpoints.emails.claim_dedup_key', AsyncMock(return_value=False)), \
+            patch('app.api.v1.endpoints.emails.cache_get', cache_get), \
+            patch('app.api.v1.endpoints.emails.process_email_task') as mock_task:
+        response = client.post(
+            "/api/v1/emails/webhook/inbound",
+            data={"to": address, "from": "ola@example.com", "subject": "Hi"}
+        )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "status": "ok",
+        "message": "Email already processed",
+        "email_id": "email-id-1"
+    }
+    mock_task.delay.assert_not_called()
@@ -0,0 +1,49 @@
+"""
+Tests for the website form webhook.
+"""
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+
+FORM = {
+    "name": "Ola Nordmann",
+    "email": "ola@example.com",
+    "message": "Interested in a test drive"
+}
+
+
+def test_form_webhook_creates_lead_and_queues_response(client, test_dealership):
+    """Test that a submission creates a lead and queues the AI response."""
+    with patch('app.api.webhooks.form.process_new_lead_task') as mock_task:
+        response = client.post(f"/webhooks/form/{test_dealership.id}", json=FORM)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "created"
+    mock_task.delay.assert_called_once_with(data["lead_id"])
+
+
+def test_form_webhook_updates_recent_duplicate(client, test_dealership):
+    """Test that a repeat submission updates the recent lead instead."""
+    with patch('app.api.webhooks.form.process_new_lead_task') as mock_task:
+        first = client.post(f"/webhooks/form/{test_dealership.id}", json=FORM)
+        # Redis already holds the key for this email
+        with patch('app.api.webhooks.form.claim_key', AsyncMock(return_value=False)):
+            second = client.post(
+                f"/webhooks/form/{test_dealership.id}",
+                json={**FORM, "message": "Any news?"}
+            )
+
+    assert second.status_code == 200
+    assert second.json()["status"] == "updated"
+    assert second.json()["lead_id"] == first.json()["lead_id"]
+    mock_task.delay.assert_called_once()
+
+
+def test_form_webhook_unknown_dealership(client):
+    """Test that an unknown dealership returns 404."""
+    with patch('app.api.webhooks.form.process_new_lead_task') as mock_task:
+        response = client.post(f"/webhooks/form/{uuid4()}", json=FORM)
+
+    assert response.status_code == 404
+    mock_task.delay.assert_not_called()
@@ -8,7 +8,7 @@ from uuid import uuid4
 
 def test_create_lead(client, auth_headers, test_user, test_dealership):
     """Test creating a new lead."""
-    with patch('app.core.auth.verify_clerk_jwt') as mock_verify:
+    with patch('app.api.deps.verify_clerk_jwt') as mock_verify:
         mock_verify.return_value = {
             "sub": test_user.clerk_user_id,
             "org_id": test_dealership.clerk_org_id
@@ -34,7 +34,7 @@ def test_create_lead(client, auth_headers, test_user, test_dealership):
 
 def test_list_leads(client, auth_headers, test_user, test_dealership, test_lead):
     """Test listing leads with pagination."""
-    with patch('app.core.auth.verify_clerk_jwt') as mock_verify:
+    with patch('app.api.deps.verify_clerk_jwt') as mock_verify:
         mock_verify.return_value = {
             "sub": test_user.clerk_user_id,
             "org_id": test_dealership.clerk_org_id
@@ -48,11 +48,44 @@ def test_list_leads(client, auth_headers, test_user, test_dealership, test_lead)
         assert "total" in data
         assert data["total"] >= 1
         assert len(data["items"]) >= 1
+        
+        # Past the last page the total is still reported
+        response = client.get("/api/v1/leads?offset=100", headers=auth_headers)
+        
+        assert response.json()["items"] == []
+        assert response.json()["total"] == data["total"]
+
+
+def test_list_leads_conversation_count(client, auth_headers, test_user, test_dealership, test_lead, db_session):
+    """Test that list items carry each lead's conversation count."""
+    from app.models.conversation import Conversation
+
+    for content in ("Hello", "Any news?"):
+        db_session.add(Conversation(
+            lead_id=test_lead.id,
+            dealership_id=test_dealership.id,
+            channel="email",
+            direction="inbound",
+            message_content=content
+        ))
+    db_session.commit()
+
+    with patch('app.api.deps.verify_clerk_jwt') as mock_verify:
+        mock_verify.return_value = {
+            "sub": test_user.clerk_user_id,
+            "org_id": test_dealership.clerk_org_id
+        }
+        
+        response = client.get("/api/v1/leads", headers=auth_headers)
+        
+        assert response.status_code == 200
+        items = {item["id"]: item for item in response.json()["items"]}
+        assert items[str(test_lead.id)]["conversation_count"] == 2
 
 
 def test_list_leads_with_filters(client, auth_headers, test_user, test_dealership, test_lead):
     """Test filtering leads by status and source."""
-    with patch('app.core.auth.verify_clerk_jwt') as mock_verify:
+    with patch('app.api.deps.verify_clerk_jwt') as mock_verify:
         mock_verify.return_value = {
             "sub": test_user.clerk_user_id,
             "org_id": test_dealership.clerk_org_id
@@ -79,7 +112,7 @@ def test_list_leads_with_filters(client, auth_headers, test_user, test_dealershi
 
 def test_get_lead_by_id(client, auth_headers, test_user, test_dealership, test_lead):
     """Test getting a single lead by ID."""
-    with patch('app.core.auth.verify_clerk_jwt') as mock_verify:
+    with patch('app.api.deps.verify_clerk_jwt') as mock_verify:
         mock_verify.return_value = {
             "sub": test_user.clerk_user_id,
             "org_id": test_dealership.clerk_org_id
@@ -98,7 +131,7 @@ def test_get_lead_by_id(client, auth_headers, test_user, test_dealership, test_l
 
 def test_get_nonexistent_lead(client, auth_headers, test_user, test_dealership):
     """Test getting a lead that doesn't exist."""
-    with patch('app.core.auth.verify_clerk_jwt') as mock_verify:
+    with patch('app.api.deps.verify_clerk_jwt') as mock_verify:
         mock_verify.return_value = {
             "sub": test_user.clerk_user_id,
             "org_id": test_dealership.clerk_org_id
@@ -115,7 +148,7 @@ def test_get_nonexistent_lead(client, auth_headers, test_user, test_dealership):
 
 def test_update_lead(client, auth_headers, test_user, test_dealership, test_lead):
     """Test updating a lead."""
-    with patch('app.core.auth.verify_clerk_jwt') as mock_verify:
+    with patch('app.api.deps.verify_clerk_jwt') as mock_verify:
         mock_verify.return_value = {
             "sub": test_user.clerk_user_id,
             "org_id": test_dealership.clerk_org_id
@@ -138,9 +171,29 @@ def test_update_lead(client, auth_headers, test_user, test_dealership, test_lead
         assert data["vehicle_interest"] == "Tesla Model Y"
 
 
+def test_update_lead_assignment(client, auth_headers, test_user, test_dealership, test_lead):
+    """Test that assigning a lead returns the assigned user."""
+    with patch('app.api.deps.verify_clerk_jwt') as mock_verify:
+        mock_verify.return_value = {
+            "sub": test_user.clerk_user_id,
+            "org_id": test_dealership.clerk_org_id
+        }
+
+        response = client.patch(
+            f"/api/v1/leads/{test_lead.id}",
+            json={"assigned_to": str(test_user.id)},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["assigned_to"] == str(test_user.id)
+        assert data["assigned_user"]["id"] == str(test_user.id)
+
+
 def test_delete_lead(client, auth_headers, test_user, test_dealership, test_lead):
     """Test deleting a lead."""
-    with patch('app.core.auth.verify_clerk_jwt') as mock_verify:
+    with patch('app.api.deps.verify_clerk_jwt') as mock_verify:
         mock_verify.return_value = {
             "sub": test_user.clerk_user_id,
             "org_id": test_dealership.clerk_org_id
@@ -189,7 +242,7 @@ def test_multi_tenant_isolation(client, db_session, test_user, test_dealership):
     db_session.commit()
     
     # Try to access other dealership's lead
-    with patch('app.core.auth.verify_clerk_jwt') as mock_verify:
+    with patch('app.api.deps.verify_clerk_jwt') as mock_verify:
         mock_verify.return_value = {
             "sub": test_user.clerk_user_id,
             "org_id": test_dealership.clerk_org_id
@@ -207,7 +260,7 @@ def test_multi_tenant_isolation(client, db_session, test_user, test_dealership):
 
 def test_search_leads(client, auth_headers, test_user, test_dealership, test_lead):
     """Test searching leads by name or email."""
-    with patch('app.core.auth.verify_clerk_jwt') as mock_verify:
+    with patch('app.api.deps.verify_clerk_jwt') as mock_verify:
         mock_verify.return_value = {
             "sub": test_user.clerk_user_id,
             "org_id": test_dealership.clerk_org_id
@@ -222,3 +275,56 @@ def test_search_leads(client, auth_headers, test_user, test_dealership, test_lea
         data = response.json()
         assert data["total"] >= 1
 
+
+
+def test_list_leads_cursor_pagination(client, auth_headers, test_user, test_dealership, db_session):
+    """Test walking the lead list with next_cursor."""
+    from app.models.lead import Lead
+
+    for i in range(5):
+        db_session.add(Lead(
+            dealership_id=test_dealership.id,
+            source="website",
+            status="new",
+            customer_name=f"Customer {i}",
+            customer_email=f"customer{i}@test.com"
+        ))
+    db_session.commit()
+
+    with patch('app.api.deps.verify_clerk_jwt') as mock_verify:
+        mock_verify.return_value = {
+            "sub": test_user.clerk_user_id,
+            "org_id": test_dealership.clerk_org_id
+        }
+        
+        seen = []
+        params = {"limit": 2}
+        while True:
+            response = client.get("/api/v1/leads", params=params, headers=auth_headers)
+            assert response.status_code == 200
+            data = response.json()
+            if "cursor_id" in params:
+                # Cursor pages aren't counted or numbered
+                assert data["total"] is None
+                assert data["page"] is None
+            else:
+                assert data["total"] == 5
+            seen.extend(item["id"] for item in data["items"])
+            if data["next_cursor"] is None:
+                break
+            params = {
+                "limit": 2,
+                "cursor_ts": data["next_cursor"]["created_at"],
+                "cursor_id": data["next_cursor"]["id"]
+            }
+        
+        assert len(seen) == 5
+        assert len(set(seen)) == 5
+        
+        # Both halves of the cursor are required
+        response = client.get(
+            "/api/v1/leads",
+            params={"cursor_id": seen[0]},
+            headers=auth_headers
+        )
+        assert response.status_code == 422
@@ -0,0 +1,90 @@
+"""
+Tests for Clerk JWT verification.
+"""
+import time
+import httpx
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk
+from unittest.mock import patch
+
+from app.core import auth
+
+
+@pytest.fixture(autouse=True)
+def clear_claims_cache():
+    """Start every test with empty claims and JWKS caches."""
+    auth._claims_cache.clear()
+    auth._jwks_cache.clear()
+    yield
+    auth._claims_cache.clear()
+    auth._jwks_cache.clear()
+
+
+@pytest.fixture
+def mock_jwt():
+    """Patch JWKS fetching and token decoding."""
+    with patch.object(auth, "fetch_jwks", return_value={"kid_1": "parsed_key"}), \
+         patch.object(auth.jwt, "get_unverified_header", return_value={"kid": "kid_1"}), \
+         patch.object(auth.jwt, "decode") as mock_decode:
+        yield mock_decode
+
+
+def test_verify_clerk_jwt_caches_claims(mock_jwt):
+    """Test that a repeated token skips signature verification."""
+    mock_jwt.return_value = {"sub": "user_1", "exp": time.time() + 300}
+
+    first = auth.verify_clerk_jwt("token_a")
+    second = auth.verify_clerk_jwt("token_a")
+
+    assert first == second
+    assert mock_jwt.call_count == 1
+
+
+def test_verify_clerk_jwt_reverifies_expired_claims(mock_jwt):
+    """Test that cached claims past their exp are verified again."""
+    mock_jwt.return_value = {"sub": "user_1", "exp": time.time() - 1}
+
+    auth.verify_clerk_jwt("token_b")
+    auth.verify_clerk_jwt("token_b")
+
+    assert mock_jwt.call_count == 2
+
+
+def test_fetch_jwks_caches_for_max_age():
+    """Test that the JWKS is reused until the response's max-age runs out."""
+    url = "https://clerk.example.com/.well-known/jwks.json"
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    public_jwk = {
+        "kid": "kid_1",
+        **jwk.construct(private_key.public_key(), "RS256").to_dict(),
+    }
+    response = httpx.Response(
+        200,
+        json={"keys": [public_jwk]},
+        headers={"cache-control": "public, max-age=600"},
+        request=httpx.Request("GET", url),
+    )
+
+    with patch.object(auth, "_jwks_client") as mock_client:
+        mock_client.return_value.get.return_value = response
+        first = auth.fetch_jwks(url)
+        second = auth.fetch_jwks(url)
+
+        with patch.object(auth.time, "monotonic", return_value=time.monotonic() + 601):
+            auth.fetch_jwks(url)
+
+    assert list(first) == ["kid_1"]
+    assert second is first
+    assert mock_client.return_value.get.call_count == 2
+
+
+def test_verify_clerk_jwt_refetches_jwks_for_unknown_kid(mock_jwt):
+    """Test that an unknown key ID triggers one forced JWKS refresh."""
+    mock_jwt.return_value = {"sub": "user_1", "exp": time.time() + 300}
+
+    with patch.object(auth, "fetch_jwks", side_effect=[{}, {"kid_1": "rotated_key"}]) as mock_fetch:
+        auth.verify_clerk_jwt("token_c")
+
+    assert mock_fetch.call_args_list[1].kwargs == {"refresh": True}
+    assert mock_jwt.call_args.args[1] == "rotated_key"
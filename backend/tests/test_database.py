@@ -42,3 +42,21 @@ def test_database_url_configured():
     parsed = make_url(settings.DATABASE_URL)
     assert parsed.drivername.startswith("postgresql")
 
+
+
+def test_dealership_context_survives_commit():
+    """Test that the RLS context is re-applied after a commit."""
+    from uuid import uuid4
+    from app.core.rls import set_dealership_context, get_current_dealership_context
+
+    dealership_id = uuid4()
+    db = SessionLocal()
+    try:
+        db.execute(text("SELECT 1"))
+        set_dealership_context(db, dealership_id)
+        assert get_current_dealership_context(db) == str(dealership_id)
+
+        db.commit()
+        assert get_current_dealership_context(db) == str(dealership_id)
+    finally:
+        db.close()
@@ -113,7 +113,7 @@ class TestFacebookWebhookReceiver:
         app_secret = "test_app_secret"
         signature = self._generate_signature(self.valid_webhook_payload, app_secret)
 
-        with patch("app.core.config.settings.FACEBOOK_APP_SECRET", app_secret):
+        with patch("app.api.v1.endpoints.facebook._FB_SECRET_BYTES", app_secret.encode()):
             response = client.post(
                 "/api/v1/webhooks/facebook",
                 json=self.valid_webhook_payload,
@@ -127,7 +127,7 @@ class TestFacebookWebhookReceiver:
         """Test webhook receiver rejects invalid signature."""
         app_secret = "test_app_secret"
 
-        with patch("app.core.config.settings.FACEBOOK_APP_SECRET", app_secret):
+        with patch("app.api.v1.endpoints.facebook._FB_SECRET_BYTES", app_secret.encode()):
             response = client.post(
                 "/api/v1/webhooks/facebook",
                 json=self.valid_webhook_payload,
@@ -139,7 +139,7 @@ class TestFacebookWebhookReceiver:
 
     def test_webhook_receiver_missing_signature(self):
         """Test webhook receiver rejects missing signature header."""
-        with patch("app.core.config.settings.FACEBOOK_APP_SECRET", "test_secret"):
+        with patch("app.api.v1.endpoints.facebook._FB_SECRET_BYTES", b"test_secret"):
             response = client.post(
                 "/api/v1/webhooks/facebook",
                 json=self.valid_webhook_payload
@@ -153,7 +153,7 @@ class TestFacebookWebhookReceiver:
         app_secret = "test_app_secret"
 
         # Send invalid JSON (as plain text)
-        with patch("app.core.config.settings.FACEBOOK_APP_SECRET", app_secret):
+        with patch("app.api.v1.endpoints.facebook._FB_SECRET_BYTES", app_secret.encode()):
             response = client.post(
                 "/api/v1/webhooks/facebook",
                 data="invalid json",
@@ -166,12 +166,12 @@ class TestFacebookWebhookReceiver:
         assert response.status_code == 400
 
     def test_webhook_receiver_processes_leadgen_event(self):
-        """Test webhook receiver queues background task for leadgen event."""
+        """Test webhook receiver queues a Celery task for leadgen event."""
         app_secret = "test_app_secret"
         signature = self._generate_signature(self.valid_webhook_payload, app_secret)
 
-        with patch("app.core.config.settings.FACEBOOK_APP_SECRET", app_secret):
-            with patch("app.api.v1.endpoints.facebook.process_facebook_lead") as mock_process:
+        with patch("app.api.v1.endpoints.facebook._FB_SECRET_BYTES", app_secret.encode()):
+            with patch("app.api.v1.endpoints.facebook.process_facebook_lead_task") as mock_task:
                 response = client.post(
                     "/api/v1/webhooks/facebook",
                     json=self.valid_webhook_payload,
@@ -179,8 +179,7 @@ class TestFacebookWebhookReceiver:
                 )
 
         assert response.status_code == 200
-        # Note: Background tasks are executed after response, so we can't easily verify
-        # the task was called without more complex async testing
+        mock_task.delay.assert_called_once()
 
     def test_webhook_receiver_ignores_non_leadgen_events(self):
         """Test webhook receiver ignores non-leadgen events."""
@@ -202,7 +201,7 @@ class TestFacebookWebhookReceiver:
         app_secret = "test_app_secret"
         signature = self._generate_signature(payload, app_secret)
 
-        with patch("app.core.config.settings.FACEBOOK_APP_SECRET", app_secret):
+        with patch("app.api.v1.endpoints.facebook._FB_SECRET_BYTES", app_secret.encode()):
             response = client.post(
                 "/api/v1/webhooks/facebook",
                 json=payload,
@@ -287,6 +286,25 @@ class TestFacebookLeadProcessing:
         assert lead_dict["source_metadata"]["facebook_lead_id"] == "123"
         assert lead_dict["source_metadata"]["is_test"] is False
 
+    def test_lead_data_drops_invalid_email(self):
+        """Test an email the lead schemas would reject is not stored on the lead."""
+        field_data = [
+            {"name": "full_name", "values": ["Kari Nordmann"]},
+            {"name": "email", "values": ["kari@gmail"]}
+        ]
+
+        lead_data = FacebookLeadData(
+            leadgen_id="123",
+            created_time=datetime.utcnow(),
+            field_data=field_data,
+            is_test=False
+        )
+
+        lead_dict = lead_data.to_lead_dict("abc-123")
+
+        assert lead_dict["customer_email"] is None
+        assert lead_dict["source_metadata"]["field_data"] == field_data
+
     def test_test_lead_detection(self):
         """Test system detects test leads from Facebook."""
         field_data = [
@@ -318,8 +336,8 @@ class TestFacebookGraphAPIClient:
             "is_test": False
         }
 
-        with patch("httpx.AsyncClient") as MockAsyncClient:
-            mock_client = MockAsyncClient.return_value.__aenter__.return_value
+        with patch("app.services.facebook_client._get_http_client") as mock_get_client:
+            mock_client = mock_get_client.return_value
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.json.return_value = mock_response_data
@@ -336,8 +354,8 @@ class TestFacebookGraphAPIClient:
     @pytest.mark.asyncio
     async def test_get_lead_auth_error(self):
         """Test Graph API returns auth error for invalid token."""
-        with patch("httpx.AsyncClient") as MockAsyncClient:
-            mock_client = MockAsyncClient.return_value.__aenter__.return_value
+        with patch("app.services.facebook_client._get_http_client") as mock_get_client:
+            mock_client = mock_get_client.return_value
             mock_response = MagicMock()
             mock_response.status_code = 401
             mock_response.json.return_value = {
@@ -354,8 +372,8 @@ class TestFacebookGraphAPIClient:
     @pytest.mark.asyncio
     async def test_get_lead_rate_limit(self):
         """Test Graph API handles rate limit errors."""
-        with patch("httpx.AsyncClient") as MockAsyncClient:
-            mock_client = MockAsyncClient.return_value.__aenter__.return_value
+        with patch("app.services.facebook_client._get_http_client") as mock_get_client:
+            mock_client = mock_get_client.return_value
             mock_response = MagicMock()
             mock_response.status_code = 429
             mock_client.get = AsyncMock(return_value=mock_response)
@@ -0,0 +1,77 @@
+"""
+Tests for lead response cache invalidation.
+"""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+from app.core import response_cache
+from app.models.conversation import Conversation
+
+
+def _committed_session(*scopes):
+    return SimpleNamespace(info={response_cache._PENDING_KEY: set(scopes)})
+
+
+def test_commit_on_event_loop_bumps_asynchronously():
+    """Test that a commit on the event loop doesn't use the blocking client."""
+    session = _committed_session("dealership_1")
+
+    async def commit():
+        response_cache._invalidate_on_commit(session)
+        await asyncio.sleep(0)
+
+    with patch.object(response_cache, "invalidate") as mock_invalidate, \
+            patch.object(response_cache, "ainvalidate", new_callable=AsyncMock) as mock_ainvalidate:
+        asyncio.run(commit())
+
+    mock_invalidate.assert_not_called()
+    mock_ainvalidate.assert_awaited_once_with({"dealership_1"}, set())
+
+
+def test_commit_in_worker_thread_bumps_synchronously():
+    """Test that a sync session commit bumps with the sync client."""
+    session = _committed_session("dealership_1")
+
+    with patch.object(response_cache, "invalidate") as mock_invalidate:
+        response_cache._invalidate_on_commit(session)
+
+    mock_invalidate.assert_called_once_with({"dealership_1"}, set())
+    assert response_cache._PENDING_KEY not in session.info
+
+
+def test_commit_and_invalidate_waits_for_bump():
+    """Test that a request handler's commit returns only after the bump is done."""
+    session = _committed_session("dealership_1")
+    bumped = []
+
+    async def slow_ainvalidate(scopes, keys):
+        await asyncio.sleep(0.01)
+        bumped.append(scopes)
+
+    async def commit():
+        response_cache._invalidate_on_commit(session)
+
+    session.commit = commit
+
+    with patch.object(response_cache, "ainvalidate", slow_ainvalidate):
+        asyncio.run(response_cache.commit_and_invalidate(session))
+
+    assert bumped == [{"dealership_1"}]
+    assert response_cache._BUMP_KEY not in session.info
+
+
+def test_committed_message_drops_cached_conversation_list():
+    """Test that committing an ORM-added message deletes its lead's cached list."""
+    dealership_id, lead_id = uuid4(), uuid4()
+    message = Conversation(lead_id=lead_id, dealership_id=dealership_id)
+    session = SimpleNamespace(new=[message], dirty=[], deleted=[], info={})
+
+    response_cache._track_flushed_writes(session, None)
+    with patch.object(response_cache, "invalidate") as mock_invalidate:
+        response_cache._invalidate_on_commit(session)
+
+    mock_invalidate.assert_called_once_with(
+        set(), {response_cache.conversations_key(dealership_id, lead_id)}
+    )
@@ -1,14 +1,17 @@
 """Tests for Clerk webhook provisioning."""
 
-import json
+import asyncio
 from unittest.mock import patch
 
 import pytest
+from sqlalchemy.exc import IntegrityError
 from svix.webhooks import WebhookVerificationError
 
+from app.api.webhooks.clerk import handle_clerk_event
 from app.core.config import settings
 from app.models.dealership import Dealership
 from app.models.user import User
+from tests.conftest import TestingAsyncSessionLocal
 
 
 @pytest.fixture(autouse=True)
@@ -22,15 +25,39 @@ def configure_webhook_secret():
         settings.CLERK_WEBHOOK_SECRET = original
 
 
-def _headers() -> dict[str, str]:
+def _headers(svix_id: str = "msg_p_123") -> dict[str, str]:
     return {
-        "svix-id": "msg_p_123",
+        "svix-id": svix_id,
         "svix-signature": "v1,test",
         "svix-timestamp": "1700000000",
     }
 
 
-def test_membership_created_provisions_user_and_dealership(client, db_session):
+async def _process(svix_id: str):
+    async with TestingAsyncSessionLocal() as db:
+        return await handle_clerk_event(db, svix_id)
+
+
+@pytest.fixture
+def deliver(client):
+    """Post a verified event, then run the queued handler as the worker would.
+
+    Returns the response and the handler's result (None if nothing ran).
+    """
+    def _deliver(event, svix_id: str = "msg_p_123"):
+        with patch("app.api.webhooks.clerk.Webhook.verify", return_value=event), \
+                patch("app.api.webhooks.clerk.process_clerk_event_task") as mock_task:
+            response = client.post("/webhooks/clerk", data="{}", headers=_headers(svix_id))
+
+        if not mock_task.delay.called:
+            return response, None
+        mock_task.delay.assert_called_once_with(svix_id)
+        return response, asyncio.run(_process(svix_id))
+
+    return _deliver
+
+
+def test_membership_created_provisions_user_and_dealership(deliver, db_session):
     """Webhook should create dealership and user, and be idempotent."""
 
     event = {
@@ -50,11 +77,10 @@ def test_membership_created_provisions_user_and_dealership(client, db_session):
         },
     }
 
-    with patch("app.api.webhooks.clerk.Webhook.verify", return_value=json.dumps(event)):
-        response = client.post("/webhooks/clerk", data="{}", headers=_headers())
+    response, body = deliver(event)
 
     assert response.status_code == 200
-    body = response.json()
+    assert response.json() == {"status": "queued", "event_type": "organizationMembership.created"}
     assert body["status"] == "processed"
     assert body["created_dealership"] is True
     assert body["created_user"] is True
@@ -68,16 +94,129 @@ def test_membership_created_provisions_user_and_dealership(client, db_session):
     assert user.dealership_id == dealership.id
     assert user.role == "admin"
 
-    # Second call should be idempotent
-    with patch("app.api.webhooks.clerk.Webhook.verify", return_value=json.dumps(event)):
-        response_repeat = client.post("/webhooks/clerk", data="{}", headers=_headers())
+    # A second delivery of the same change should be idempotent
+    response_repeat, body_repeat = deliver(event, "msg_p_456")
 
     assert response_repeat.status_code == 200
-    body_repeat = response_repeat.json()
     assert body_repeat["created_dealership"] is False
     assert body_repeat["created_user"] is False
 
 
+def test_membership_created_first_member_becomes_admin(deliver, db_session):
+    """The first member of an existing dealership is admin, later ones sales reps."""
+
+    db_session.add(Dealership(
+        name="Empty Motors",
+        email="contact@emptymotors.no",
+        clerk_org_id="org_test_empty",
+    ))
+    db_session.commit()
+
+    def membership(clerk_user_id: str) -> dict:
+        return {
+            "type": "organizationMembership.created",
+            "data": {
+                "role": "org:member",
+                "organization": {"id": "org_test_empty"},
+                "public_user_data": {
+                    "user_id": clerk_user_id,
+                    "identifier": f"{clerk_user_id}@emptymotors.no",
+                },
+            },
+        }
+
+    _, first = deliver(membership("user_first"), "msg_p_first")
+    _, second = deliver(membership("user_second"), "msg_p_second")
+
+    assert first["created_dealership"] is False
+    assert db_session.query(User).filter_by(clerk_user_id="user_first").one().role == "admin"
+    assert db_session.query(User).filter_by(clerk_user_id="user_second").one().role == "sales_rep"
+
+
+def test_retried_delivery_is_skipped(deliver, db_session):
+    """A retry of an already processed Svix message should not be applied again."""
+
+    event = {
+        "type": "organization.created",
+        "data": {"id": "org_test_retry", "name": "Retry Motors"},
+    }
+
+    _, first = deliver(event)
+    retry, retry_result = deliver(event)
+
+    assert first["status"] == "processed"
+    assert retry.status_code == 200
+    assert retry_result is None
+    assert retry.json() == {"status": "duplicate", "event_type": "organization.created"}
+    assert db_session.query(Dealership).filter_by(clerk_org_id="org_test_retry").count() == 1
+
+
+def test_unique_violation_is_retried(deliver, db_session):
+    """A race with a concurrent event should propagate for a retry, not drop the event."""
+
+    class _UniqueViolation(Exception):
+        pgcode = "23505"
+
+    event = {
+        "type": "organization.created",
+        "data": {"id": "org_test_race", "name": "Race Motors"},
+    }
+
+    with patch(
+        "app.api.webhooks.clerk._ensure_dealership",
+        side_effect=IntegrityError("INSERT", {}, _UniqueViolation()),
+    ):
+        with pytest.raises(IntegrityError):
+            deliver(event)
+
+    # The retry runs in a fresh transaction and applies the event
+    result = asyncio.run(_process("msg_p_123"))
+
+    assert result["status"] == "processed"
+    assert db_session.query(Dealership).filter_by(clerk_org_id="org_test_race").count() == 1
+
+
+def test_organization_created_relinks_dealership_by_email(deliver, db_session):
+    """A new org with an existing dealership's email should take over that dealership."""
+
+    dealership = Dealership(
+        name="Old Motors",
+        email="contact@oldmotors.no",
+        clerk_org_id="org_test_old",
+    )
+    db_session.add(dealership)
+    db_session.commit()
+
+    event = {
+        "type": "organization.created",
+        "data": {
+            "id": "org_test_new",
+            "name": "New Motors",
+            "primary_contact_email_address": "contact@oldmotors.no",
+        },
+    }
+
+    response, body = deliver(event)
+
+    assert response.status_code == 200
+    assert body["created_dealership"] is False
+    assert body["dealership_id"] == str(dealership.id)
+
+    db_session.refresh(dealership)
+    assert dealership.clerk_org_id == "org_test_new"
+    assert dealership.name == "New Motors"
+
+
+def test_oversized_payload_returns_413(client):
+    """Bodies far larger than any Clerk event should be rejected before verification."""
+
+    with patch("app.api.webhooks.clerk.Webhook.verify") as mock_verify:
+        response = client.post("/webhooks/clerk", content=b"x" * (64 * 1024 + 1), headers=_headers())
+
+    assert response.status_code == 413
+    mock_verify.assert_not_called()
+
+
 def test_invalid_signature_returns_400(client):
     """Invalid signature should return 400 without touching the database."""
 
@@ -91,7 +230,7 @@ def test_invalid_signature_returns_400(client):
     assert response.json()["detail"] == "Invalid signature"
 
 
-def test_user_deleted_removes_user_from_database(client, db_session):
+def test_user_deleted_removes_user_from_database(deliver, db_session):
     """Webhook should delete user when user.deleted event is received."""
     # First create a user
     from app.models.dealership import Dealership
@@ -131,11 +270,9 @@ def test_user_deleted_removes_user_from_database(client, db_session):
         },
     }
 
-    with patch("app.api.webhooks.clerk.Webhook.verify", return_value=event):
-        response = client.post("/webhooks/clerk", data="{}", headers=_headers())
+    response, body = deliver(event)
 
     assert response.status_code == 200
-    body = response.json()
     assert body["status"] == "processed"
     assert body["event_type"] == "user.deleted"
     assert body["deleted_user_id"] is not None
@@ -145,7 +282,7 @@ def test_user_deleted_removes_user_from_database(client, db_session):
     assert db_session.query(User).filter_by(clerk_user_id="user_test_delete").first() is None
 
 
-def test_user_deleted_idempotent(client, db_session):
+def test_user_deleted_idempotent(deliver, db_session):
     """Deleting a non-existent user should be idempotent (no error)."""
     event = {
         "type": "user.deleted",
@@ -154,17 +291,15 @@ def test_user_deleted_idempotent(client, db_session):
         },
     }
 
-    with patch("app.api.webhooks.clerk.Webhook.verify", return_value=event):
-        response = client.post("/webhooks/clerk", data="{}", headers=_headers())
+    response, body = deliver(event)
 
     assert response.status_code == 200
-    body = response.json()
     assert body["status"] == "processed"
     assert body["deleted_user_id"] is None
     assert body["message"] == "User not found in database"
 
 
-def test_membership_deleted_removes_user_from_database(client, db_session):
+def test_membership_deleted_removes_user_from_database(deliver, db_session):
     """Webhook should delete user when removed from organization."""
     # First create a user and dealership
     from app.models.dealership import Dealership
@@ -214,11 +349,9 @@ def test_membership_deleted_removes_user_from_database(client, db_session):
         },
     }
 
-    with patch("app.api.webhooks.clerk.Webhook.verify", return_value=event):
-        response = client.post("/webhooks/clerk", data="{}", headers=_headers())
+    response, body = deliver(event)
 
     assert response.status_code == 200
-    body = response.json()
     assert body["status"] == "processed"
     assert body["event_type"] == "organizationMembership.deleted"
     assert body["deleted_user_id"] is not None
@@ -233,7 +366,7 @@ def test_membership_deleted_removes_user_from_database(client, db_session):
     )
 
 
-def test_membership_deleted_wrong_dealership_skips_deletion(client, db_session):
+def test_membership_deleted_wrong_dealership_skips_deletion(deliver, db_session):
     """If user doesn't belong to the organization, deletion should be skipped."""
     from app.models.dealership import Dealership
     from app.models.user import User
@@ -275,11 +408,9 @@ def test_membership_deleted_wrong_dealership_skips_deletion(client, db_session):
         },
     }
 
-    with patch("app.api.webhooks.clerk.Webhook.verify", return_value=event):
-        response = client.post("/webhooks/clerk", data="{}", headers=_headers())
+    response, body = deliver(event)
 
     assert response.status_code == 200
-    body = response.json()
     assert body["status"] == "processed"
     assert body["deleted_user_id"] is None
     assert "does not belong" in body["message"] or "Dealership not found" in body["message"]
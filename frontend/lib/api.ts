@@ -57,6 +57,10 @@ export async function fetchLeads(
   if (filters.source) params.append("source", filters.source);
   if (filters.limit) params.append("limit", filters.limit.toString());
   if (filters.offset) params.append("offset", filters.offset.toString());
+  if (filters.cursor) {
+    params.append("cursor_ts", filters.cursor.created_at);
+    params.append("cursor_id", filters.cursor.id);
+  }
 
   const queryString = params.toString();
   const endpoint = `/api/v1/leads${queryString ? `?${queryString}` : ""}`;
@@ -30,17 +30,26 @@ export interface Conversation {
   created_at: string;
 }
 
+export interface Cursor {
+  created_at: string;
+  id: string;
+}
+
 export interface PaginatedResponse<T> {
   items: T[];
-  total: number;
-  page: number;
-  pages: number;
+  /** null on cursor pages (counting every matching row defeats the cursor) */
+  total: number | null;
+  page: number | null;
+  pages: number | null;
   limit: number;
+  next_cursor: Cursor | null;
 }
 
 export interface LeadFilters {
   status?: LeadStatus;
   source?: LeadSource;
   limit?: number;
+  /** @deprecated use cursor */
   offset?: number;
+  cursor?: Cursor;
 }